@@ -4,37 +4,193 @@ Flask Backend API for Brent Oil Price Dashboard
 Serves cleaned data, events, and model results to React frontend.
 """
 
-from flask import Flask, jsonify, send_from_directory
+from flask import Flask, Response, g, jsonify, request, send_from_directory
 import pandas as pd
+import base64
+import cProfile
+import collections
+import gzip
+import hashlib
+import io
+import json
 import os
-import csv
+import pstats
+import sys
+import threading
+import time
 
 app = Flask(__name__, static_folder='../frontend/dist')
 
-# Paths
+# Paths (BRENT_DATA_DIR / BRENT_REPORTS_DIR point the app at another dataset, e.g. for benchmarks)
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DATA_PATH = os.path.join(ROOT_DIR, 'data', 'BrentOilPrices_clean.csv')
-EVENTS_PATH = os.path.join(ROOT_DIR, 'events', 'key_oil_events.csv')
-ANALYSIS_2005_PATH = os.path.join(ROOT_DIR, 'analysis_summary.csv')
-ANALYSIS_2020_PATH = os.path.join(ROOT_DIR, 'analysis_summary_2020.csv')
+DATA_DIR = os.environ.get('BRENT_DATA_DIR', os.path.join(ROOT_DIR, 'backend', 'data'))
+REPORTS_DIR = os.environ.get('BRENT_REPORTS_DIR', os.path.join(ROOT_DIR, 'reports'))
+PRICES_PATH = os.path.join(DATA_DIR, 'BrentOilPrices.csv')
+EVENTS_PATH = os.path.join(DATA_DIR, 'key_oil_events.csv')
+SEGMENTS_PATH = os.path.join(REPORTS_DIR, 'change_point_segments.csv')
+ONLINE_STATE_PATH = os.path.join(REPORTS_DIR, 'online_detector_state.npz')
+ROLLING_STATE_PATH = os.path.join(REPORTS_DIR, 'rolling_stats_state.npz')
+DASHBOARD_SNAPSHOT_PATH = os.path.join(REPORTS_DIR, 'dashboard_snapshot.json')
+FIT_JOBS_DIR = os.path.join(REPORTS_DIR, 'jobs')
+POSTERIORS_DIR = os.path.join(REPORTS_DIR, 'posteriors')
+# One CSV per tracked series (WTI, Dubai, spreads, ...) in the BrentOilPrices.csv format
+SERIES_DIR = os.environ.get('BRENT_SERIES_DIR', os.path.join(DATA_DIR, 'series'))
+
+# Per-request profiling (?profile=1 or an "X-Profile: 1" header) is only honoured when this is set
+PROFILING_ENABLED = os.environ.get('BRENT_PROFILING', '') == '1'
+
+# Files each dataset / response is derived from; a change to any of them invalidates the cache
+PRICES_DEPS = [PRICES_PATH]
+EVENTS_DEPS = [EVENTS_PATH]
+CHANGE_POINT_DEPS = [PRICES_PATH, EVENTS_PATH, SEGMENTS_PATH]
+# The snapshot behind /api/dashboard: every section is derived from these files
+DASHBOARD_DEPS = CHANGE_POINT_DEPS
+DASHBOARD_MAX_POINTS = 1500
+DASHBOARD_FORMAT = 2
+
+# Analysis modules live in src/ and are imported flat, as the scripts there do
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+from price_store import load_price_arrays, load_prices  # noqa: E402
+from downsampling import EPOCH, PricePyramid, to_day  # noqa: E402
+from price_wire import PRICES_MIMETYPE, pack_prices  # noqa: E402
+from fit_jobs import FitJobManager, QueueFullError, normalize_config  # noqa: E402
+from event_study import event_impacts  # noqa: E402
+from segmentation import change_point_table, detect_segments  # noqa: E402
+from instrumentation import REGISTRY, begin_trace, end_trace, stage  # noqa: E402
+from posterior_store import PosteriorStore  # noqa: E402
+from multi_series import detect_many, load_series, series_paths  # noqa: E402
+from rolling_stats import update_rolling_stats  # noqa: E402
+from bootstrap import bootstrap_summary, regime_differences  # noqa: E402
+
+START_TIME = time.time()
+
+
+# --- In-process cache ---
+# Datasets and fully serialized response bodies are kept in memory and rebuilt only when
+# one of the files they were derived from changes (size or mtime).
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+# One lock per key, so concurrent misses of the same entry build it once
+_BUILD_LOCKS = collections.defaultdict(threading.Lock)
+
+
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+    except OSError:
+        return None
+
+
+def cached(key, paths, build, label=None):
+    """
+    Return the cached value for `key`, rebuilding it when any of `paths` changed.
+    `label` names the build stage in the metrics (default: the key); keep it to a bounded set.
+    """
+    signature = tuple(_file_signature(p) for p in paths)
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+    name = label or (".".join(map(str, key)) if isinstance(key, tuple) else key)
+    if entry is not None and entry[0] == signature:
+        REGISTRY.inc("brent_cache_lookups_total", help_text="Backend cache lookups by outcome", result="hit")
+        return entry[1]
+    with _CACHE_LOCK:
+        build_lock = _BUILD_LOCKS[key]
+    with build_lock:
+        with _CACHE_LOCK:
+            entry = _CACHE.get(key)
+        if entry is not None and entry[0] == signature:
+            # Built by a concurrent request while this one waited
+            REGISTRY.inc("brent_cache_lookups_total", help_text="Backend cache lookups by outcome", result="hit")
+            return entry[1]
+        REGISTRY.inc("brent_cache_lookups_total", help_text="Backend cache lookups by outcome", result="miss")
+        with stage(f"build.{name}"):
+            value = build()
+        with _CACHE_LOCK:
+            _CACHE[key] = (signature, value)
+    return value
+
+
+class PreparedResponse:
+    """
+    A response body serialized once, with its gzip variant and strong ETag.
+    Bytes payloads are sent as-is; anything else is serialized as JSON.
+    """
+
+    def __init__(self, payload, mimetype='application/json'):
+        self.body = payload if isinstance(payload, bytes) else app.json.dumps(payload).encode('utf-8')
+        self.mimetype = mimetype
+        self.gzip_body = gzip.compress(self.body, compresslevel=6, mtime=0)
+        self.etag = hashlib.sha256(self.body).hexdigest()[:32]
+
+
+def cached_response(key, paths, build, mimetype='application/json', label=None):
+    return cached(('response', key), paths, lambda: PreparedResponse(build(), mimetype),
+                  label and f"response.{label}")
+
+
+def serve_prepared(prepared):
+    """Send a prepared body, honouring Accept-Encoding and If-None-Match (304)."""
+    use_gzip = request.accept_encodings['gzip'] > 0
+    response = Response(prepared.gzip_body if use_gzip else prepared.body, mimetype=prepared.mimetype)
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    # Each content coding is its own representation, so it gets its own strong ETag
+    response.set_etag(f"{prepared.etag}-gzip" if use_gzip else prepared.etag)
+    return response.make_conditional(request)
+
+
+def prices_frame():
+    """The Date/Price frame, loaded once per version of the price file."""
+    return cached('prices_frame', PRICES_DEPS, lambda: load_prices(PRICES_PATH))
+
+
+def price_pyramid():
+    """Multi-resolution index of the price series, built once per version of the price file."""
+    return cached('price_pyramid', PRICES_DEPS, lambda: PricePyramid(*load_price_arrays(PRICES_PATH)))
+
+
+# Prepared /api/prices range responses (zoom and pan), least recently used first
+RANGE_CACHE_SIZE = 256
+_RANGE_RESPONSES = collections.OrderedDict()
+
+
+def range_response(query, mimetype):
+    """
+    The prepared response of a (start_day, end_day, max_points) price query, built at most once per
+    version of the price file. Bounded LRU: the query space is open-ended, the memory is not.
+    """
+    key = (_file_signature(PRICES_PATH), query, mimetype)
+    with _CACHE_LOCK:
+        prepared = _RANGE_RESPONSES.get(key)
+        if prepared is not None:
+            _RANGE_RESPONSES.move_to_end(key)
+    REGISTRY.inc("brent_cache_lookups_total", help_text="Backend cache lookups by outcome",
+                 result="hit" if prepared is not None else "miss")
+    if prepared is not None:
+        return prepared
+    with stage("build.prices_range"):
+        days, prices = price_pyramid().query(*query)
+        payload = pack_prices(days, prices) if mimetype == PRICES_MIMETYPE else price_records(days, prices)
+        prepared = PreparedResponse(payload, mimetype)
+    with _CACHE_LOCK:
+        _RANGE_RESPONSES[key] = prepared
+        while len(_RANGE_RESPONSES) > RANGE_CACHE_SIZE:
+            _RANGE_RESPONSES.popitem(last=False)
+    return prepared
+
+
+def price_records(days, prices):
+    """Day-offset / price arrays as the Date/Price records served in JSON."""
+    frame = pd.DataFrame({'Date': (EPOCH + days.astype('timedelta64[D]')).astype('datetime64[ns]'),
+                          'Price': prices})
+    return frame.to_dict(orient='records')
 
 
 def load_brent_prices():
-    """Fix and load Brent oil prices with mixed date formats."""
-    if not os.path.exists(DATA_PATH):
-        with open(os.path.join(ROOT_DIR, 'BrentOilPrices.csv'), 'r') as f:
-            content = f.read().replace('\n', '').replace('\r', '')
-        import re
-        pattern = r'(?:\"([A-Za-z]{3} \d{1,2}, \d{4})\"|(\d{1,2}-[A-Za-z]{3}-\d{2})),([0-9]+\.[0-9]+)'
-        matches = re.findall(pattern, content)
-        records = [{'Date': m[0] if m[0] else m[1], 'Price': float(m[2])} for m in matches]
-        df = pd.DataFrame(records)
-        df['Date'] = pd.to_datetime(df['Date'])
-        df.sort_values('Date', inplace=True)
-        df.to_csv(DATA_PATH, index=False)
-    else:
-        df = pd.read_csv(DATA_PATH, parse_dates=['Date'])
-    return df[['Date', 'Price']].to_dict(orient='records')
+    """Load Brent oil prices (mixed date formats) through the shared columnar cache."""
+    return prices_frame().to_dict(orient='records')
 
 
 def load_events():
@@ -55,67 +211,436 @@ def load_events():
     return df.to_dict(orient='records')
 
 
-def load_analysis_summary(file_path):
-    """Load analysis summary safely."""
+def load_change_points():
+    """Load the multi-break segment table, segmenting the price series if it was not precomputed."""
+    if os.path.exists(SEGMENTS_PATH):
+        segments = pd.read_csv(SEGMENTS_PATH)
+    else:
+        segments = detect_segments(prices_frame())
+    return change_point_table(segments, pd.DataFrame(load_events())).to_dict(orient='records')
+
+
+def load_regime():
+    """Bring the online detector up to date with any new prices and return its regime summary."""
+    # Imported on first use: it pulls in scipy, which most cold starts never need
+    from online_change_point import update_detector
+
+    # Request handlers only read the saved state; `cli.py ingest` (persist_states) writes it
+    detector, _ = update_detector(prices_frame(), ONLINE_STATE_PATH, save=False)
+    return detector.summary()
+
+
+def persist_states():
+    """
+    Brings the saved online detector and rolling statistics states up to date with the price file.
+    Run by `cli.py ingest`, the only writer: request handlers read the states without saving them.
+
+    Returns:
+        tuple: (new rows ingested by the detector, new rows ingested by the rolling statistics)
+    """
+    from online_change_point import update_detector
+
+    df = load_prices(PRICES_PATH)
+    _, detector_rows = update_detector(df, ONLINE_STATE_PATH)
+    _, rolling_rows = update_rolling_stats(df, ROLLING_STATE_PATH)
+    return detector_rows, rolling_rows
+
+
+def load_event_impacts():
+    """Event study table (event x window length) with JSON-safe dates and missing values."""
+    events = pd.DataFrame(load_events())
+    events['Date'] = pd.to_datetime(events['Date'])
+    table = event_impacts(prices_frame(), events)
+    for column in ('event_date', 'trading_date'):
+        table[column] = table[column].dt.strftime('%Y-%m-%d')
+    table = table.round(6).astype(object)
+    return table.where(table.notna(), None).to_dict(orient='records')
+
+
+def load_indicators():
+    """Headline indicators for the dashboard cards, read from the incremental rolling statistics."""
+    # Only prices newer than the saved state are ingested, O(windows) each; the state is not written here
+    stats, _ = update_rolling_stats(prices_frame(), ROLLING_STATE_PATH, save=False)
+    indicators = stats.indicators()
+    change_points = cached('change_points', CHANGE_POINT_DEPS, load_change_points)
+    return {
+        "latest_price": indicators["latest_price"],
+        "average_price": indicators["average_price"],
+        "annualized_volatility": indicators["annualized_volatility"],
+        "rolling": indicators["rolling"],
+        "uncertainty": load_uncertainty(change_points),
+        "total_events": len(cached('events', EVENTS_DEPS, load_events)),
+        "detected_change_points": len(change_points)
+    }
+
+
+def load_uncertainty(change_points):
+    """
+    Block-bootstrap 95% intervals of the daily return statistics, plus the after - before difference
+    around every detected change point. Simple returns, like the annualized_volatility card.
+    """
+    df = prices_frame()
+    prices = df['Price'].to_numpy(dtype=float)
+    returns = prices[1:] / prices[:-1] - 1
+
+    def rounded(summary):
+        return {name: {key: round(value, 6) for key, value in interval.items()} for name, interval in summary.items()}
+
+    regimes = regime_differences(returns, df['Date'].to_numpy()[1:], [row['date'] for row in change_points])
+    return {
+        "returns": rounded(bootstrap_summary(returns)),
+        "regime_changes": [{"date": row["date"], "differences": rounded(row["differences"])} for row in regimes],
+    }
+
+
+def series_deps():
+    """The series CSVs (the Brent file alone when no series directory exists) plus the directory itself."""
+    return [SERIES_DIR] + (series_paths(SERIES_DIR) or [PRICES_PATH])
+
+
+def load_series_change_points():
+    """Change point table of every tracked series, fitted in one batch."""
+    paths = series_paths(SERIES_DIR) or [PRICES_PATH]
+    table = detect_many(load_series(paths)).round(6).astype(object)
+    return table.where(table.notna(), None).to_dict(orient='records')
+
+
+# --- Dashboard snapshot ---
+# One consistent payload with the four sections the dashboard page needs. It is built once per
+# version of DASHBOARD_DEPS, persisted (so restarts and other workers reuse it) and swapped in
+# as a whole. When the data changes, the new snapshot is built in the background while readers
+# keep getting the previous one.
+_DASHBOARD = None
+_DASHBOARD_BUILD_LOCK = threading.Lock()
+
+
+def dashboard_version():
+    """Identifies the data behind a snapshot: a hash of the dependency files' size and mtime."""
+    signature = [DASHBOARD_FORMAT] + [_file_signature(p) for p in DASHBOARD_DEPS]
+    return hashlib.sha256(repr(signature).encode('utf-8')).hexdigest()[:16]
+
+
+def build_dashboard():
+    """
+    All four sections from the same file versions; rebuilt if a file changes mid-build.
+    Prices travel in the binary price format (base64), decoded by decodePrices in the frontend.
+    """
+    for _ in range(3):
+        version = dashboard_version()
+        days, prices = price_pyramid().query(max_points=DASHBOARD_MAX_POINTS)
+        snapshot = {
+            "version": version,
+            "built_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            "prices": base64.b64encode(pack_prices(days, prices)).decode('ascii'),
+            "events": cached('events', EVENTS_DEPS, load_events),
+            "change_points": cached('change_points', CHANGE_POINT_DEPS, load_change_points),
+            "indicators": cached('indicators', CHANGE_POINT_DEPS, load_indicators),
+        }
+        if dashboard_version() == version:
+            return snapshot
+    raise RuntimeError("Dashboard data kept changing while the snapshot was built")
+
+
+def _read_snapshot():
+    """(version, body) of the persisted snapshot, or None when there is no readable one."""
+    try:
+        with open(DASHBOARD_SNAPSHOT_PATH, 'rb') as f:
+            body = f.read()
+        snapshot = json.loads(body)
+    except (OSError, ValueError):
+        return None
+    if snapshot.get("format") != DASHBOARD_FORMAT or "version" not in snapshot:
+        return None
+    return snapshot["version"], body
+
+
+def refresh_dashboard():
+    """
+    Makes the persisted snapshot current, building it only when the data changed.
+    The file is replaced atomically, so readers see the old or the new snapshot, never a mix.
+
+    Returns:
+        tuple: (version, PreparedResponse of the snapshot)
+    """
+    persisted = _read_snapshot()
+    if persisted is not None and persisted[0] == dashboard_version():
+        return persisted[0], PreparedResponse(persisted[1])
+    with stage("build.dashboard"):
+        snapshot = {"format": DASHBOARD_FORMAT, **build_dashboard()}
+    body = app.json.dumps(snapshot).encode('utf-8')
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    tmp_path = f"{DASHBOARD_SNAPSHOT_PATH}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(body)
+    os.replace(tmp_path, DASHBOARD_SNAPSHOT_PATH)
+    REGISTRY.inc("brent_dashboard_snapshots_built_total", help_text="Dashboard snapshots built")
+    return snapshot["version"], PreparedResponse(body)
+
+
+def _refresh_in_background():
+    global _DASHBOARD
     try:
-        with open(file_path, mode='r') as f:
-            reader = csv.DictReader(f)
-            return next(reader)
+        _DASHBOARD = refresh_dashboard()  # a single assignment: the swap readers see
     except Exception as e:
-        print(f"Error loading {file_path}: {e}")
-        return {}
+        print(f"⚠️ Dashboard snapshot refresh failed: {e}")
+    finally:
+        _DASHBOARD_BUILD_LOCK.release()
+
+
+def start_dashboard_refresh():
+    """Rebuilds the snapshot in a background thread, unless a rebuild is already running."""
+    if not _DASHBOARD_BUILD_LOCK.acquire(blocking=False):
+        return False
+    threading.Thread(target=_refresh_in_background, name="dashboard-refresh", daemon=True).start()
+    return True
+
+
+def dashboard_snapshot():
+    """
+    The newest available snapshot. Only a process with no snapshot at all (in memory or on disk)
+    builds one in the request; otherwise a stale snapshot is served while the refresh runs.
+    """
+    global _DASHBOARD
+    if _DASHBOARD is None:
+        with _DASHBOARD_BUILD_LOCK:
+            if _DASHBOARD is None:
+                persisted = _read_snapshot()
+                _DASHBOARD = ((persisted[0], PreparedResponse(persisted[1])) if persisted is not None
+                              else refresh_dashboard())
+    current = _DASHBOARD
+    if current[0] != dashboard_version():
+        start_dashboard_refresh()
+    return current[1]
+
+
+_FIT_JOBS = None
+_FIT_JOBS_LOCK = threading.Lock()
+
+
+def fit_jobs():
+    """The shared fit job manager, created on first use so importing the app starts no workers."""
+    global _FIT_JOBS
+    with _FIT_JOBS_LOCK:
+        if _FIT_JOBS is None:
+            _FIT_JOBS = FitJobManager(FIT_JOBS_DIR, store_dir=POSTERIORS_DIR)
+        return _FIT_JOBS
+
+
+# --- Instrumentation ---
+_PROFILE_LOCK = threading.Lock()
+
+
+def _profiling_requested():
+    return PROFILING_ENABLED and (request.args.get('profile') == '1' or request.headers.get('X-Profile') == '1')
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    g.stages = begin_trace()
+    # cProfile allows one active profiler at a time, so concurrent profile requests run unprofiled
+    if _profiling_requested() and _PROFILE_LOCK.acquire(blocking=False):
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+
+@app.after_request
+def record_request(response):
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        _PROFILE_LOCK.release()
+    elapsed = time.perf_counter() - g.get('request_start', time.perf_counter())
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    REGISTRY.observe("brent_http_request_duration_seconds", elapsed, "Request latency by route",
+                     route=route, method=request.method, status=response.status_code)
+
+    # Server-Timing lists the stages that ran for this request (cache rebuilds, loads), in ms
+    timings = [f"total;dur={elapsed * 1000:.2f}"]
+    timings += [f'stage;desc="{name}";dur={seconds * 1000:.2f}' for name, seconds in g.get('stages', [])]
+    response.headers['Server-Timing'] = ", ".join(timings)
+
+    if profiler is not None:
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(40)
+        profiled = Response(report.getvalue(), mimetype='text/plain')
+        profiled.headers['X-Profiled-Status'] = str(response.status_code)
+        profiled.headers['Server-Timing'] = response.headers['Server-Timing']
+        return profiled
+    return response
+
+
+@app.teardown_request
+def stop_stage_trace(exc):
+    end_trace()
+
+
+def refresh_gauges():
+    """Point-in-time values that are cheaper to read at scrape time than to track continuously."""
+    REGISTRY.set("brent_process_uptime_seconds", time.time() - START_TIME, "Seconds since the backend started")
+    with _CACHE_LOCK:
+        entries = len(_CACHE)
+    REGISTRY.set("brent_cache_entries", entries, "Datasets and responses held in the backend cache")
+    if _FIT_JOBS is not None:
+        counts = _FIT_JOBS.status_counts()
+        for status in ("queued", "running", "done", "failed", "cancelled"):
+            REGISTRY.set("brent_fit_jobs", counts.get(status, 0), "Retained fit jobs by status", status=status)
 
 
 # --- API Endpoints ---
+@app.route('/api/metrics')
+def get_metrics():
+    refresh_gauges()
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/api/prices')
 def get_prices():
-    return jsonify(load_brent_prices())
+    # JSON stays the default; clients opt into the packed format through the Accept header
+    binary = request.accept_mimetypes.best_match(['application/json', PRICES_MIMETYPE]) == PRICES_MIMETYPE
+    mimetype = PRICES_MIMETYPE if binary else 'application/json'
+    start, end = request.args.get('start'), request.args.get('end')
+    max_points = request.args.get('max_points')
+
+    if start is None and end is None and max_points is None:
+        if binary:
+            prepared = cached_response('prices_binary', PRICES_DEPS,
+                                       lambda: pack_prices(*load_price_arrays(PRICES_PATH)), mimetype)
+        else:
+            prepared = cached_response('prices', PRICES_DEPS, load_brent_prices)
+    else:
+        try:
+            max_points = None if max_points is None else int(max_points)
+            if max_points is not None and max_points < 3:
+                raise ValueError("max_points must be at least 3")
+            query = (to_day(start), to_day(end), max_points)
+        except ValueError as e:
+            return jsonify({"error": f"Invalid price query: {e}"}), 400
+        prepared = range_response(query, mimetype)
+
+    response = serve_prepared(prepared)
+    response.vary.add('Accept')
+    return response
 
 @app.route('/api/events')
 def get_events():
-    return jsonify(load_events())
+    return serve_prepared(cached_response('events', EVENTS_DEPS, load_events))
 
 @app.route('/api/change_points')
 def get_change_points():
-    summary_2005 = load_analysis_summary(ANALYSIS_2005_PATH)
-    summary_2020 = load_analysis_summary(ANALYSIS_2020_PATH)
-    return jsonify([
-        {
-            "date": summary_2005.get("Change Point Date", "").split()[0],
-            "pre_mean": float(summary_2005.get("Pre-Change Mean", 0)),
-            "post_mean": float(summary_2005.get("Post-Change Mean", 0)),
-            "impact_percent": round(
-                (float(summary_2005.get("Post-Change Mean", 0)) - float(summary_2005.get("Pre-Change Mean", 0)))
-                / float(summary_2005.get("Pre-Change Mean", 1)) * 100, 1),
-            "event": "Global Demand Surge (2005)",
-            "description": "Rising demand from China and India drives structural price shift"
-        },
-        {
-            "date": summary_2020.get("Change Point Date", "").split()[0],
-            "pre_mean": float(summary_2020.get("Pre-Change Mean", 0)),
-            "post_mean": float(summary_2020.get("Post-Change Mean", 0)),
-            "impact_percent": round(
-                (float(summary_2020.get("Post-Change Mean", 0)) - float(summary_2020.get("Pre-Change Mean", 0)))
-                / float(summary_2020.get("Pre-Change Mean", 1)) * 100, 1),
-            "event": "OPEC+ Production Cut (2020)",
-            "description": "Historic 10M bpd cut stabilizes prices after pandemic crash"
-        }
-    ])
+    return serve_prepared(cached_response('change_points', CHANGE_POINT_DEPS, load_change_points))
+
+@app.route('/api/regime')
+def get_regime():
+    return serve_prepared(cached_response('regime', PRICES_DEPS, load_regime))
+
+@app.route('/api/event_impacts')
+def get_event_impacts():
+    return serve_prepared(cached_response('event_impacts', PRICES_DEPS + EVENTS_DEPS, load_event_impacts))
 
 @app.route('/api/indicators')
 def get_indicators():
-    prices = pd.DataFrame(load_brent_prices())
-    prices['Price'] = pd.to_numeric(prices['Price'], errors='coerce')
-    latest_price = prices.iloc[-1]['Price']
-    avg_price = prices['Price'].mean()
-    volatility = prices['Price'].pct_change().std() * 100 * (252**0.5)
-    return jsonify({
-        "latest_price": round(latest_price, 2),
-        "average_price": round(avg_price, 2),
-        "annualized_volatility": round(volatility, 2),
-        "total_events": len(load_events()),
-        "detected_change_points": 2
-    })
+    return serve_prepared(cached_response('indicators', CHANGE_POINT_DEPS, load_indicators))
+
+@app.route('/api/dashboard')
+def get_dashboard():
+    return serve_prepared(dashboard_snapshot())
+
+@app.route('/api/series')
+def get_series_change_points():
+    return serve_prepared(cached_response('series_change_points', series_deps(), load_series_change_points))
+
+@app.route('/api/series/<name>')
+def get_series_change_point(name):
+    rows = cached('series_change_points', series_deps(), load_series_change_points)
+    row = next((row for row in rows if row['series'] == name), None)
+    if row is None:
+        return jsonify({"error": f"Unknown series {name}"}), 404
+    return jsonify(row)
+
+@app.route('/api/fits', methods=['POST'])
+def submit_fit():
+    try:
+        config = normalize_config(request.get_json(silent=True), PRICES_PATH)
+        job, created = fit_jobs().submit(config)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid fit request: {e}"}), 400
+    except QueueFullError as e:
+        return jsonify({"error": str(e)}), 429
+    response = jsonify(job.to_dict())
+    response.status_code = 202 if created else 200
+    response.headers['Location'] = f"/api/fits/{job.id}"
+    return response
+
+@app.route('/api/fits', methods=['GET'])
+def list_fits():
+    return jsonify(fit_jobs().list())
+
+@app.route('/api/fits/<job_id>', methods=['GET'])
+def get_fit(job_id):
+    job = fit_jobs().get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown fit job {job_id}"}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/fits/<job_id>/result', methods=['GET'])
+def get_fit_result(job_id):
+    job = fit_jobs().get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown fit job {job_id}"}), 404
+    if job.status != "done":
+        return jsonify({"error": f"Fit job {job_id} is {job.status}", "status": job.status}), 409
+    return jsonify(job.public_result())
+
+@app.route('/api/fits/<job_id>', methods=['DELETE'])
+def cancel_fit(job_id):
+    job = fit_jobs().cancel(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown fit job {job_id}"}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/posteriors', methods=['GET'])
+def list_posteriors():
+    return jsonify(PosteriorStore(POSTERIORS_DIR).list())
+
+# Views of stored posteriors are cached per (view, key), so the query parameters are limited to
+# fixed values: a client cannot grow the cache or the metric label set with arbitrary ones
+TAU_HISTOGRAM_BINS = (50, 100, 200, 500, 1000)
+SUMMARY_HDI_PROBS = (0.5, 0.8, 0.89, 0.9, 0.94, 0.95, 0.99)
+
+
+def _choice(name, cast, default, allowed):
+    """A query parameter restricted to `allowed`; raises ValueError otherwise."""
+    value = cast(request.args.get(name, default))
+    if value not in allowed:
+        raise ValueError(f"{name} must be one of {', '.join(map(str, allowed))}")
+    return value
+
+
+def _posterior_response(key, name, build):
+    """Serves a view of a stored posterior, computed once per stored file; 404 for unknown keys."""
+    store = PosteriorStore(POSTERIORS_DIR)
+    if not store.contains(key):
+        return jsonify({"error": f"Unknown posterior {key}"}), 404
+    # Stored fits are many, so the metric label is the view alone
+    return serve_prepared(cached_response((name, key), [store.meta_path(key)], build, label=name))
+
+@app.route('/api/posteriors/<key>/tau', methods=['GET'])
+def get_posterior_tau(key):
+    try:
+        bins = _choice('bins', int, 200, TAU_HISTOGRAM_BINS)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid histogram request: {e}"}), 400
+    return _posterior_response(key, f'posterior_tau_{bins}',
+                               lambda: PosteriorStore(POSTERIORS_DIR).tau_histogram(key, bins))
+
+@app.route('/api/posteriors/<key>/summary', methods=['GET'])
+def get_posterior_summary(key):
+    try:
+        hdi_prob = _choice('hdi_prob', float, 0.95, SUMMARY_HDI_PROBS)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid summary request: {e}"}), 400
+    return _posterior_response(key, f'posterior_summary_{hdi_prob}',
+                               lambda: PosteriorStore(POSTERIORS_DIR).summary(key, hdi_prob))
 
 # Serve React App
 @app.route('/', defaults={'path': ''})
@@ -128,4 +653,5 @@ def serve_react(path):
 
 
 if __name__ == '__main__':
+    start_dashboard_refresh()
     app.run(port=5000, debug=True)
\ No newline at end of file
@@ -2,19 +2,21 @@ import React, { useEffect, useState } from 'react';
 import PriceChart from './components/PriceChart';
 import EventTimeline from './components/EventTimeline';
 import IndicatorCard from './components/IndicatorCard';
-import { fetchData } from './services/api';
-import { IndicatorData } from './types';
+import { fetchDashboard } from './services/api';
+import { DashboardData } from './types';
 
 export default function App() {
-  const [indicators, setIndicators] = useState<IndicatorData | null>(null);
+  const [dashboard, setDashboard] = useState<DashboardData | null>(null);
 
   useEffect(() => {
-    fetchData<IndicatorData>('indicators').then(setIndicators).catch(console.error);
+    // A single request: prices, events, change points and indicators from the same data version
+    fetchDashboard().then(setDashboard).catch(console.error);
   }, []);
 
-  if (!indicators) {
+  if (!dashboard) {
     return <div className="p-8">Loading dashboard...</div>;
   }
+  const { indicators } = dashboard;
 
   return (
     <div className="min-h-screen bg-gray-50">
@@ -35,9 +37,9 @@ export default function App() {
 
         <div className="grid grid-cols-1 lg:grid-cols-2 gap-8">
           <div className="lg:col-span-2">
-            <PriceChart />
+            <PriceChart data={dashboard.prices} />
           </div>
-          <EventTimeline />
+          <EventTimeline events={dashboard.events} />
         </div>
       </main>
 
@@ -1,15 +1,9 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState } from 'react';
 import { EventData } from '../types';
-import { fetchData } from '../services/api';
 
-export default function EventTimeline() {
-  const [events, setEvents] = useState<EventData[]>([]);
+export default function EventTimeline({ events }: { events: EventData[] }) {
   const [filter, setFilter] = useState('');
 
-  useEffect(() => {
-    fetchData<EventData[]>('events').then(setEvents).catch(console.error);
-  }, []);
-
   const filtered = events.filter(e => e.Event.toLowerCase().includes(filter.toLowerCase()));
 
   return (
@@ -1,26 +1,11 @@
-import React, { useEffect, useState } from 'react';
+import React from 'react';
 import {
   LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer, ReferenceLine
 } from 'recharts';
-import { PriceData, ChangePointData } from '../types';
-import { fetchData } from '../services/api';
-
-export default function PriceChart() {
-  const [data, setData] = useState<PriceData[]>([]);
-
-  useEffect(() => {
-    const load = async () => {
-      try {
-        const prices = await fetchData<PriceData[]>('prices');
-        const changePoints = await fetchData<ChangePointData[]>('change_points');
-        setData(prices);
-      } catch (err) {
-        console.error("Failed to load price data", err);
-      }
-    };
-    load();
-  }, []);
+import { PriceData } from '../types';
 
+// `data` comes from the dashboard snapshot, already downsampled to the chart width by the server
+export default function PriceChart({ data }: { data: PriceData[] }) {
   return (
     <div className="bg-white p-6 rounded-xl shadow-md border border-gray-200 h-80">
       <h2 className="text-lg font-semibold text-gray-800 mb-4">Brent Oil Price Trend</h2>
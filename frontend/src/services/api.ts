@@ -1,7 +1,44 @@
+import { DashboardData, DashboardSnapshot, PriceData } from '../types';
+
 const API_BASE = 'http://localhost:5000/api';
 
 export const fetchData = async <T,>(endpoint: string): Promise<T> => {
   const response = await fetch(`${API_BASE}/${endpoint}`);
   if (!response.ok) throw new Error(`Failed to fetch ${endpoint}`);
   return await response.json();
-};
\ No newline at end of file
+};
+
+// Binary price format (see src/price_wire.py): a 12-byte little-endian header
+// ('BRP1', uint16 version, uint16 reserved, uint32 count), then count int32 day
+// offsets since 1970-01-01, then count float32 prices.
+const PRICES_MAGIC = 'BRP1';
+const PRICES_HEADER_BYTES = 12;
+const MS_PER_DAY = 86_400_000;
+
+export const decodePrices = (buffer: ArrayBuffer): PriceData[] => {
+  const header = new DataView(buffer, 0, PRICES_HEADER_BYTES);
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+  if (magic !== PRICES_MAGIC || header.getUint16(4, true) !== 1) {
+    throw new Error('Unsupported binary price payload');
+  }
+  const count = header.getUint32(8, true);
+  // Typed arrays use platform byte order, which is little-endian on every browser target
+  const days = new Int32Array(buffer, PRICES_HEADER_BYTES, count);
+  const prices = new Float32Array(buffer, PRICES_HEADER_BYTES + 4 * count, count);
+
+  const data: PriceData[] = new Array(count);
+  for (let i = 0; i < count; i++) {
+    data[i] = {
+      Date: new Date(days[i] * MS_PER_DAY).toISOString().slice(0, 10),
+      Price: Math.round(prices[i] * 100) / 100,
+    };
+  }
+  return data;
+};
+
+// /api/dashboard sends its (already downsampled) prices as a base64-encoded binary price payload
+export const fetchDashboard = async (): Promise<DashboardData> => {
+  const snapshot = await fetchData<DashboardSnapshot>('dashboard');
+  const bytes = Uint8Array.from(atob(snapshot.prices), (c) => c.charCodeAt(0));
+  return { ...snapshot, prices: decodePrices(bytes.buffer) };
+};
@@ -24,4 +24,17 @@ export interface IndicatorData {
   annualized_volatility: number;
   total_events: number;
   detected_change_points: number;
-}
\ No newline at end of file
+}
+
+// /api/dashboard: one consistent snapshot of every section the page renders.
+// `prices` is a base64-encoded binary price payload (see decodePrices in services/api.ts).
+export interface DashboardSnapshot {
+  version: string;
+  built_at: string;
+  prices: string;
+  events: EventData[];
+  change_points: ChangePointData[];
+  indicators: IndicatorData;
+}
+
+export type DashboardData = Omit<DashboardSnapshot, 'prices'> & { prices: PriceData[] };
@@ -0,0 +1,188 @@
+# src/batch_runner.py
+"""
+Task ID:        Task-2
+Created by:     Addisu Taye
+Date Created:   17-OCT-2026
+Purpose:        Fit the change point model on many analysis windows in one parallel batch.
+Key Features:   - Explicit date windows (e.g. the 2005 and 2020 analyses) or automatic rolling windows
+               - Process pool sized so pool workers x PyMC chain cores never exceeds the machine
+               - Per-window artifacts (trace/posterior plots, analysis_summary.csv) in their own folder
+               - Posteriors kept in the posterior store; re-running a batch only fits new or changed windows
+               - One consolidated batch_summary.csv covering every window, failures included
+               - Per-window fit times and outcomes exported to metrics.prom (Prometheus text format)
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from instrumentation import REGISTRY, record_stage, write_textfile
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+ENGINES = ("mcmc", "exact")
+
+
+def rolling_windows(df, length=2520, step=252):
+    """Date windows of `length` trading days, advancing by `step` trading days."""
+    dates = df['Date'].reset_index(drop=True)
+    return [(dates[start], dates[start + length - 1])
+            for start in range(0, len(dates) - length + 1, step)]
+
+
+def plan_pool(engine="mcmc", chains=4, max_workers=None):
+    """
+    Splits the available cores between pool workers and the chains inside each fit.
+    Returns (workers, cores_per_fit).
+    """
+    cpus = os.cpu_count() or 1
+    cores_per_fit = min(chains, cpus) if engine == "mcmc" else 1
+    workers = max(1, cpus // cores_per_fit)
+    if max_workers is not None:
+        workers = max(1, min(workers, max_workers))
+    return workers, cores_per_fit
+
+
+def _init_worker():
+    """Runs once per pool process: headless plotting and single-threaded BLAS per core."""
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = "1"
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    if SRC_DIR not in sys.path:
+        sys.path.insert(0, SRC_DIR)
+
+
+def window_id(start, end):
+    return f"{pd.Timestamp(start):%Y%m%d}_{pd.Timestamp(end):%Y%m%d}"
+
+
+def fit_window(window_df, start, end, output_dir, engine="mcmc", chains=4, cores=1, random_seed=None,
+               store_dir=None):
+    """
+    Fits one window and returns its row of the consolidated results table.
+    The posterior is kept in the posterior store (default: <output_dir>/posteriors); a window that was
+    already fitted with the same data and settings is read back from there instead of resampled.
+    """
+    from change_point_model import count_divergences, save_summary_to_csv, summarize_trace
+    from posterior_store import PosteriorStore, fit_or_load
+
+    window_dir = os.path.join(output_dir, "windows", window_id(start, end))
+    row = {
+        "window_start": pd.Timestamp(start).strftime('%Y-%m-%d'),
+        "window_end": pd.Timestamp(end).strftime('%Y-%m-%d'),
+        "engine": engine,
+        "n_obs": len(window_df),
+        "output_dir": window_dir,
+    }
+    began = time.perf_counter()
+    try:
+        store = PosteriorStore(store_dir or os.path.join(output_dir, "posteriors"))
+        trace, change_date, tau, key, from_store = fit_or_load(
+            window_df, engine=engine, chains=chains, cores=cores, random_seed=random_seed,
+            output_dir=window_dir, store=store)
+        save_summary_to_csv(trace, change_date, output_dir=window_dir)
+        summary = summarize_trace(trace, change_date).set_index("Metric")
+        # Lower and upper HDI bound columns, whatever hdi_prob named them
+        hdi_low, hdi_high = summary.filter(like="HDI ").columns
+        row.update({
+            "change_date": pd.Timestamp(change_date).strftime('%Y-%m-%d'),
+            "tau_index": tau,
+            "pre_mean": summary.loc["Pre-Change Mean", "Value"],
+            "pre_hdi_low": summary.loc["Pre-Change Mean", hdi_low],
+            "pre_hdi_high": summary.loc["Pre-Change Mean", hdi_high],
+            "post_mean": summary.loc["Post-Change Mean", "Value"],
+            "post_hdi_low": summary.loc["Post-Change Mean", hdi_low],
+            "post_hdi_high": summary.loc["Post-Change Mean", hdi_high],
+            "divergences": count_divergences(trace),
+            "posterior_key": key,
+            "from_store": from_store,
+            "status": "ok",
+        })
+    except Exception as e:
+        row.update({"status": "failed", "error": f"{type(e).__name__}: {e}"})
+    row["seconds"] = round(time.perf_counter() - began, 3)
+    return row
+
+
+def run_batch(df, windows, output_dir="./reports/batch", engine="mcmc", chains=4, max_workers=None,
+              random_seed=None):
+    """
+    Fits every (start, end) window in a process pool and writes batch_summary.csv.
+
+    Returns:
+        pd.DataFrame: One row per window, ordered by window start
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}'. Choose one of {ENGINES}.")
+    os.makedirs(output_dir, exist_ok=True)
+    workers, cores_per_fit = plan_pool(engine, chains, max_workers)
+    print(f"🚀 Fitting {len(windows)} windows with {workers} workers x {cores_per_fit} cores ({engine})")
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = {}
+        for start, end in windows:
+            mask = (df['Date'] >= pd.Timestamp(start)) & (df['Date'] <= pd.Timestamp(end))
+            window_df = df.loc[mask].reset_index(drop=True)
+            futures[pool.submit(fit_window, window_df, start, end, output_dir, engine, chains,
+                                cores_per_fit, random_seed)] = (start, end)
+        for future in as_completed(futures):
+            row = future.result()
+            status = "✅" if row["status"] == "ok" else "❌"
+            print(f"{status} {row['window_start']} → {row['window_end']}: "
+                  f"{row.get('change_date', row.get('error'))} ({row['seconds']}s)")
+            record_stage(f"batch.window.{engine}", row["seconds"])
+            REGISTRY.inc("brent_batch_windows_total", help_text="Batch windows by outcome", engine=engine,
+                         status=row["status"])
+            rows.append(row)
+
+    results = pd.DataFrame(rows).sort_values(["window_start", "window_end"]).reset_index(drop=True)
+    csv_path = os.path.join(output_dir, "batch_summary.csv")
+    results.to_csv(csv_path, index=False)
+    write_textfile(os.path.join(output_dir, "metrics.prom"))
+    print(f"✅ Consolidated results saved to {csv_path}")
+    return results
+
+
+def parse_window(text):
+    """Parses 'YYYY-MM-DD:YYYY-MM-DD' into a (start, end) pair of timestamps."""
+    start, end = text.split(":")
+    return pd.Timestamp(start), pd.Timestamp(end)
+
+
+def main(argv=None):
+    """Main execution function."""
+    from load_data import load_brent_prices
+
+    parser = argparse.ArgumentParser(description="Fit the change point model on many windows in parallel.")
+    parser.add_argument("--windows", nargs="*", type=parse_window, default=[],
+                        help="Explicit windows as START:END dates")
+    parser.add_argument("--rolling", type=int, default=None, help="Rolling window length in trading days")
+    parser.add_argument("--step", type=int, default=252, help="Rolling window step in trading days")
+    parser.add_argument("--engine", choices=ENGINES, default="mcmc")
+    parser.add_argument("--chains", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=None, help="Upper bound on pool workers")
+    parser.add_argument("--output-dir", default="./reports/batch")
+    args = parser.parse_args(argv)
+
+    try:
+        df = load_brent_prices()
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e}. Please ensure data files are in the correct location.")
+        return
+
+    windows = list(args.windows)
+    if args.rolling:
+        windows += rolling_windows(df, args.rolling, args.step)
+    if not windows:
+        parser.error("Provide --windows and/or --rolling.")
+
+    run_batch(df, windows, output_dir=args.output_dir, engine=args.engine, chains=args.chains,
+              max_workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+# src/benchmark.py
+"""
+Task ID:        Task-2
+Created by:     Addisu Taye
+Date Created:   17-OCT-2026
+Purpose:        Benchmark suite for the ingestion, model fitting and API paths on synthetic data.
+Key Features:   - Deterministic synthetic series (synthetic_data.py) from 10^3 up to 10^7 points
+               - Ingestion: raw CSV parse, cache build, and every load_brent_prices variant
+               - Fitting: wall time, draws/sec and ESS/sec for the exact and MCMC engines,
+                 save_summary_to_csv, and multi-break segmentation
+               - API: cold and warm latency of each endpoint through the Flask test client,
+                 in a fresh process pointed at the synthetic dataset
+               - Accuracy: detected change points must match the injected ones (exit code 1 if not)
+               - Results are written as JSON; `compare` diffs two result files and flags regressions
+Usage:          python benchmark.py run [--load-sizes ...] [--fit-sizes ...] [--api-sizes ...]
+                python benchmark.py compare reports/benchmarks/base.json reports/benchmarks/head.json
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SRC_DIR)
+EVENTS_SOURCE = os.path.join(ROOT_DIR, 'backend', 'data', 'key_oil_events.csv')
+OUTPUT_DIR = os.path.join(ROOT_DIR, 'reports', 'benchmarks')
+PRICES_FILE = 'BrentOilPrices.csv'
+
+DEFAULT_LOAD_SIZES = (10**3, 10**4, 10**5, 10**6)
+DEFAULT_FIT_SIZES = (10**3, 10**4)
+DEFAULT_API_SIZES = (10**3, 10**4, 10**5)
+ENDPOINTS = [
+    ("prices", "/api/prices", {}),
+    ("prices_binary", "/api/prices", {"Accept": "application/vnd.brent.prices"}),
+    ("prices_downsampled", "/api/prices?max_points=1500", {}),
+    ("prices_window", "/api/prices?start=1975-01-01&end=1985-12-31&max_points=1500", {}),
+    ("events", "/api/events", {}),
+    ("change_points", "/api/change_points", {}),
+    ("event_impacts", "/api/event_impacts", {}),
+    ("indicators", "/api/indicators", {}),
+    ("regime", "/api/regime", {}),
+]
+
+
+def timed(fn, repeat=3, setup=None):
+    """Runs fn `repeat` times (calling setup before each run). Returns (last result, timing dict)."""
+    times, result = [], None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, {"min_s": min(times), "median_s": statistics.median(times), "repeat": repeat}
+
+
+def tolerance(n):
+    """How far (in observations) a detected break may sit from the injected one."""
+    return max(5, n // 200)
+
+
+def prepare_dataset(directory, n, n_change_points, seed):
+    """Writes a synthetic raw price file into `directory`; returns (path, df, change_points)."""
+    from synthetic_data import synthetic_series, write_raw_csv
+
+    os.makedirs(directory, exist_ok=True)
+    df, change_points, _ = synthetic_series(n, n_change_points=n_change_points, seed=seed)
+    path = os.path.join(directory, PRICES_FILE)
+    write_raw_csv(df, path)
+    return path, df, change_points
+
+
+def bench_load(sizes, workdir, seed, repeat):
+    """Ingestion: raw parse, cache build and warm loads through each load_brent_prices variant."""
+    import change_point_model
+    import load_data
+    from price_store import load_price_arrays, parse_raw_prices
+
+    records = []
+    for n in sizes:
+        print(f"⏱️ load: {n} rows")
+        path, _, _ = prepare_dataset(os.path.join(workdir, f"load_{n}"), n, 1, seed)
+        cache_dir = os.path.join(os.path.dirname(path), '.cache')
+
+        def drop_cache():
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+        cases = [
+            ("parse_raw_prices", lambda: parse_raw_prices(path), None),
+            ("cache_build", lambda: load_price_arrays(path), drop_cache),
+            ("load_price_arrays", lambda: load_price_arrays(path), None),
+            ("load_data.load_brent_prices", lambda: load_data.load_brent_prices(path), None),
+            ("change_point_model.load_brent_prices", lambda: change_point_model.load_brent_prices(path), None),
+        ]
+        for name, fn, setup in cases:
+            _, timing = timed(fn, repeat, setup)
+            records.append({"stage": "load", "name": name, "size": n, **timing,
+                            "rows_per_s": n / timing["median_s"]})
+    return records
+
+
+def _accuracy(name, n, injected, detected):
+    injected, detected = [int(i) for i in injected], [int(i) for i in detected]
+    errors = [abs(d - i) for i, d in zip(injected, detected)] if len(injected) == len(detected) else []
+    passed = bool(errors) and max(errors) <= tolerance(n)
+    return {"stage": "accuracy", "name": name, "size": n, "injected": injected, "detected": detected,
+            "max_error": max(errors) if errors else None, "tolerance": tolerance(n), "passed": passed}
+
+
+def _fit_record(name, n, trace, wall_s):
+    import arviz as az
+
+    posterior = trace.posterior
+    draws = posterior.sizes["chain"] * posterior.sizes["draw"]
+    ess = az.ess(trace, var_names=["tau", "mu_1", "mu_2", "sigma"])
+    min_ess = min(float(value.min()) for value in ess.data_vars.values())
+    return {"stage": "fit", "name": name, "size": n, "wall_s": wall_s, "draws_per_s": draws / wall_s,
+            "min_ess": min_ess, "ess_per_s": min_ess / wall_s}
+
+
+def bench_fit(sizes, workdir, seed, engines, mcmc_max_size, pelt_max_size):
+    """Model fits on single-break series, and segmentation on three-break series."""
+    from change_point_model import save_summary_to_csv
+    from segmentation import detect_segments
+
+    records = []
+    for n in sizes:
+        output_dir = os.path.join(workdir, f"fit_{n}")
+        _, df, change_points = prepare_dataset(output_dir, n, 1, seed)
+
+        for engine in engines:
+            if engine == "mcmc" and n > mcmc_max_size:
+                continue
+            print(f"⏱️ fit: {engine} engine, {n} rows")
+            try:
+                if engine == "exact":
+                    from exact_change_point import run_exact_change_point_model as run_model
+                else:
+                    from change_point_model import run_change_point_model as run_model
+                (trace, change_date, tau), timing = timed(
+                    lambda: run_model(df, output_dir=output_dir, chains=4, random_seed=seed), repeat=1)
+            except ImportError as e:
+                records.append({"stage": "fit", "name": engine, "size": n, "skipped": str(e)})
+                continue
+            records.append(_fit_record(engine, n, trace, timing["median_s"]))
+            records.append(_accuracy(f"{engine}_tau", n, change_points, [tau]))
+
+            _, timing = timed(lambda: save_summary_to_csv(trace, change_date, output_dir=output_dir))
+            records.append({"stage": "fit", "name": f"save_summary_to_csv[{engine}]", "size": n, **timing})
+
+        _, df, change_points = prepare_dataset(output_dir, n, 3, seed)
+        methods = ["binseg"] + (["pelt"] if n <= pelt_max_size else [])
+        for method in methods:
+            print(f"⏱️ fit: {method} segmentation, {n} rows")
+            segments, timing = timed(
+                lambda: detect_segments(df, method=method, model="mean", min_size=max(20, n // 50)), repeat=1)
+            records.append({"stage": "fit", "name": f"segmentation[{method}]", "size": n, **timing})
+            records.append(_accuracy(f"segmentation[{method}]", n, change_points,
+                                     segments['start_index'].iloc[1:]))
+    return records
+
+
+def _api_worker(data_dir, reports_dir, repeat):
+    """Runs in a fresh process: imports the backend against the synthetic dataset and times each endpoint."""
+    os.environ['BRENT_DATA_DIR'] = data_dir
+    os.environ['BRENT_REPORTS_DIR'] = reports_dir
+    sys.path.insert(0, os.path.join(ROOT_DIR, 'backend'))
+    import app as backend
+
+    client = backend.app.test_client()
+    results = []
+    for name, url, headers in ENDPOINTS:
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        cold_s = time.perf_counter() - start
+        size = len(response.get_data())
+
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            client.get(url, headers=headers).get_data()
+            times.append(time.perf_counter() - start)
+        times.sort()
+        results.append({"name": name, "status": response.status_code, "bytes": size, "cold_s": cold_s,
+                        "p50_s": times[len(times) // 2], "p95_s": times[min(len(times) - 1, int(len(times) * 0.95))]})
+
+    # The backend's own loader (list of records), on the now-warm cache
+    _, timing = timed(backend.load_brent_prices)
+    results.append({"name": "backend.load_brent_prices", **timing})
+    return results
+
+
+def bench_api(sizes, workdir, seed, repeat):
+    """Per-endpoint latency through the Flask test client, one fresh backend process per size."""
+    from segmentation import detect_segments
+
+    ctx = mp.get_context("spawn")
+    records = []
+    for n in sizes:
+        print(f"⏱️ api: {n} rows")
+        data_dir = os.path.join(workdir, f"api_{n}", "data")
+        reports_dir = os.path.join(workdir, f"api_{n}", "reports")
+        _, df, _ = prepare_dataset(data_dir, n, 3, seed)
+        shutil.copy(EVENTS_SOURCE, data_dir)
+        # Deployments precompute the segment table (segmentation.py); do the same here
+        os.makedirs(reports_dir, exist_ok=True)
+        detect_segments(df, method="binseg", min_size=max(20, n // 50)).to_csv(
+            os.path.join(reports_dir, 'change_point_segments.csv'), index=False)
+
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            results = pool.submit(_api_worker, data_dir, reports_dir, repeat).result()
+        for result in results:
+            stage = "load" if result["name"] == "backend.load_brent_prices" else "api"
+            records.append({"stage": stage, "size": n, **result})
+    return records
+
+
+def environment():
+    """Where and on what the benchmark ran, so result files can be compared meaningfully."""
+    import pandas as pd
+
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=ROOT_DIR, capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(status) if status is not None else None,
+        "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run(args):
+    env = environment()
+    records = []
+    workdir = tempfile.mkdtemp(prefix="brent-bench-")
+    try:
+        if args.load_sizes:
+            records += bench_load(args.load_sizes, workdir, args.seed, args.repeat)
+        if args.fit_sizes:
+            records += bench_fit(args.fit_sizes, workdir, args.seed, args.engines, args.mcmc_max_size,
+                                 args.pelt_max_size)
+        if args.api_sizes:
+            records += bench_api(args.api_sizes, workdir, args.seed, args.api_repeat)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = args.output or os.path.join(
+        OUTPUT_DIR, f"bench-{env['commit'] or 'nogit'}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({"environment": env, "seed": args.seed, "results": records}, f, indent=2)
+    print(f"✅ Saved {len(records)} benchmark results to {output}")
+
+    failed = [r for r in records if r["stage"] == "accuracy" and not r["passed"]]
+    for record in failed:
+        print(f"❌ {record['name']} at n={record['size']}: injected {record['injected']}, "
+              f"detected {record['detected']} (tolerance {record['tolerance']})")
+    return 1 if failed else 0
+
+
+def _metrics(path):
+    """{(stage, name, size, metric): value} for the comparable numbers in a result file."""
+    with open(path) as f:
+        results = json.load(f)["results"]
+    values = {}
+    for record in results:
+        for metric, value in record.items():
+            if metric.endswith("_s") and isinstance(value, (int, float)):
+                values[(record["stage"], record["name"], record["size"], metric)] = value
+    return values
+
+
+def compare(args):
+    """Prints head/base ratios; exits 1 when anything got slower (or lower throughput) than the threshold."""
+    base, head = _metrics(args.base), _metrics(args.head)
+    regressions = 0
+    for key in sorted(set(base) & set(head), key=str):
+        stage, name, size, metric = key
+        # *_per_s are throughputs (higher is better); other *_s values are durations
+        ratio = head[key] / base[key] if base[key] else float('inf')
+        slowdown = 1 / ratio if metric.endswith("_per_s") else ratio
+        flag = slowdown > 1 + args.threshold
+        regressions += flag
+        print(f"{'❌' if flag else '  '} {stage:<8} {name:<40} {size:>9} {metric:<12} "
+              f"{base[key]:>12.6g} -> {head[key]:<12.6g} x{ratio:.2f}")
+    print(f"\n{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Benchmark ingestion, fitting and the API on synthetic data.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks and write a JSON result file")
+    run_parser.add_argument("--load-sizes", type=int, nargs="*", default=list(DEFAULT_LOAD_SIZES))
+    run_parser.add_argument("--fit-sizes", type=int, nargs="*", default=list(DEFAULT_FIT_SIZES))
+    run_parser.add_argument("--api-sizes", type=int, nargs="*", default=list(DEFAULT_API_SIZES))
+    run_parser.add_argument("--engines", nargs="+", choices=("exact", "mcmc"), default=["exact", "mcmc"])
+    run_parser.add_argument("--mcmc-max-size", type=int, default=10**3,
+                            help="Largest series fitted with MCMC (it scales far worse than the exact engine)")
+    run_parser.add_argument("--pelt-max-size", type=int, default=10**4,
+                            help="Largest series segmented with PELT (quadratic when breaks are rare)")
+    run_parser.add_argument("--repeat", type=int, default=3, help="Repetitions of each ingestion timing")
+    run_parser.add_argument("--api-repeat", type=int, default=20, help="Warm requests per endpoint")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--output", help="Result file (default: reports/benchmarks/bench-<commit>-<time>.json)")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("head")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown (0.2 = 20%%)")
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+# src/bootstrap.py
+"""
+Task ID:        Task-1
+Created by:     Addisu Taye
+Date Created:   17-OCT-2026
+Purpose:        Block-bootstrap confidence intervals for the return statistics shown on the dashboard and
+                in the EDA: volatility, mean return, skewness, kurtosis and their pre/post regime changes.
+Key Features:   - Circular block bootstrap, so the volatility clustering of daily returns survives resampling
+               - Every resample is drawn up front as one (resamples x blocks) array of block starts
+               - Blocks are reduced through precomputed block sums of the first four powers of the
+                 returns, so a resample costs one gather per block instead of one per observation
+               - Moments of all resamples come out of chunked NumPy reductions (10,000 resamples of the
+                 full history take well under a second)
+               - Pre/post regime differences bootstrap each side of a change point independently
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import REGISTRY, stage
+
+DEFAULT_RESAMPLES = 10000
+DEFAULT_CONFIDENCE = 0.95
+TRADING_DAYS = 252
+# Gathered block sums per chunk (x 4 powers); bounds the temporary memory at ~128 MB
+CHUNK_CELLS = 1 << 22
+STATISTICS = ("mean_return", "volatility", "annualized_volatility", "skewness", "kurtosis")
+
+
+def default_block_length(n):
+    """n^(1/3) rule of thumb for bootstrapping variances and higher moments of dependent data."""
+    return max(1, int(np.ceil(n ** (1 / 3))))
+
+
+def _power_block_sums(centred, length):
+    """Sums of centred^1..4 over the circular block of `length` values starting at every index (n x 4)."""
+    n = len(centred)
+    wrapped = np.concatenate([centred, centred[:length]])
+    powers = np.cumsum(wrapped[:, None] ** np.arange(1, 5), axis=0)
+    powers = np.vstack([np.zeros((1, 4)), powers])
+    return powers[length:length + n] - powers[:n]
+
+
+def _moment_statistics(sums, n, shift):
+    """
+    The STATISTICS of samples of size n from their power sums (last axis: sum of x^1..4 with x = value - shift).
+    Skewness and excess kurtosis use the same bias-corrected estimators as pandas.
+    """
+    s1, s2, s3, s4 = (sums[..., k] / n for k in range(4))
+    m2 = np.maximum(s2 - s1 ** 2, 1e-300)
+    m3 = s3 - 3 * s1 * s2 + 2 * s1 ** 3
+    m4 = s4 - 4 * s1 * s3 + 6 * s1 ** 2 * s2 - 3 * s1 ** 4
+    std = np.sqrt(m2 * n / (n - 1))
+    return {
+        "mean_return": s1 + shift,
+        "volatility": std,
+        "annualized_volatility": std * np.sqrt(TRADING_DAYS) * 100,
+        "skewness": np.sqrt(n * (n - 1)) / (n - 2) * m3 / m2 ** 1.5,
+        "kurtosis": (n - 1) / ((n - 2) * (n - 3)) * ((n + 1) * (m4 / m2 ** 2 - 3) + 6),
+    }
+
+
+def block_bootstrap(values, n_resamples=DEFAULT_RESAMPLES, block_length=None, seed=0):
+    """
+    Circular block bootstrap of the return STATISTICS.
+
+    Returns:
+        tuple: (estimates of the original sample, dict of per-resample arrays of length n_resamples)
+    """
+    x = np.asarray(values, dtype=float)
+    x = x[np.isfinite(x)]
+    n = len(x)
+    if n < 4:
+        raise ValueError("At least four returns are needed to bootstrap skewness and kurtosis.")
+    length = min(int(block_length or default_block_length(n)), n)
+    n_blocks = -(-n // length)
+    tail = n - (n_blocks - 1) * length
+
+    # Centre on the sample mean so the power sums stay well conditioned
+    shift = float(x.mean())
+    centred = x - shift
+    full = _power_block_sums(centred, length)
+    last = full if tail == length else _power_block_sums(centred, tail)
+    estimates = {name: float(value) for name, value in
+                 _moment_statistics((centred[:, None] ** np.arange(1, 5)).sum(axis=0), n, shift).items()}
+
+    rng = np.random.default_rng(seed)
+    starts = rng.integers(0, n, size=(n_resamples, n_blocks), dtype=np.int32)
+    sums = np.empty((n_resamples, 4))
+    chunk = max(1, CHUNK_CELLS // n_blocks)
+    for begin in range(0, n_resamples, chunk):
+        rows = starts[begin:begin + chunk]
+        sums[begin:begin + chunk] = full[rows[:, :-1]].sum(axis=1) + last[rows[:, -1]]
+    REGISTRY.inc("brent_bootstrap_resamples_total", n_resamples, "Block-bootstrap resamples drawn")
+    return estimates, _moment_statistics(sums, n, shift)
+
+
+def confidence_intervals(estimates, resamples, confidence=DEFAULT_CONFIDENCE):
+    """Percentile intervals and bootstrap standard errors, one dict per statistic."""
+    tail = (1 - confidence) / 2 * 100
+    summary = {}
+    for name, estimate in estimates.items():
+        low, high = np.percentile(resamples[name], [tail, 100 - tail])
+        summary[name] = {"estimate": estimate, "ci_low": float(low), "ci_high": float(high),
+                         "std_error": float(resamples[name].std(ddof=1))}
+    return summary
+
+
+def bootstrap_summary(values, n_resamples=DEFAULT_RESAMPLES, block_length=None, confidence=DEFAULT_CONFIDENCE,
+                      seed=0):
+    """Confidence intervals of the return STATISTICS of one series of returns."""
+    with stage("bootstrap.summary"):
+        return confidence_intervals(*block_bootstrap(values, n_resamples, block_length, seed), confidence)
+
+
+def regime_difference(values, split, n_resamples=DEFAULT_RESAMPLES, block_length=None,
+                      confidence=DEFAULT_CONFIDENCE, seed=0):
+    """
+    Confidence intervals of (after - before) for every statistic, splitting `values` at index `split`.
+    Each side is block-bootstrapped on its own, so no block straddles the change point.
+    """
+    values = np.asarray(values, dtype=float)
+    with stage("bootstrap.regime_difference"):
+        # Different streams for the two sides, both reproducible from `seed`
+        before_seed, after_seed = np.random.SeedSequence(seed).spawn(2)
+        before = block_bootstrap(values[:split], n_resamples, block_length, before_seed)
+        after = block_bootstrap(values[split:], n_resamples, block_length, after_seed)
+        estimates = {name: after[0][name] - before[0][name] for name in STATISTICS}
+        resamples = {name: after[1][name] - before[1][name] for name in STATISTICS}
+        return confidence_intervals(estimates, resamples, confidence)
+
+
+def regime_differences(returns, dates, break_dates, **kwargs):
+    """
+    One regime_difference per break, each comparing the returns between the previous and next break.
+    `returns` and `dates` are aligned arrays; breaks with fewer than four returns on a side are skipped.
+    """
+    dates = pd.to_datetime(pd.Series(dates)).to_numpy()
+    splits = np.searchsorted(dates, pd.to_datetime(pd.Series(break_dates)).to_numpy())
+    bounds = np.r_[0, splits, len(dates)]
+    rows = []
+    for i, split in enumerate(splits):
+        lo, hi = bounds[i], bounds[i + 2]
+        if split - lo < 4 or hi - split < 4:
+            continue
+        rows.append({"date": pd.Timestamp(dates[split]).strftime('%Y-%m-%d'),
+                     "differences": regime_difference(returns[lo:hi], split - lo, **kwargs)})
+    return rows
+
+
+def format_interval(interval, digits=4):
+    return (f"{interval['estimate']:.{digits}f} "
+            f"[{interval['ci_low']:.{digits}f}, {interval['ci_high']:.{digits}f}]")
+
+
+def main(argv=None):
+    """Main execution function."""
+    import time
+
+    from price_store import load_prices
+
+    parser = argparse.ArgumentParser(description="Block-bootstrap confidence intervals of Brent return statistics.")
+    parser.add_argument("--data", default="data/BrentOilPrices.csv")
+    parser.add_argument("--resamples", type=int, default=DEFAULT_RESAMPLES)
+    parser.add_argument("--block-length", type=int, default=None, help="Default: n^(1/3)")
+    parser.add_argument("--confidence", type=float, default=DEFAULT_CONFIDENCE)
+    parser.add_argument("--split", nargs="*", default=[], metavar="YYYY-MM-DD",
+                        help="Change point dates to compare the regimes around")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    try:
+        df = load_prices(args.data)
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e}. Please ensure data files are in the correct location.")
+        return 1
+
+    log_return = np.log(df['Price'] / df['Price'].shift(1)).to_numpy()[1:]
+    options = dict(n_resamples=args.resamples, block_length=args.block_length, confidence=args.confidence,
+                   seed=args.seed)
+    start = time.perf_counter()
+    summary = bootstrap_summary(log_return, **options)
+    seconds = time.perf_counter() - start
+    print(f"🔁 {args.resamples} block-bootstrap resamples of {len(log_return)} daily log returns "
+          f"in {seconds:.2f}s ({args.confidence:.0%} intervals)")
+    for name in STATISTICS:
+        print(f"   {name:<22} {format_interval(summary[name])}")
+
+    for row in regime_differences(log_return, df['Date'].to_numpy()[1:], args.split, **options):
+        print(f"\n📅 Change at {row['date']} (after - before):")
+        for name in ("mean_return", "annualized_volatility"):
+            print(f"   {name:<22} {format_interval(row['differences'][name])}")
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,12 +2,14 @@
 # Setup and Data Loading
 # ==============================================================================
 import pandas as pd
-import pymc as pm
 import numpy as np
-import arviz as az
-import matplotlib.pyplot as plt
 import os
-import pytensor.tensor as at
+import time
+from instrumentation import REGISTRY, record_stage, stage, timed_stage
+from price_store import load_prices
+# PyMC, PyTensor, ArviZ and Matplotlib are imported inside the functions that use them:
+# together they take seconds to import, which callers that only need the loader or the
+# summary helpers should not pay for.
 #from google.colab import drive
 
 # Mount Google Drive to access data files
@@ -19,11 +21,7 @@ def load_brent_prices(data_path="./data/BrentOilPrices.csv"):
     Loads and preprocesses Brent oil price data from a CSV file.
     """
     try:
-        df = pd.read_csv(data_path, parse_dates=['Date'])
-        df.columns = ['Date', 'Price']
-        df.sort_values(by='Date', inplace=True)
-        df.reset_index(drop=True, inplace=True)
-        return df
+        return load_prices(data_path)
     except FileNotFoundError:
         print(f"❌ Error: Data file not found at {data_path}. Please check the path.")
         return None
@@ -32,16 +30,23 @@ def load_brent_prices(data_path="./data/BrentOilPrices.csv"):
 # Bayesian Change Point Analysis Functions
 # ==============================================================================
 
-def run_change_point_model(df, output_dir="./reports"):
+@timed_stage("fit.mcmc")
+def run_change_point_model(df, output_dir="./reports", chains=None, cores=None, random_seed=None):
     """
     Runs a Bayesian change point model on oil price data and returns the trace.
+    `chains` and `cores` are passed to pm.sample (PyMC defaults when None).
     """
+    import arviz as az
+    import matplotlib.pyplot as plt
+    import pymc as pm
+    import pytensor.tensor as at
+
     os.makedirs(output_dir, exist_ok=True)
     
     price = df['Price'].values
     n = len(price)
 
-    with pm.Model() as model:
+    with stage("fit.mcmc.build"), pm.Model() as model:
         tau = pm.DiscreteUniform('tau', lower=0, upper=n - 1)
         mu_1 = pm.Normal('mu_1', mu=np.mean(price), sigma=10)
         mu_2 = pm.Normal('mu_2', mu=np.mean(price), sigma=10)
@@ -51,53 +56,93 @@ def run_change_point_model(df, output_dir="./reports"):
         
         likelihood = pm.Normal('y', mu=mu, sigma=sigma, observed=price)
 
-        trace = pm.sample(draws=2000, tune=1000, target_accept=0.95)
+    # The callback marks when the first chain leaves tuning, splitting the run into tune/draw phases
+    phases = {}
+
+    def mark_phase(trace, draw):
+        if not draw.tuning and "draw_start" not in phases:
+            phases["draw_start"] = time.perf_counter()
+
+    with model:
+        sample_start = time.perf_counter()
+        trace = pm.sample(draws=2000, tune=1000, target_accept=0.95,
+                          chains=chains, cores=cores, random_seed=random_seed, callback=mark_phase)
+        sample_end = time.perf_counter()
+    draw_start = phases.get("draw_start", sample_start)
+    record_stage("fit.mcmc.tune", draw_start - sample_start)
+    record_stage("fit.mcmc.draw", sample_end - draw_start)
+    record_sampling_metrics("mcmc", trace, sample_end - draw_start)
 
-    az.plot_trace(trace, var_names=['mu_1', 'mu_2', 'sigma'])
-    plt.savefig(f"{output_dir}/trace_plot.png")
-    plt.close()
+    with stage("fit.mcmc.trace_plot"):
+        az.plot_trace(trace, var_names=['mu_1', 'mu_2', 'sigma'])
+        plt.savefig(f"{output_dir}/trace_plot.png")
+        plt.close()
 
     tau_samples = trace.posterior['tau'].values.flatten()
     most_probable_tau = int(pd.Series(tau_samples).mode()[0])
     change_date = df.iloc[most_probable_tau]['Date']
 
-    plt.hist(tau_samples, bins=50, alpha=0.7, color='skyblue', density=True)
-    plt.axvline(most_probable_tau, color='red', linestyle='--', label=f'MAP: {most_probable_tau}')
-    plt.title("Posterior Distribution of Change Point (tau)")
-    plt.xlabel("Time Index")
-    plt.legend()
-    plt.savefig(f"{output_dir}/posterior_tau.png")
-    plt.close()
+    with stage("fit.mcmc.tau_plot"):
+        plt.hist(tau_samples, bins=50, alpha=0.7, color='skyblue', density=True)
+        plt.axvline(most_probable_tau, color='red', linestyle='--', label=f'MAP: {most_probable_tau}')
+        plt.title("Posterior Distribution of Change Point (tau)")
+        plt.xlabel("Time Index")
+        plt.legend()
+        plt.savefig(f"{output_dir}/posterior_tau.png")
+        plt.close()
 
     return trace, change_date, most_probable_tau
 
 
-def save_summary_to_csv(trace, change_date, output_dir="./reports"):
+def count_divergences(trace):
+    """Divergent transitions in a trace (0 for samplers that do not report them)."""
+    stats = getattr(trace, "sample_stats", None)
+    return int(stats["diverging"].sum()) if stats is not None and "diverging" in stats else 0
+
+
+def record_sampling_metrics(engine, trace, draw_seconds):
+    """Records draw count, sampling rate and divergences of a finished fit."""
+    posterior = trace.posterior
+    draws = posterior.sizes["chain"] * posterior.sizes["draw"]
+    REGISTRY.inc("brent_fit_draws_total", draws, "Posterior draws produced", engine=engine)
+    REGISTRY.set("brent_fit_draws_per_second", draws / max(draw_seconds, 1e-9),
+                 "Sampling rate of the most recent fit", engine=engine)
+    divergences = count_divergences(trace)
+    REGISTRY.inc("brent_fit_divergences_total", divergences, "Divergent transitions", engine=engine)
+    REGISTRY.set("brent_fit_last_divergences", divergences, "Divergences in the most recent fit", engine=engine)
+
+
+def summarize_trace(trace, change_date, hdi_prob=0.95):
     """
-    Saves a summary of the model results to a CSV file.
+    Builds the Metric / Value / HDI summary table of the model results.
+    The HDI columns are named after ArviZ's bounds for `hdi_prob` (HDI 2.5% / HDI 97.5% for 0.95).
     """
-    mu_1_summary = az.summary(trace, var_names=['mu_1'], hdi_prob=0.95)
-    mu_2_summary = az.summary(trace, var_names=['mu_2'], hdi_prob=0.95)
+    import arviz as az
 
-    mu_1_mean = mu_1_summary['mean'].values[0]
-    mu_1_hdi_low = mu_1_summary['hdi_3%'].values[0]
-    mu_1_hdi_high = mu_1_summary['hdi_97%'].values[0]
-
-    mu_2_mean = mu_2_summary['mean'].values[0]
-    mu_2_hdi_low = mu_2_summary['hdi_3%'].values[0]
-    mu_2_hdi_high = mu_2_summary['hdi_97%'].values[0]
+    summary = az.summary(trace, var_names=['mu_1', 'mu_2'], hdi_prob=hdi_prob)
+    hdi_columns = list(summary.filter(like='hdi_').columns)
+    low_label, high_label = (f"HDI {column[len('hdi_'):]}" for column in hdi_columns)
+    (mu_1_hdi_low, mu_1_hdi_high), (mu_2_hdi_low, mu_2_hdi_high) = summary[hdi_columns].values
 
     summary_data = {
         "Metric": ["Pre-Change Mean", "Post-Change Mean", "Change Point Date"],
-        "Value": [mu_1_mean, mu_2_mean, change_date],
-        "HDI 3%": [mu_1_hdi_low, mu_2_hdi_low, np.nan],
-        "HDI 97%": [mu_1_hdi_high, mu_2_hdi_high, np.nan]
+        "Value": [summary.loc['mu_1', 'mean'], summary.loc['mu_2', 'mean'], change_date],
+        low_label: [mu_1_hdi_low, mu_2_hdi_low, np.nan],
+        high_label: [mu_1_hdi_high, mu_2_hdi_high, np.nan]
     }
     
-    summary_df = pd.DataFrame(summary_data)
-    
-    csv_path = os.path.join(output_dir, "analysis_summary.csv")
-    summary_df.to_csv(csv_path, index=False)
+    return pd.DataFrame(summary_data)
+
+
+def save_summary_to_csv(trace, change_date, output_dir="./reports"):
+    """
+    Saves a summary of the model results to a CSV file.
+    """
+    with stage("summary.save_csv"):
+        summary_df = summarize_trace(trace, change_date)
+
+        csv_path = os.path.join(output_dir, "analysis_summary.csv")
+        summary_df.to_csv(csv_path, index=False)
     print(f" Summary data saved to {csv_path}")
 
 
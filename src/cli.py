@@ -0,0 +1,284 @@
+# src/cli.py
+"""
+Task ID:        Task-2
+Created by:     Addisu Taye
+Date Created:   17-OCT-2026
+Purpose:        Single command-line entry point for the analysis (ingest, eda, fit, series, summarize, serve, bench).
+Key Features:   - Importing this module costs only the standard library; pandas, PyMC, ArviZ, matplotlib
+                 and seaborn are imported inside the subcommands that actually use them
+               - `summarize` works from the memory-mapped price cache with NumPy alone
+               - `--metrics-file` writes the run's stage timings for scraping (see instrumentation.py)
+               - `import-budget` measures, in a fresh interpreter, the cold import time of this entry point
+                 and of the `summarize` path (the CLI plus what cmd_summarize imports), and fails when
+                 either exceeds its budget or pulls in a heavy library
+Usage:          python src/cli.py <command> [options]   (run `python src/cli.py -h` for the list)
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SRC_DIR)
+DEFAULT_DATA = "data/BrentOilPrices.csv"
+DEFAULT_IMPORT_BUDGET_MS = 150
+DEFAULT_SUMMARIZE_BUDGET_MS = 300
+# Statements timed by import-budget; "summarize" mirrors the imports of cmd_summarize
+IMPORT_PATHS = {"cli": "import cli", "summarize": "import cli, numpy, price_store"}
+HEAVY_MODULES = ("pandas", "scipy", "matplotlib", "seaborn", "pymc", "arviz", "pytensor")
+
+
+def cmd_ingest(args):
+    """Parses the raw CSV into the columnar cache (rebuilt only when the file changed)."""
+    if args.ticks:
+        from tick_ingest import ingest_ticks
+
+        stats = ingest_ticks(args.ticks, chunk_bytes=int(args.chunk_mb * (1 << 20)), rebuild=args.rebuild)
+        print(f"✅ Daily bars ready ({stats['mode']}): {stats['ticks']} ticks read, {stats['new_days']} new days, "
+              f"{stats['days']} days in total from {args.ticks}")
+        return
+
+    from price_store import load_price_arrays
+
+    days, _ = load_price_arrays(args.data)
+    print(f"✅ Price cache ready: {len(days)} rows from {args.data}")
+    if not args.no_snapshot:
+        backend_dir = os.path.join(ROOT_DIR, "backend")
+        if backend_dir not in sys.path:
+            sys.path.insert(0, backend_dir)
+        from app import DASHBOARD_SNAPSHOT_PATH, persist_states, refresh_dashboard
+
+        detector_rows, rolling_rows = persist_states()
+        print(f"✅ Saved states updated: {detector_rows} new rows for the online detector, "
+              f"{rolling_rows} for the rolling statistics")
+        version, _ = refresh_dashboard()
+        print(f"✅ Dashboard snapshot {version} ready: {DASHBOARD_SNAPSHOT_PATH}")
+
+
+def cmd_eda(args):
+    """Runs the exploratory analysis and renders the report figures."""
+    import exploratory_analysis
+
+    argv = (["--force"] if args.force else []) + (["--downsample"] if args.downsample else [])
+    exploratory_analysis.main(argv)
+
+
+def cmd_fit(args):
+    """Fits the change point model on the whole series or a date window (reusing a stored identical fit)."""
+    import numpy as np
+    from change_point_model import save_summary_to_csv
+    from posterior_store import PosteriorStore, fit_or_load
+    from price_store import load_prices
+
+    df = load_prices(args.data)
+    if args.start:
+        df = df[df['Date'] >= np.datetime64(args.start)]
+    if args.end:
+        df = df[df['Date'] <= np.datetime64(args.end)]
+    df = df.reset_index(drop=True)
+    if len(df) < 2:
+        print("❌ Error: the requested window holds fewer than two prices.")
+        return 1
+
+    print(f"🔍 Fitting the {args.engine} change point model on {len(df)} records...")
+    os.makedirs(args.output_dir, exist_ok=True)
+    trace, change_date, tau_idx, key, from_store = fit_or_load(
+        df, engine=args.engine, chains=args.chains, random_seed=args.random_seed, output_dir=args.output_dir,
+        store=PosteriorStore(args.store_dir))
+    print(f"{'📦 Loaded from' if from_store else '💾 Saved to'} the posterior store as {key}")
+
+    print(f"Most probable change point occurred at index: {tau_idx}")
+    print(f"Corresponding date: {change_date.strftime('%Y-%m-%d')}")
+    save_summary_to_csv(trace, change_date, output_dir=args.output_dir)
+
+
+def cmd_series(args):
+    """Detects the change point of every series in a directory of price CSVs (multi_series.py)."""
+    import multi_series
+
+    argv = [args.directory, "--output", args.output, "--workers", str(args.workers)]
+    return multi_series.main(argv)
+
+
+def cmd_summarize(args):
+    """Quick statistics from the price cache, plus the last saved model summary if there is one."""
+    import numpy as np
+    from price_store import EPOCH, load_price_arrays
+
+    days, prices = load_price_arrays(args.data)
+    prices = np.asarray(prices)
+    returns = np.diff(np.log(prices))
+    first, last = (EPOCH + np.asarray(days[[0, -1]]).astype('timedelta64[D]'))
+    print(f"\n📊 {len(prices)} records from {first} to {last}")
+    print(f"   Last price:  ${prices[-1]:.2f}")
+    print(f"   Mean price:  ${prices.mean():.2f}  (min ${prices.min():.2f}, max ${prices.max():.2f})")
+    print(f"   Daily log return: mean {returns.mean():.5f}, std {returns.std(ddof=1):.5f}")
+
+    summary_path = os.path.join(args.output_dir, "analysis_summary.csv")
+    if os.path.exists(summary_path):
+        print(f"\n📄 Model summary ({summary_path}):")
+        with open(summary_path) as f:
+            print(f.read().rstrip())
+
+
+def cmd_serve(args):
+    """Starts the Flask dashboard backend."""
+    backend_dir = os.path.join(ROOT_DIR, "backend")
+    if backend_dir not in sys.path:
+        sys.path.insert(0, backend_dir)
+    from app import app, start_dashboard_refresh
+
+    # Warm the dashboard snapshot while the server starts, so no request waits for it
+    start_dashboard_refresh()
+    app.run(host=args.host, port=args.port, debug=args.debug)
+
+
+def cmd_bench(args):
+    """Runs the benchmark suite (benchmark.py) with the remaining arguments."""
+    import benchmark
+
+    return benchmark.main(args.bench_args or ["run"])
+
+
+def cmd_sensitivity(args):
+    """Runs the prior-sensitivity sweep (prior_sensitivity.py) with the remaining arguments."""
+    import prior_sensitivity
+
+    return prior_sensitivity.main(args.sweep_args)
+
+
+def measure_import(statement="import cli"):
+    """
+    Runs an import statement in a fresh interpreter with -X importtime.
+    Returns (total_ms, imported_module_names).
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            cwd=SRC_DIR, capture_output=True, text=True, check=True)
+    total_us, modules = 0, set()
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+\s+\|\s+(\d+)\s+\|(\s*)(\S+)", line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(1)), match.group(2), match.group(3)
+        modules.add(name)
+        if len(indent) == 1:  # top-level entries; nested ones are already in their parent's total
+            total_us += cumulative
+    return total_us / 1000, modules
+
+
+def cmd_import_budget(args):
+    """
+    Fails (exit code 1) when importing the CLI, or the CLI plus the summarize path, is slower than
+    its budget or loads a heavy library.
+    """
+    budgets = {"cli": args.max_ms, "summarize": args.summarize_max_ms}
+    failed = False
+    for path, statement in IMPORT_PATHS.items():
+        total_ms, modules = measure_import(statement)
+        heavy = sorted({name.split('.')[0] for name in modules} & set(HEAVY_MODULES))
+        print(f"⏱️ Cold import of {path}: {total_ms:.1f} ms (budget {budgets[path]} ms)")
+        if heavy:
+            print(f"❌ Heavy modules imported by {path}: {', '.join(heavy)}")
+        if total_ms > budgets[path]:
+            print(f"❌ Import time budget of {path} exceeded")
+        failed = failed or bool(heavy) or total_ms > budgets[path]
+    if failed:
+        return 1
+    print("✅ Within budget")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Brent oil price change point analysis.")
+    parser.add_argument("--metrics-file", help="Write stage timings and counters here (Prometheus text format) "
+                                               "when the command finishes, e.g. for cron-driven refreshes")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest = subparsers.add_parser("ingest", help="Build or refresh the columnar price cache")
+    ingest.add_argument("--data", default=DEFAULT_DATA)
+    ingest.add_argument("--ticks", help="Stream this tick/intraday CSV (Date,Price[,Volume]) into daily OHLC/VWAP "
+                                        "bars instead; only rows appended since the last run are read")
+    ingest.add_argument("--chunk-mb", type=float, default=64, help="Block size for --ticks (bounds peak memory)")
+    ingest.add_argument("--rebuild", action="store_true", help="Re-ingest the tick file from the start")
+    ingest.add_argument("--no-snapshot", action="store_true",
+                        help="Skip updating the backend's saved detector/rolling states and /api/dashboard snapshot "
+                             "(from its own data directory)")
+    ingest.set_defaults(handler=cmd_ingest)
+
+    eda = subparsers.add_parser("eda", help="Exploratory analysis and report figures")
+    eda.add_argument("--force", action="store_true", help="Re-render every figure, even if unchanged")
+    eda.add_argument("--downsample", action="store_true",
+                     help="Downsample price lines to the output pixel width before plotting")
+    eda.set_defaults(handler=cmd_eda)
+
+    fit = subparsers.add_parser("fit", help="Fit the Bayesian change point model")
+    fit.add_argument("--data", default=DEFAULT_DATA)
+    fit.add_argument("--engine", choices=("exact", "mcmc"), default="exact")
+    fit.add_argument("--start", help="First date of the window (YYYY-MM-DD)")
+    fit.add_argument("--end", help="Last date of the window (YYYY-MM-DD)")
+    fit.add_argument("--chains", type=int, default=4)
+    fit.add_argument("--random-seed", type=int, default=None)
+    fit.add_argument("--output-dir", default="./reports")
+    fit.add_argument("--store-dir", default="./reports/posteriors", help="Posterior store directory")
+    fit.set_defaults(handler=cmd_fit)
+
+    series = subparsers.add_parser("series", help="Change points of many price series in one batch")
+    series.add_argument("directory", nargs="?", default="data/series",
+                        help="Directory of CSVs in the BrentOilPrices.csv format")
+    series.add_argument("--output", default="./reports/multi_series_change_points.csv")
+    series.add_argument("--workers", type=int, default=1)
+    series.set_defaults(handler=cmd_series)
+
+    summarize = subparsers.add_parser("summarize", help="Print quick price statistics and the last model summary")
+    summarize.add_argument("--data", default=DEFAULT_DATA)
+    summarize.add_argument("--output-dir", default="./reports")
+    summarize.set_defaults(handler=cmd_summarize)
+
+    serve = subparsers.add_parser("serve", help="Run the dashboard backend")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=5000)
+    serve.add_argument("--debug", action="store_true")
+    serve.set_defaults(handler=cmd_serve)
+
+    bench = subparsers.add_parser("bench", help="Benchmark suite on synthetic data (see benchmark.py -h)")
+    bench.add_argument("bench_args", nargs=argparse.REMAINDER)
+    bench.set_defaults(handler=cmd_bench)
+
+    sensitivity = subparsers.add_parser("sensitivity", help="Prior-sensitivity sweep (see prior_sensitivity.py -h)")
+    sensitivity.add_argument("sweep_args", nargs=argparse.REMAINDER)
+    sensitivity.set_defaults(handler=cmd_sensitivity)
+
+    budget = subparsers.add_parser("import-budget", help="Check the cold import time of this entry point")
+    budget.add_argument("--max-ms", type=float, default=DEFAULT_IMPORT_BUDGET_MS)
+    budget.add_argument("--summarize-max-ms", type=float, default=DEFAULT_SUMMARIZE_BUDGET_MS,
+                        help="Budget for the CLI plus the modules `summarize` imports (NumPy, price_store)")
+    budget.set_defaults(handler=cmd_import_budget)
+    return parser
+
+
+def main(argv=None):
+    """Main execution function."""
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    # REMAINDER does not capture a leading option (e.g. `sensitivity --start ...`), so pass-through
+    # commands also receive whatever argparse did not recognise
+    if hasattr(args, "sweep_args"):
+        args.sweep_args = extra + args.sweep_args
+    elif hasattr(args, "bench_args"):
+        args.bench_args = extra + args.bench_args
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    try:
+        return args.handler(args)
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e}. Please ensure data files are in the correct location.")
+        return 1
+    finally:
+        if args.metrics_file:
+            from instrumentation import write_textfile
+            write_textfile(args.metrics_file)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
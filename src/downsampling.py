@@ -0,0 +1,113 @@
+# src/downsampling.py
+"""
+Task ID:        Task-3
+Created by:     Addisu Taye
+Date Created:   17-OCT-2026
+Purpose:        Shape-preserving downsampling of the price series for charts and range queries.
+Key Features:   - Largest-Triangle-Three-Buckets (LTTB) to a target number of points
+               - Min/max bucket reduction (vectorized, keeps every spike) to build coarser levels
+               - Multi-resolution pyramid answering date-range queries by binary search, so the
+                 work per query is bounded by max_points, not by the length of the history
+"""
+
+import numpy as np
+
+EPOCH = np.datetime64('1970-01-01', 'D')
+
+
+def lttb(x, y, n_out):
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+    The first and last points are always kept.
+    """
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1], dtype=np.int64)[:max(n_out, 0)]
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # Bucket boundaries over the interior points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Average point of every bucket, used as the third triangle vertex for the previous bucket
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts
+    avg_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts
+    avg_x = np.append(avg_x, x[-1])
+    avg_y = np.append(avg_y, y[-1])
+
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    prev = 0
+    for bucket in range(n_out - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        cx, cy = avg_x[bucket + 1], avg_y[bucket + 1]
+        area = np.abs((x[prev] - cx) * (y[lo:hi] - y[prev]) - (x[prev] - x[lo:hi]) * (cy - y[prev]))
+        prev = lo + int(np.argmax(area))
+        kept[bucket + 1] = prev
+    return kept
+
+
+def minmax_reduce(values, bucket=8):
+    """
+    Indices of the minimum and maximum of every `bucket` consecutive points (plus the
+    endpoints), in time order. Reduces the length by about bucket / 2 without losing spikes.
+    """
+    n = len(values)
+    full = (n // bucket) * bucket
+    blocks = np.asarray(values[:full], dtype=float).reshape(-1, bucket)
+    offsets = np.arange(0, full, bucket)
+    lows, highs = blocks.argmin(axis=1), blocks.argmax(axis=1)
+    # Rows are in time order, so interleaving each row's earlier/later pick keeps indices sorted
+    pairs = np.column_stack([offsets + np.minimum(lows, highs), offsets + np.maximum(lows, highs)])
+    picks = [[0], pairs.ravel()]
+    if full < n:
+        tail = np.asarray(values[full:], dtype=float)
+        picks.append(full + np.sort([tail.argmin(), tail.argmax()]))
+    picks.append([n - 1])
+    idx = np.concatenate(picks).astype(np.int64)
+    return idx[np.concatenate(([True], np.diff(idx) > 0))]
+
+
+class PricePyramid:
+    """
+    Multi-resolution copies of a (days, prices) series, from full resolution down to
+    about `min_points`, each level a min/max reduction of the previous one.
+    """
+
+    def __init__(self, days, prices, bucket=8, min_points=1024, oversample=4):
+        self.oversample = oversample
+        self.levels = [(np.asarray(days), np.asarray(prices, dtype=float))]
+        while len(self.levels[-1][0]) > min_points * 2:
+            level_days, level_prices = self.levels[-1]
+            keep = minmax_reduce(level_prices, bucket)
+            if len(keep) >= len(level_days):
+                break
+            self.levels.append((level_days[keep], level_prices[keep]))
+
+    def query(self, start_day=None, end_day=None, max_points=None):
+        """
+        Points with start_day <= day <= end_day, reduced to at most `max_points` with LTTB.
+        Picks the finest level that holds at most oversample * max_points points in the range.
+        """
+        chosen = None
+        for level_days, level_prices in self.levels:
+            lo = 0 if start_day is None else np.searchsorted(level_days, start_day, side='left')
+            hi = len(level_days) if end_day is None else np.searchsorted(level_days, end_day, side='right')
+            chosen = (level_days[lo:hi], level_prices[lo:hi])
+            if max_points is None or hi - lo <= self.oversample * max_points:
+                break
+
+        days, prices = chosen
+        if max_points is not None and len(days) > max_points:
+            keep = lttb(days, prices, max_points)
+            days, prices = days[keep], prices[keep]
+        return days, prices
+
+
+def to_day(value):
+    """Parses an ISO date string to days since 1970-01-01 (None passes through)."""
+    if value is None:
+        return None
+    return int((np.datetime64(value, 'D') - EPOCH).astype(np.int64))
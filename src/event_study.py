@@ -0,0 +1,126 @@
+# src/event_study.py
+"""
+Task ID:        Task-1
+Created by:     Addisu Taye
+Date Created:   17-OCT-2026
+Purpose:        Quantify the price impact of key events (event study) for every event and window length.
+Key Features:   - Aligns all events to the trading calendar in one searchsorted pass
+                 (events on weekends/holidays map to the next trading day instead of being dropped)
+               - Pre/post log returns, annualized volatility and constant-mean abnormal returns
+               - Every event x window combination computed as one batched array operation on
+                 prefix sums, so thousands of events cost the same handful of NumPy calls
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_WINDOWS = (5, 20, 60, 250)
+TRADING_DAYS = 252
+
+
+def align_events(trading_dates, event_dates):
+    """
+    Index of the first trading day on or after each event date (-1 when after the last trading day).
+    `trading_dates` must be sorted.
+    """
+    trading = np.asarray(trading_dates, dtype='datetime64[ns]')
+    events = np.asarray(event_dates, dtype='datetime64[ns]')
+    idx = np.searchsorted(trading, events, side='left')
+    return np.where(idx < len(trading), idx, -1)
+
+
+def _window_stats(csum, csq, end, length):
+    """Sum, mean and sample std of the daily returns r[end-length+1 .. end] from prefix sums."""
+    total = csum[end] - csum[end - length]
+    total_sq = csq[end] - csq[end - length]
+    mean = total / length
+    var = np.maximum(total_sq - total * mean, 0.0) / np.maximum(length - 1, 1)
+    return total, mean, np.sqrt(var)
+
+
+def _safe(end, length, valid):
+    """Replaces invalid (end, length) pairs by (1, 1) so batched indexing stays in bounds."""
+    end, length = np.broadcast_arrays(end, length)
+    return np.where(valid, end, 1), np.where(valid, length, 1)
+
+
+def event_impacts(prices_df, events_df, windows=DEFAULT_WINDOWS, estimation_window=250):
+    """
+    Event study table: one row per event x window length.
+
+    The base day is the last close before the event. Pre-event figures use the `window` returns
+    ending at the base day; post-event figures use the `window` returns after it. Abnormal returns
+    subtract the mean daily return of the `estimation_window` days before the base day.
+    Rows whose windows run off either end of the price history are NaN.
+    """
+    dates = prices_df['Date'].to_numpy(dtype='datetime64[ns]')
+    log_price = np.log(prices_df['Price'].to_numpy(dtype=float))
+    n = len(log_price)
+
+    # r[i] = log(P_i / P_{i-1}); prefix sums with csum[0] = 0 give any window in O(1)
+    returns = np.diff(log_price, prepend=log_price[0])
+    csum = np.cumsum(returns)
+    csq = np.cumsum(returns ** 2)
+
+    event_idx = align_events(dates, events_df['Date'].to_numpy(dtype='datetime64[ns]'))
+    base = event_idx - 1
+    w = np.asarray(windows, dtype=np.int64)[None, :]
+    b = base[:, None]
+
+    valid_pre = (event_idx[:, None] >= 0) & (b - w >= 0)
+    valid_post = (event_idx[:, None] >= 0) & (b >= 0) & (b + w < n)
+    valid_est = (event_idx >= 0) & (base - estimation_window >= 0)
+
+    est_end, est_len = _safe(base, estimation_window, valid_est)
+    _, est_mean, est_sd = _window_stats(csum, csq, est_end, est_len)
+    pre_total, _, pre_sd = _window_stats(csum, csq, *_safe(b, w, valid_pre))
+    post_total, _, post_sd = _window_stats(csum, csq, *_safe(b + w, w, valid_post))
+    abnormal = post_total - w * est_mean[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        abnormal_t = abnormal / (est_sd[:, None] * np.sqrt(w))
+
+    def masked(values, valid):
+        return np.where(valid, values, np.nan).ravel()
+
+    n_events, n_windows = len(events_df), w.shape[1]
+    trading_date = np.where(event_idx >= 0, dates[np.clip(event_idx, 0, n - 1)], np.datetime64('NaT'))
+    table = pd.DataFrame({
+        "event": np.repeat(events_df['Event'].to_numpy(), n_windows),
+        "event_date": np.repeat(pd.to_datetime(events_df['Date']).to_numpy(), n_windows),
+        "trading_date": np.repeat(trading_date, n_windows),
+        "window": np.tile(w[0], n_events),
+        "pre_return": masked(pre_total, valid_pre),
+        "post_return": masked(post_total, valid_post),
+        "pre_volatility": masked(pre_sd * np.sqrt(TRADING_DAYS), valid_pre),
+        "post_volatility": masked(post_sd * np.sqrt(TRADING_DAYS), valid_post),
+        "abnormal_return": masked(abnormal, valid_post & valid_est[:, None]),
+        "abnormal_t": masked(abnormal_t, valid_post & valid_est[:, None]),
+    })
+    table["volatility_change"] = table["post_volatility"] - table["pre_volatility"]
+    return table
+
+
+def main():
+    """Main execution function."""
+    from load_data import load_brent_prices, load_events
+
+    print("🔍 Starting event study on key oil market events...")
+    os.makedirs("reports", exist_ok=True)
+    try:
+        df = load_brent_prices()
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e}. Please ensure data files are in the correct location.")
+        return
+    events_df = load_events()
+
+    table = event_impacts(df, events_df)
+    output_path = "reports/event_impacts.csv"
+    table.to_csv(output_path, index=False)
+    print(table.pivot_table(index='event', columns='window', values='abnormal_return').round(4).to_string())
+    print(f"✅ Saved event impact table to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
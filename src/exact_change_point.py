@@ -0,0 +1,249 @@
+# src/exact_change_point.py
+"""
+Task ID:        Task-2
+Created by:     Addisu Taye
+Date Created:   17-OCT-2026
+Purpose:        Exact (closed-form) engine for the single change point model in change_point_model.py.
+Key Features:   - Same model: tau ~ DiscreteUniform(0, n-1), mu_1, mu_2 ~ Normal(mean, 10), sigma ~ HalfNormal(10)
+               - mu_1 / mu_2 integrated out analytically from prefix sums, so every tau is scored in one O(n) pass
+               - sigma integrated numerically on a data-driven grid (memory bounded by chunking over tau)
+               - Returns the same (trace, change_date, most_probable_tau) tuple as run_change_point_model
+               - Writes the same posterior_tau.png and analysis_summary.csv outputs in well under a second
+"""
+
+import os
+import time
+
+import numpy as np
+
+from change_point_model import load_brent_prices, record_sampling_metrics, save_summary_to_csv
+from instrumentation import stage, timed_stage
+# ArviZ and Matplotlib are imported in run_exact_change_point_model, so the posterior math
+# (used by multi_series.py and the backend) stays cheap to import
+
+# Grid resolution for sigma, in units of the posterior sd of log(sigma) (~1/sqrt(2n))
+SIGMA_GRID_STEP = 0.25
+SIGMA_GRID_SPAN = 8.0
+MAX_SIGMA_GRID = 2048
+CHUNK_CELLS = 2 ** 21
+
+
+def _segment_log_marginal(count, total, total_sq, sigma2, prior_var):
+    """
+    Log marginal likelihood of a segment with mu ~ Normal(0, prior_var) integrated out.
+    `total` and `total_sq` are sums of the prior-centred observations.
+    Broadcasts over segments (rows) and sigma^2 values (columns); empty segments score 0.
+    """
+    shrink = prior_var / (sigma2 + count * prior_var)
+    return (-0.5 * count * np.log(2 * np.pi * sigma2)
+            - 0.5 * np.log1p(count * prior_var / sigma2)
+            - (total_sq - shrink * total ** 2) / (2 * sigma2))
+
+
+def _prefix_statistics(centred, weights):
+    """Weights, weighted sums and sums of squares of the first-regime segment for every tau = 0..n-1."""
+    n = len(centred)
+    count = np.concatenate(([0.0], np.cumsum(weights)))[:n]
+    csum = np.concatenate(([0.0], np.cumsum(weights * centred)))[:n]
+    csq = np.concatenate(([0.0], np.cumsum(weights * centred ** 2)))[:n]
+    return count, csum, csq
+
+
+def _sigma_grid(stats, n_obs):
+    """Log-spaced sigma grid covering the profile estimates sigma_hat(tau) for every tau."""
+    count, csum, csq, n, total, total_sq = stats
+    sse_1 = csq - np.divide(csum ** 2, count, out=np.zeros(len(count)), where=count > 0)
+    count_2 = n - count
+    sse_2 = (total_sq - csq) - (total - csum) ** 2 / count_2
+    sigma_hat = np.sqrt(np.maximum(sse_1 + sse_2, 1e-12) / n_obs)
+
+    width = 1.0 / np.sqrt(2 * max(n_obs, 1))
+    lo = np.log(sigma_hat.min()) - SIGMA_GRID_SPAN * width
+    hi = np.log(sigma_hat.max()) + SIGMA_GRID_SPAN * width
+    size = int(np.clip(np.ceil((hi - lo) / (SIGMA_GRID_STEP * width)) + 1, 64, MAX_SIGMA_GRID))
+    log_sigma = np.linspace(lo, hi, size)
+    return log_sigma, log_sigma[1] - log_sigma[0]
+
+
+def _log_sigma_weights(log_sigma, step, sigma_prior_sd):
+    """Log quadrature weights of the HalfNormal(sigma_prior_sd) prior on a log-sigma grid."""
+    sigma = np.exp(log_sigma)
+    return -0.5 * (sigma / sigma_prior_sd) ** 2 + log_sigma + np.log(step)
+
+
+def _logsumexp(a, axis):
+    peak = a.max(axis=axis, keepdims=True)
+    return np.squeeze(peak, axis=axis) + np.log(np.exp(a - peak).sum(axis=axis))
+
+
+def _joint_log_density(rows, stats, log_sigma, log_weights, prior_var):
+    """log p(y, tau, sigma_g) up to a constant, for the taus in `rows` (shape len(rows) x G)."""
+    count, csum, csq, n, total, total_sq = stats
+    sigma2 = np.exp(2 * log_sigma)[None, :]
+    c1, s1, q1 = count[rows, None], csum[rows, None], csq[rows, None]
+    return (_segment_log_marginal(c1, s1, q1, sigma2, prior_var)
+            + _segment_log_marginal(n - c1, total - s1, total_sq - q1, sigma2, prior_var)
+            + log_weights[None, :])
+
+
+def prepare_data(price, mu_prior_mean=None, weights=None):
+    """
+    The data statistics every prior setting shares: prefix sums and the sigma grid.
+
+    `weights` gives observation i the variance sigma^2 / weights[i] (all ones for the model as
+    written). Fixed weights are how prior_sensitivity.py fits a Student-t likelihood through its
+    normal scale-mixture form.
+    """
+    y = np.asarray(price, dtype=float)
+    n = len(y)
+    if n < 2:
+        raise ValueError("At least two observations are needed to locate a change point.")
+    mu_prior_mean = float(np.mean(y)) if mu_prior_mean is None else float(mu_prior_mean)
+    weights = np.ones(n) if weights is None else np.asarray(weights, dtype=float)
+
+    # Centre on the prior mean so the prefix sums stay well conditioned
+    centred = y - mu_prior_mean
+    count, csum, csq = _prefix_statistics(centred, weights)
+    stats = (count, csum, csq, weights.sum(), (weights * centred).sum(), (weights * centred ** 2).sum())
+    log_sigma, step = _sigma_grid(stats, n)
+    # The segment marginals count weights, not observations, in -0.5 n log(2 pi sigma^2); add the rest
+    # (zero without weights; the constant 0.5 sum(log weights) is left out)
+    log_sigma_offset = -0.5 * (n - stats[3]) * (np.log(2 * np.pi) + 2 * log_sigma)
+    return {"n": n, "stats": stats, "log_sigma": log_sigma, "step": step, "log_sigma_offset": log_sigma_offset,
+            "mu_prior_mean": mu_prior_mean}
+
+
+def exact_tau_posterior(price, mu_prior_sd=10.0, sigma_prior_sd=10.0, mu_prior_mean=None, prepared=None):
+    """
+    Computes the exact posterior p(tau | y) of the two-mean / shared-sigma change point model.
+    Pass `prepared` (from prepare_data) to reuse the data statistics across prior settings.
+
+    Returns:
+        dict: 'log_pmf' and 'pmf' over tau = 0..n-1, plus the sigma grid and statistics
+              needed to draw (sigma, mu_1, mu_2) conditionally on tau.
+    """
+    if prepared is None:
+        prepared = prepare_data(price, mu_prior_mean)
+    n, stats, log_sigma = prepared["n"], prepared["stats"], prepared["log_sigma"]
+    prior_var = float(mu_prior_sd) ** 2
+    log_weights = _log_sigma_weights(log_sigma, prepared["step"], sigma_prior_sd) + prepared["log_sigma_offset"]
+
+    log_post = np.empty(n)
+    chunk = max(1, CHUNK_CELLS // len(log_sigma))
+    for start in range(0, n, chunk):
+        rows = np.arange(start, min(start + chunk, n))
+        log_post[rows] = _logsumexp(_joint_log_density(rows, stats, log_sigma, log_weights, prior_var), axis=1)
+
+    log_evidence = _logsumexp(log_post, axis=0)
+    log_pmf = log_post - log_evidence
+    return {
+        "log_pmf": log_pmf,
+        "pmf": np.exp(log_pmf),
+        "log_evidence": log_evidence - np.log(n),
+        "log_sigma": log_sigma,
+        "log_weights": log_weights,
+        "stats": stats,
+        "mu_prior_mean": prepared["mu_prior_mean"],
+        "prior_var": prior_var,
+    }
+
+
+def sample_exact_posterior(posterior, chains=4, draws=2000, random_seed=None):
+    """Draws (tau, sigma, mu_1, mu_2) from the exact posterior by ancestral sampling."""
+    rng = np.random.default_rng(random_seed)
+    size = chains * draws
+    count, csum, csq, n, total, total_sq = posterior["stats"]
+    prior_var = posterior["prior_var"]
+
+    tau = rng.choice(len(posterior["pmf"]), size=size, p=posterior["pmf"])
+    unique_tau, inverse = np.unique(tau, return_inverse=True)
+    joint = _joint_log_density(unique_tau, posterior["stats"], posterior["log_sigma"],
+                               posterior["log_weights"], prior_var)
+    joint = np.exp(joint - joint.max(axis=1, keepdims=True))
+    cdf = np.cumsum(joint, axis=1)
+    cdf /= cdf[:, -1:]
+    # Offsetting row r by r makes the flattened CDFs monotone, so one searchsorted samples every row
+    grid = cdf.shape[1]
+    flat = (cdf + np.arange(len(unique_tau))[:, None]).ravel()
+    picks = np.searchsorted(flat, inverse + rng.random(size)) - inverse * grid
+    sigma = np.exp(posterior["log_sigma"][np.clip(picks, 0, grid - 1)])
+
+    def conditional_mean(c, s):
+        precision = c / sigma ** 2 + 1.0 / prior_var
+        return posterior["mu_prior_mean"] + (s / sigma ** 2) / precision, 1.0 / np.sqrt(precision)
+
+    mean_1, sd_1 = conditional_mean(count[tau], csum[tau])
+    mean_2, sd_2 = conditional_mean(n - count[tau], total - csum[tau])
+    samples = {
+        "tau": tau,
+        "mu_1": rng.normal(mean_1, sd_1),
+        "mu_2": rng.normal(mean_2, sd_2),
+        "sigma": sigma,
+    }
+    return {name: values.reshape(chains, draws) for name, values in samples.items()}
+
+
+@timed_stage("fit.exact")
+def run_exact_change_point_model(df, output_dir="./reports", chains=4, draws=2000, random_seed=None,
+                                 mu_prior_sd=10.0, sigma_prior_sd=10.0):
+    """
+    Drop-in replacement for change_point_model.run_change_point_model using the exact posterior.
+    Returns an InferenceData whose posterior group holds draws of tau, mu_1, mu_2 and sigma,
+    with the exact tau probabilities stored under constant_data['tau_pmf'].
+    """
+    import arviz as az
+    import matplotlib.pyplot as plt
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    price = df['Price'].values
+    with stage("fit.exact.posterior"):
+        posterior = exact_tau_posterior(price, mu_prior_sd=mu_prior_sd, sigma_prior_sd=sigma_prior_sd)
+    with stage("fit.exact.draw"):
+        draw_start = time.perf_counter()
+        samples = sample_exact_posterior(posterior, chains=chains, draws=draws, random_seed=random_seed)
+        draw_seconds = time.perf_counter() - draw_start
+    trace = az.from_dict(
+        posterior=samples,
+        constant_data={"tau_pmf": posterior["pmf"]},
+        dims={"tau_pmf": ["time"]},
+    )
+
+    record_sampling_metrics("exact", trace, draw_seconds)
+
+    most_probable_tau = int(np.argmax(posterior["pmf"]))
+    change_date = df.iloc[most_probable_tau]['Date']
+
+    with stage("fit.exact.tau_plot"):
+        plt.fill_between(np.arange(len(price)), posterior["pmf"], step='mid', alpha=0.7, color='skyblue')
+        plt.axvline(most_probable_tau, color='red', linestyle='--', label=f'MAP: {most_probable_tau}')
+        plt.title("Posterior Distribution of Change Point (tau)")
+        plt.xlabel("Time Index")
+        plt.legend()
+        plt.savefig(f"{output_dir}/posterior_tau.png")
+        plt.close()
+
+    return trace, change_date, most_probable_tau
+
+
+def main():
+    """Main execution function."""
+    print("🔍 Starting exact Bayesian Change Point Analysis...")
+
+    data_df = load_brent_prices("./data/BrentOilPrices.csv")
+    if data_df is None:
+        return
+
+    print(f" Data loaded: {len(data_df)} records from {data_df['Date'].min().date()} to {data_df['Date'].max().date()}")
+
+    trace, change_date, tau_idx = run_exact_change_point_model(data_df)
+
+    print("\n Exact Bayesian Analysis Complete.")
+    print(f"Most probable change point occurred at index: {tau_idx}")
+    print(f"Corresponding date: {change_date.strftime('%Y-%m-%d')}")
+
+    save_summary_to_csv(trace, change_date)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,15 +10,21 @@ Key Features:   - Handles mixed date formats in raw data
                 - Computes and visualizes log returns and volatility
                 - Saves all plots to the reports/ directory
                 - Identifies potential change points for Bayesian modeling
+                - Renders figures in parallel and skips unchanged ones (report_pipeline.py)
 """
 
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+import argparse
 import os
 # --- NEW: Import data loading functions from the dedicated module ---
 from load_data import load_brent_prices, load_events
+from event_study import align_events
+from bootstrap import bootstrap_summary, format_interval
+from rolling_stats import DEFAULT_STATE_PATH, update_rolling_stats
+from report_pipeline import render_report
 
 # Set style and figure size
 sns.set_style("whitegrid")
@@ -56,13 +62,16 @@ def print_basic_statistics(df):
     annual_volatility = df['Price'].std() * np.sqrt(252)
     print(f"📊 Annualized Volatility: ${annual_volatility:.2f}")
 
+def log_returns(df):
+    """Daily log returns of the price series (computed without modifying df)."""
+    return np.log(df['Price'] / df['Price'].shift(1))
+
 def plot_log_returns(df, output_path="reports/log_returns.png"):
     """Plot daily log returns."""
-    df['LogReturn'] = np.log(df['Price'] / df['Price'].shift(1))
-    df['ReturnPct'] = df['LogReturn'] * 100
+    return_pct = log_returns(df) * 100
 
     plt.figure(figsize=(14, 6))
-    plt.plot(df['Date'], df['ReturnPct'], color='purple', alpha=0.7)
+    plt.plot(df['Date'], return_pct, color='purple', alpha=0.7)
     plt.title('Daily Log Returns (%)', fontsize=16)
     plt.ylabel('Return (%)')
     plt.xlabel('Year')
@@ -72,22 +81,31 @@ def plot_log_returns(df, output_path="reports/log_returns.png"):
     plt.close()
     print(f"✅ Saved log returns plot to {output_path}")
 
-    print(f"\n📈 Average Daily Return: {df['LogReturn'].mean():.4f}")
-    print(f"📉 Return Volatility (std): {df['LogReturn'].std():.4f}")
-    print(f"📉 Skewness: {df['LogReturn'].skew():.4f} (Negative = left tail, crashes)")
-    print(f"🔺 Kurtosis: {df['LogReturn'].kurtosis():.4f} (High = fat tails, extreme moves)")
+def print_return_statistics(df):
+    """Print moments of the daily log returns."""
+    log_return = log_returns(df)
+    print(f"\n📈 Average Daily Return: {log_return.mean():.4f}")
+    print(f"📉 Return Volatility (std): {log_return.std():.4f}")
+    print(f"📉 Skewness: {log_return.skew():.4f} (Negative = left tail, crashes)")
+    print(f"🔺 Kurtosis: {log_return.kurtosis():.4f} (High = fat tails, extreme moves)")
+
+    # Block-bootstrap intervals: how much of the above is sampling noise in a fat-tailed series
+    intervals = bootstrap_summary(log_return.dropna().to_numpy())
+    print("\n🔁 95% block-bootstrap intervals (10,000 resamples):")
+    for name in ("mean_return", "volatility", "skewness", "kurtosis"):
+        print(f"   {name:<12} {format_interval(intervals[name])}")
 
 def plot_rolling_statistics(df, window=90, output_path="reports/rolling_stats.png"):
     """Plot rolling mean and volatility band."""
-    df['Rolling_Mean'] = df['Price'].rolling(window).mean()
-    df['Rolling_Std'] = df['Price'].rolling(window).std()
+    rolling_mean = df['Price'].rolling(window).mean()
+    rolling_std = df['Price'].rolling(window).std()
 
     plt.figure(figsize=(14, 8))
     plt.plot(df['Date'], df['Price'], label='Price', color='blue', alpha=0.6)
-    plt.plot(df['Date'], df['Rolling_Mean'], label=f'{window}-Day Rolling Mean', color='orange')
+    plt.plot(df['Date'], rolling_mean, label=f'{window}-Day Rolling Mean', color='orange')
     plt.fill_between(df['Date'],
-                     df['Rolling_Mean'] - df['Rolling_Std'],
-                     df['Rolling_Mean'] + df['Rolling_Std'],
+                     rolling_mean - rolling_std,
+                     rolling_mean + rolling_std,
                      color='gray', alpha=0.2, label=f'{window}-Day Volatility Band')
     plt.title('Brent Oil Price with Rolling Statistics')
     plt.xlabel('Year')
@@ -104,12 +122,15 @@ def plot_price_with_events(df, events_df, output_path="reports/price_with_events
     plt.figure(figsize=(16, 8))
     plt.plot(df['Date'], df['Price'], label='Brent Oil Price', color='blue', linewidth=1)
 
-    for _, row in events_df.iterrows():
-        if row['Date'] in df['Date'].values:
-            idx = df[df['Date'] == row['Date']].index[0]
-            price = df.loc[idx, 'Price']
-            plt.axvline(row['Date'], color='red', linestyle='--', alpha=0.6)
-            plt.text(row['Date'], df['Price'].max() * 0.9, row['Event'], rotation=90, fontsize=8, va='top')
+    # Align every event to the next trading day in one pass (weekend/holiday events are kept)
+    event_idx = align_events(df['Date'].to_numpy(), events_df['Date'].to_numpy())
+    label_y = df['Price'].max() * 0.9
+    for name, idx in zip(events_df['Event'], event_idx):
+        if idx < 0:
+            continue
+        trading_date = df['Date'].iloc[idx]
+        plt.axvline(trading_date, color='red', linestyle='--', alpha=0.6)
+        plt.text(trading_date, label_y, name, rotation=90, fontsize=8, va='top')
 
     plt.title('Brent Oil Price with Key Geopolitical & Economic Events', fontsize=16)
     plt.xlabel('Year')
@@ -121,6 +142,8 @@ def plot_price_with_events(df, events_df, output_path="reports/price_with_events
     plt.close()
     print(f"✅ Saved price-with-events plot to {output_path}")
 
+def print_key_events(events_df):
+    """Print the key events in date order."""
     print("\n🔍 Key Events:")
     print(events_df[['Event', 'Date']].sort_values('Date').to_string(index=False))
 
@@ -154,8 +177,14 @@ def plot_potential_change_points(df, output_path="reports/potential_change_point
     plt.close()
     print(f"✅ Saved potential change points plot to {output_path}")
 
-def main():
+def main(argv=None):
     """Main execution function."""
+    parser = argparse.ArgumentParser(description="Exploratory analysis of Brent oil prices.")
+    parser.add_argument("--force", action="store_true", help="Re-render every figure, even if unchanged")
+    parser.add_argument("--downsample", action="store_true",
+                        help="Downsample price lines to the output pixel width before plotting")
+    args = parser.parse_args(argv)
+
     print("🔍 Starting Exploratory Data Analysis on Brent Oil Prices...")
 
     os.makedirs("reports", exist_ok=True)
@@ -170,12 +199,23 @@ def main():
 
     print(f"✅ Data loaded: {len(df)} records from {df['Date'].min().date()} to {df['Date'].max().date()}")
 
-    plot_price_series(df)
     print_basic_statistics(df)
-    plot_log_returns(df)
-    plot_rolling_statistics(df)
-    plot_price_with_events(df, events_df)
-    plot_potential_change_points(df)
+    print_return_statistics(df)
+
+    # Bring the incremental rolling statistics (the backend's /api/indicators state) up to date
+    stats, new_rows = update_rolling_stats(df, DEFAULT_STATE_PATH)
+    print(f"\n📈 Rolling statistics: {new_rows} new records ingested into {DEFAULT_STATE_PATH}")
+    for window, values in stats.indicators()["rolling"].items():
+        print(f"   {window}-day: mean ${values['mean_price']:.2f}, "
+              f"annualized volatility {values['annualized_volatility']}%")
+    print_key_events(events_df)
+
+    # Figures render in parallel worker processes; unchanged ones are skipped
+    result = render_report(df, events_df, output_dir="reports", downsample=args.downsample, force=args.force)
+    print(f"\n🖼️ Rendered: {', '.join(result['rendered']) or 'none'}")
+    print(f"⏭️ Up to date: {', '.join(result['skipped']) or 'none'}")
+    for name, error in result['failed'].items():
+        print(f"❌ Failed to render {name}: {error}")
 
     print("\n✅ Exploratory Analysis Complete.Check the 'reports/' folder for visualizations.")
 
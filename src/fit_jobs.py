@@ -0,0 +1,343 @@
+# src/fit_jobs.py
+"""
+Task ID:        Task-3
+Created by:     Addisu Taye
+Date Created:   17-OCT-2026
+Purpose:        Background job queue for change point fits submitted through the backend API.
+Key Features:   - Each fit runs in its own worker process, so long PyMC runs never block request threads
+               - Bounded concurrency (workers x chains sized to the machine) and a bounded pending queue
+               - Identical in-flight requests (same window, model config and data version) share one job
+               - A request that already finished for the same data version is answered from its saved
+                 results row; other fits found in the posterior store are read back by a worker, never
+                 in the request thread
+               - Cancellation of queued jobs, and termination of running ones
+               - Job outcomes, queue wait and run times recorded in the metrics registry
+"""
+
+import collections
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+from instrumentation import REGISTRY, record_stage
+
+ENGINES = ("mcmc", "exact")
+ACTIVE_STATES = ("queued", "running")
+
+
+# Results row fields holding server filesystem paths; kept on disk, never sent to clients
+PRIVATE_RESULT_FIELDS = ("output_dir",)
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the pending queue has reached its limit."""
+
+
+def _date_option(config, name):
+    """A YYYY-MM-DD start/end option, or None when it is missing or empty."""
+    value = config.get(name)
+    if value is None or value == "":
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"{name} must be a date string (YYYY-MM-DD)")
+    try:
+        return pd.Timestamp(value).strftime('%Y-%m-%d')
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"{name} is not a valid date: {value!r}") from e
+
+
+def _int_option(config, name, default):
+    """An integer option (whole numbers given as floats or digit strings accepted), or `default` when missing."""
+    value = config.get(name)
+    if value is None:
+        return default
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    elif isinstance(value, str) and value.strip().lstrip('-').isdigit():
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"{name} must be an integer")
+    return value
+
+
+def normalize_config(config, data_path):
+    """
+    Validates a fit request and returns its canonical form.
+    Raises ValueError on bad input.
+    """
+    if config is None:
+        config = {}
+    if not isinstance(config, dict):
+        raise ValueError("The fit request must be a JSON object")
+    unknown = set(config) - {"start", "end", "engine", "chains", "random_seed"}
+    if unknown:
+        raise ValueError(f"Unknown fit options: {sorted(map(str, unknown))}")
+
+    normalized = {
+        "start": _date_option(config, "start"),
+        "end": _date_option(config, "end"),
+        "engine": config.get("engine", "exact"),
+        "chains": _int_option(config, "chains", 4),
+        "random_seed": _int_option(config, "random_seed", None),
+        "data_path": os.path.abspath(data_path),
+    }
+    if not isinstance(normalized["engine"], str) or normalized["engine"] not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}")
+    if not 1 <= normalized["chains"] <= 16:
+        raise ValueError("chains must be between 1 and 16")
+    if normalized["random_seed"] is not None and normalized["random_seed"] < 0:
+        raise ValueError("random_seed must not be negative")
+    if normalized["start"] and normalized["end"] and normalized["start"] > normalized["end"]:
+        raise ValueError("start must not be after end")
+    return normalized
+
+
+def config_key(config):
+    """Deduplication key: the canonical config plus the version of the data file it reads."""
+    stat = os.stat(config["data_path"])
+    canonical = json.dumps({**config, "data_version": [stat.st_size, stat.st_mtime_ns]}, sort_keys=True)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def window_frame(config):
+    """The (window_df, start, end) a normalized config refers to."""
+    from price_store import load_prices
+
+    df = load_prices(config["data_path"])
+    start = pd.Timestamp(config["start"]) if config["start"] else df['Date'].iloc[0]
+    end = pd.Timestamp(config["end"]) if config["end"] else df['Date'].iloc[-1]
+    window_df = df[(df['Date'] >= start) & (df['Date'] <= end)].reset_index(drop=True)
+    if len(window_df) < 2:
+        raise ValueError("The requested window holds fewer than two prices")
+    return window_df, start, end
+
+
+def run_fit(config, output_dir, cores=1, store_dir=None):
+    """Fits one window (or reads it back from the posterior store) and returns its results row."""
+    from batch_runner import fit_window
+
+    window_df, start, end = window_frame(config)
+    row = fit_window(window_df, start, end, output_dir, engine=config["engine"], chains=config["chains"],
+                     cores=cores, random_seed=config["random_seed"], store_dir=store_dir)
+    if row["status"] != "ok":
+        raise RuntimeError(row.get("error", "fit failed"))
+    return row
+
+
+def _job_entry(config, output_dir, cores, store_dir, conn):
+    """Runs in the child process; sends ('ok', result) or ('error', message) back to the parent."""
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    try:
+        conn.send(("ok", run_fit(config, output_dir, cores, store_dir)))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+class FitJob:
+    """State of one submitted fit."""
+
+    def __init__(self, key, config):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.config = config
+        self.status = "queued"
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.process = None
+
+    def public_result(self):
+        """The results row without server filesystem paths."""
+        if self.result is None:
+            return None
+        return {k: v for k, v in self.result.items() if k not in PRIVATE_RESULT_FIELDS}
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "status": self.status,
+            "config": {k: v for k, v in self.config.items() if k != "data_path"},
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.public_result(),
+            "error": self.error,
+        }
+
+
+class FitJobManager:
+    """
+    Runs fits in at most `max_workers` concurrent worker processes, with up to `max_queued`
+    jobs waiting. Thread-safe; meant to be shared by all request threads of the backend.
+    """
+
+    def __init__(self, output_dir, max_workers=None, cores_per_fit=None, max_queued=32, keep_finished=200,
+                 store_dir=None):
+        from batch_runner import plan_pool
+
+        workers, cores = plan_pool("mcmc", chains=4)
+        self.output_dir = output_dir
+        self.store_dir = store_dir or os.path.join(output_dir, "posteriors")
+        # Results rows of finished requests, by config_key
+        self.results_dir = os.path.join(self.store_dir, "requests")
+        self.max_workers = max_workers or workers
+        self.cores_per_fit = cores_per_fit or cores
+        self.max_queued = max_queued
+        self.keep_finished = keep_finished
+
+        self._ctx = mp.get_context("spawn")
+        self._lock = threading.Lock()
+        self._jobs = collections.OrderedDict()
+        self._inflight = {}
+        self._pending = collections.deque()
+        self._running = 0
+
+    def submit(self, config):
+        """
+        Queues a fit (config already normalized); returns (job, created).
+        A request that already finished for this data version is answered at once from its saved
+        results row: one small JSON read, no price load and no ArviZ in the request thread.
+        """
+        key = config_key(config)
+        result = self._saved_result(key)
+        if result is not None:
+            job = FitJob(key, config)
+            job.started_at = time.time()
+            job.result = {**result, "from_store": True}
+            with self._lock:
+                self._jobs[job.id] = job
+                self._finish(job, "done")
+                self._trim_finished()
+            # Already finished, so not "created" in the 202 Accepted sense
+            return job, False
+        with self._lock:
+            existing = self._inflight.get(key)
+            if existing is not None:
+                return self._jobs[existing], False
+            if len(self._pending) >= self.max_queued:
+                raise QueueFullError(f"Fit queue is full ({self.max_queued} pending jobs)")
+            job = FitJob(key, config)
+            self._jobs[job.id] = job
+            self._inflight[key] = job.id
+            self._pending.append(job.id)
+            self._trim_finished()
+            self._dispatch()
+        return job, True
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self):
+        with self._lock:
+            return [job.to_dict() for job in self._jobs.values()]
+
+    def status_counts(self):
+        """Number of retained jobs in each status."""
+        with self._lock:
+            return dict(collections.Counter(job.status for job in self._jobs.values()))
+
+    def cancel(self, job_id):
+        """Cancels a queued job or terminates a running one. Returns the job (None if unknown)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status not in ACTIVE_STATES:
+                return job
+            if job.status == "queued":
+                self._pending.remove(job_id)
+            elif job.process is not None:
+                job.process.terminate()
+            self._finish(job, "cancelled")
+            self._dispatch()
+        return job
+
+    def _result_path(self, key):
+        return os.path.join(self.results_dir, f"{key}.json")
+
+    def _saved_result(self, key):
+        try:
+            with open(self._result_path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_result(self, key, result):
+        """Keeps the results row of a finished request, written atomically."""
+        os.makedirs(self.results_dir, exist_ok=True)
+        tmp_path = f"{self._result_path(key)}.tmp{os.getpid()}.{threading.get_ident()}"
+        with open(tmp_path, 'w') as f:
+            # NumPy scalars from the results row as plain numbers
+            json.dump(result, f, default=lambda v: v.item() if hasattr(v, 'item') else str(v))
+        os.replace(tmp_path, self._result_path(key))
+
+    # --- internals (called with the lock held) ---
+    def _dispatch(self):
+        while self._pending and self._running < self.max_workers:
+            job = self._jobs[self._pending.popleft()]
+            parent_conn, child_conn = self._ctx.Pipe(duplex=False)
+            job_dir = os.path.join(self.output_dir, job.key)
+            job.process = self._ctx.Process(target=_job_entry, daemon=True,
+                                            args=(job.config, job_dir, self.cores_per_fit, self.store_dir,
+                                                  child_conn))
+            job.status = "running"
+            job.started_at = time.time()
+            record_stage("fit_job.queued", job.started_at - job.submitted_at)
+            job.process.start()
+            child_conn.close()
+            self._running += 1
+            threading.Thread(target=self._watch, args=(job, parent_conn), daemon=True).start()
+
+    def _watch(self, job, conn):
+        """Waits for the worker's answer, then frees its slot and starts the next job."""
+        try:
+            outcome = conn.recv()
+        except (EOFError, OSError):
+            outcome = ("error", f"worker exited with code {job.process.exitcode}")
+        finally:
+            conn.close()
+        job.process.join()
+        if outcome[0] == "ok":
+            try:
+                self._save_result(job.key, outcome[1])
+            except OSError as e:
+                print(f"⚠️ Could not save the result of fit job {job.id}: {e}")
+        with self._lock:
+            self._running -= 1
+            if job.status == "running":
+                kind, value = outcome
+                if kind == "ok":
+                    job.result = value
+                    self._finish(job, "done")
+                else:
+                    job.error = value
+                    self._finish(job, "failed")
+            job.process = None
+            self._dispatch()
+
+    def _finish(self, job, status):
+        job.status = status
+        job.finished_at = time.time()
+        engine = job.config["engine"]
+        REGISTRY.inc("brent_fit_jobs_total", help_text="Finished fit jobs by outcome", engine=engine, status=status)
+        if job.started_at is not None:
+            record_stage(f"fit_job.{engine}", job.finished_at - job.started_at)
+        if job.result:
+            REGISTRY.inc("brent_fit_divergences_total", job.result.get("divergences", 0), "Divergent transitions",
+                         engine=engine)
+        if self._inflight.get(job.key) == job.id:
+            del self._inflight[job.key]
+
+    def _trim_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.status not in ACTIVE_STATES]
+        for job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
@@ -0,0 +1,184 @@
+# src/instrumentation.py
+"""
+Task ID:        Task-3
+Created by:     Addisu Taye
+Date Created:   17-OCT-2026
+Purpose:        Lightweight in-process metrics: stage timers, counters, gauges and latency histograms.
+Key Features:   - Standard library only, so every module can be instrumented without slowing imports
+               - A stage timer costs two perf_counter() calls and one short lock hold
+               - Prometheus text exposition format (served by /api/metrics in backend/app.py,
+                 or written to a file after batch/cron runs with write_textfile)
+               - Optional per-thread stage trace, used by the backend for Server-Timing headers
+"""
+
+import bisect
+import contextlib
+import functools
+import os
+import threading
+import time
+
+# Latency buckets (seconds) spanning cached API hits up to long MCMC runs
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+                   120.0, 300.0, 900.0)
+STAGE_METRIC = "brent_stage_duration_seconds"
+STAGE_ERRORS = "brent_stage_errors_total"
+
+
+class Histogram:
+    """Cumulative-bucket histogram with a running sum and count."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value):
+    value = float(value)
+    if value != value or value in (float('inf'), float('-inf')):
+        return {"nan": "NaN", "inf": "+Inf", "-inf": "-Inf"}[repr(value)]
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class MetricsRegistry:
+    """Thread-safe store of counters, gauges and histograms, keyed by metric name and labels."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}  # name -> (kind, help, {label_key: value})
+
+    def _series(self, name, kind, help_text):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = (kind, help_text or name.replace("_", " "), {})
+        elif metric[0] != kind:
+            raise ValueError(f"Metric {name} is a {metric[0]}, not a {kind}")
+        return metric[2]
+
+    def inc(self, name, value=1, help_text=None, **labels):
+        """Adds `value` to a counter."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series(name, "counter", help_text)
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name, value, help_text=None, **labels):
+        """Sets a gauge."""
+        key = _label_key(labels)
+        with self._lock:
+            self._series(name, "gauge", help_text)[key] = value
+
+    def observe(self, name, value, help_text=None, buckets=DEFAULT_BUCKETS, **labels):
+        """Records one observation in a histogram."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series(name, "histogram", help_text)
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def reset(self):
+        with self._lock:
+            self._metrics.clear()
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            for name in sorted(self._metrics):
+                kind, help_text, series = self._metrics[name]
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for key in sorted(series):
+                    value = series[key]
+                    if kind != "histogram":
+                        lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(value.buckets + (float('inf'),), value.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float('inf') else repr(bound)
+                        lines.append(f"{name}_bucket{_format_labels(key, [('le', le)])} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {value.sum!r}")
+                    lines.append(f"{name}_count{_format_labels(key)} {value.count}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+_TRACE = threading.local()
+
+
+def record_stage(name, seconds, registry=REGISTRY):
+    """Records an already measured stage duration (e.g. one timed in a worker process)."""
+    registry.observe(STAGE_METRIC, seconds, "Duration of instrumented pipeline stages", stage=name)
+    trace = getattr(_TRACE, "stages", None)
+    if trace is not None:
+        trace.append((name, seconds))
+
+
+@contextlib.contextmanager
+def stage(name, registry=REGISTRY):
+    """Times the enclosed block as stage `name`; failures are also counted in brent_stage_errors_total."""
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        registry.inc(STAGE_ERRORS, help_text="Instrumented stages that raised", stage=name)
+        raise
+    finally:
+        record_stage(name, time.perf_counter() - start, registry)
+
+
+def timed_stage(name):
+    """Decorator form of stage()."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def begin_trace():
+    """Starts collecting (stage, seconds) pairs recorded on this thread; returns the list they go into."""
+    _TRACE.stages = []
+    return _TRACE.stages
+
+
+def end_trace():
+    """Stops collecting on this thread and returns what was collected."""
+    stages, _TRACE.stages = getattr(_TRACE, "stages", None), None
+    return stages or []
+
+
+def write_textfile(path, registry=REGISTRY):
+    """Atomically writes the registry to `path` (for node_exporter's textfile collector after batch runs)."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'w') as f:
+        f.write(registry.render())
+    os.replace(tmp_path, path)
@@ -7,44 +7,27 @@ Purpose:        Load and parse the Brent oil prices dataset, ensuring the Date c
 Key Features:   - Handles multiple date formats in raw data
                - Cleans and sorts data chronologically
                - Returns a clean pandas DataFrame ready for analysis
+               - Served from the shared columnar cache in price_store.py
 """
 
 import pandas as pd
 import os
 
+from instrumentation import timed_stage
+from price_store import load_prices
+
 def load_brent_prices(file_path='data/BrentOilPrices.csv'):
     """
     Loads and cleans the Brent oil price data.
     Handles multiple date formats and ensures 'Price' is a numeric type.
+    Parsing happens once per file version; later calls read the columnar cache (see price_store).
     """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Data file not found: {file_path}")
 
+    return load_prices(file_path)
 
-    # Read without header, assuming the first two columns are date and price
-    df = pd.read_csv(file_path, header=None, names=['DateRaw', 'Price'])
-    
-    # Clean DateRaw: remove quotes and whitespace
-    df['DateRaw'] = df['DateRaw'].astype(str).str.strip().str.strip('"')
-
-    # Convert DateRaw to datetime using a two-pass approach
-    # Pass 1: Try format '14-May-97'
-    df['Date'] = pd.to_datetime(df['DateRaw'], format='%d-%b-%y', errors='coerce')
-    
-    # Pass 2: Fill NaT values by trying format 'May 14, 2023'
-    # and inferring other formats as a fallback.
-    # The errors='coerce' on the outer to_datetime handles cases where
-    # the second format also fails.
-    df['Date'] = df['Date'].fillna(pd.to_datetime(df['DateRaw'], errors='coerce'))
-
-    # --- CRUCIAL FIX: Convert 'Price' column to numeric, coercing errors to NaN ---
-    df['Price'] = pd.to_numeric(df['Price'], errors='coerce')
-    
-    # Drop rows with any NaN values in either 'Date' or 'Price'
-    df = df.dropna(subset=['Date', 'Price']).sort_values('Date').reset_index(drop=True)
-    
-    return df[['Date', 'Price']]
-
+@timed_stage("load_data.load_events")
 def load_events(file_path="data/key_oil_events.csv"):
     """
     Loads key geopolitical and economic events.
@@ -64,5 +47,5 @@ def load_events(file_path="data/key_oil_events.csv"):
     else:
         print(f"⚠️ Warning: 'Date' column not found in {file_path}.")
         return pd.DataFrame(columns=['Event', 'Date', 'Description'])
-        
-        return events
\ No newline at end of file
+
+    return events
\ No newline at end of file
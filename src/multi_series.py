@@ -0,0 +1,290 @@
+# src/multi_series.py
+"""
+Task ID:        Task-2
+Created by:     Addisu Taye
+Date Created:   17-OCT-2026
+Purpose:        Change point detection for many price series (benchmarks, spreads) in one pass.
+Key Features:   - Same single change point model as exact_change_point.py, evaluated for a whole
+                 (series x time) array at once with 2-D prefix sums; no per-series Python loop
+               - Series of different lengths are end-padded and masked, so a directory of CSVs in the
+                 BrentOilPrices.csv format is one batch
+               - Cache-sized chunks over tau bound memory; optional process pool over groups of series
+               - Bayes factor against a no-change model, so series without a regime change are flagged
+               - One results table (one row per series), also served by /api/series in backend/app.py
+"""
+
+import argparse
+import datetime
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from exact_change_point import (MAX_SIGMA_GRID, SIGMA_GRID_SPAN, SIGMA_GRID_STEP,
+                                _log_sigma_weights, _logsumexp, _segment_log_marginal)
+from instrumentation import REGISTRY, stage
+from price_store import load_prices
+
+DEFAULT_SERIES_DIR = "./data/series"
+DEFAULT_OUTPUT = "./reports/multi_series_change_points.csv"
+# (tau x sigma grid point) cells scored per step of the batch; small enough to stay in cache
+BATCH_CELLS = 1 << 16
+MIN_BATCH_TAUS = 16
+CREDIBLE_MASS = 0.95
+# Jeffreys' "decisive" evidence (Bayes factor > 100) for a change against a constant mean
+MIN_LOG_BAYES_FACTOR = np.log(100.0)
+TABLE_COLUMNS = ["series", "n_obs", "start_date", "end_date", "change_index", "change_date", "change_probability",
+                 "interval_start", "interval_end", "mean_before", "mean_after", "log_bayes_factor", "shift_pct",
+                 "has_change"]
+
+
+def _segment_logsumexp(a, starts, sizes):
+    """log(sum(exp(a))) over consecutive column groups of a (starting at `starts`, `sizes` wide); overwrites a."""
+    peak = np.maximum.reduceat(a, starts, axis=1)
+    a -= np.repeat(peak, sizes, axis=1)
+    np.exp(a, out=a)
+    return peak + np.log(np.add.reduceat(a, starts, axis=1))
+
+
+def batch_tau_posterior(values, lengths=None, mu_prior_sd=10.0, sigma_prior_sd=10.0):
+    """
+    Exact p(tau | y) for every row of a (series x time) array.
+    Row s holds its lengths[s] observations first; anything after them is padding and ignored.
+
+    Every series keeps its own sigma grid (the one exact_tau_posterior would use): the grids are laid
+    end to end on one axis, so a chunk of taus is scored for all series in one array expression and
+    reduced per series with reduceat. Neither padding nor a shared worst-case grid is evaluated.
+
+    Returns:
+        dict: 'pmf' (series x time, zero beyond each length), 'log_bayes_factor' of a change
+              against no change, and the segment sums needed for regime means.
+    """
+    y = np.atleast_2d(np.asarray(values, dtype=float))
+    n_series, width = y.shape
+    lengths = np.full(n_series, width) if lengths is None else np.asarray(lengths, dtype=np.int64)
+    if lengths.min() < 2:
+        raise ValueError("Every series needs at least two observations to locate a change point.")
+    valid = np.arange(width)[None, :] < lengths[:, None]
+    if not np.isfinite(y[valid]).all():
+        raise ValueError("Series contain missing or non-finite values.")
+    prior_var = float(mu_prior_sd) ** 2
+
+    # Longest series first, so the series still running at any tau are a prefix
+    order = np.argsort(-lengths, kind='stable')
+    y, lengths, valid = y[order], lengths[order], valid[order]
+    n = lengths[:, None].astype(float)
+    mean = np.where(valid, y, 0.0).sum(axis=1, keepdims=True) / n
+    centred = np.where(valid, y - mean, 0.0)
+    count = np.arange(width, dtype=float)[None, :]
+    csum = np.concatenate([np.zeros((n_series, 1)), np.cumsum(centred, axis=1)[:, :-1]], axis=1)
+    csq = np.concatenate([np.zeros((n_series, 1)), np.cumsum(centred ** 2, axis=1)[:, :-1]], axis=1)
+    total, total_sq = centred.sum(axis=1, keepdims=True), (centred ** 2).sum(axis=1, keepdims=True)
+
+    # Per-series sigma grids, sized exactly as in exact_change_point._sigma_grid
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sse_1 = csq - np.where(count > 0, csum ** 2 / count, 0.0)
+        sse_2 = (total_sq - csq) - (total - csum) ** 2 / (n - count)
+    sigma_hat = np.sqrt(np.maximum(np.where(valid, sse_1 + sse_2, np.nan), 1e-12) / n)
+    grid_width = 1.0 / np.sqrt(2 * lengths)
+    lo = np.log(np.nanmin(sigma_hat, axis=1)) - SIGMA_GRID_SPAN * grid_width
+    hi = np.log(np.nanmax(sigma_hat, axis=1)) + SIGMA_GRID_SPAN * grid_width
+    sizes = np.clip(np.ceil((hi - lo) / (SIGMA_GRID_STEP * grid_width)) + 1, 64, MAX_SIGMA_GRID).astype(np.int64)
+    starts = np.concatenate(([0], np.cumsum(sizes)))
+    owner = np.repeat(np.arange(n_series), sizes)
+    position = np.arange(starts[-1]) - starts[owner]
+    step = (hi - lo) / (sizes - 1)
+    log_sigma = (lo[owner] + step[owner] * position)[:, None]
+    log_weights = _log_sigma_weights(log_sigma, step[owner][:, None], sigma_prior_sd)
+    sigma2 = np.exp(2 * log_sigma)
+    col_n, col_total, col_total_sq = n[owner], total[owner], total_sq[owner]
+
+    # Both segments' marginals, regrouped so that only two products, one log and two divisions per
+    # (sigma, tau) cell depend on tau; everything else is a per-grid-point constant:
+    #   -0.5 n log(2 pi s2) + log(s2) - total_sq / (2 s2) - 0.5 log(D1 D2) + v / (2 s2) (S1^2 / D1 + S2^2 / D2)
+    # with D_k = s2 + count_k v and S_k the centred segment sums (exact_change_point._segment_log_marginal, summed)
+    constant = (-0.5 * col_n * np.log(2 * np.pi * sigma2) + np.log(sigma2) - col_total_sq / (2 * sigma2)
+                + log_weights).T
+    scale = (prior_var / (2 * sigma2)).T
+    sigma2_row, n_row = sigma2.T, col_n.T * prior_var
+    # Transposed views of the prefix sums: one row per tau, one column per series
+    csum_t, total_t = csum.T, total.T
+    log_post = np.full((width, n_series), -np.inf)
+    chunk = max(MIN_BATCH_TAUS, BATCH_CELLS // int(starts[-1]))
+    for start in range(0, width, chunk):
+        stop = min(start + chunk, width)
+        running = int(np.searchsorted(-lengths, -start, side='left'))
+        cols = int(starts[running])
+        c1 = count[0, start:stop, None] * prior_var
+        s1 = csum_t[start:stop, :running]
+        # In place from here on: a chunk's few temporaries stay in cache
+        with np.errstate(divide='ignore', invalid='ignore'):
+            d1 = sigma2_row[:, :cols] + c1
+            d2 = sigma2_row[:, :cols] + (n_row[:, :cols] - c1)
+            joint = np.take(s1 ** 2, owner[:cols], axis=1)
+            joint /= d1
+            second = np.take((total_t[:, :running] - s1) ** 2, owner[:cols], axis=1)
+            second /= d2
+            joint += second
+            joint *= scale[:, :cols]
+            d1 *= d2
+            np.log(d1, out=d1)
+            d1 *= -0.5
+            joint += d1
+            joint += constant[:, :cols]
+            block = _segment_logsumexp(joint, starts[:running], sizes[:running])
+        log_post[start:stop, :running] = np.where(valid.T[start:stop, :running], block, -np.inf)
+    log_post = log_post.T
+
+    log_evidence = _logsumexp(log_post, axis=1)
+    no_change = _segment_logsumexp((_segment_log_marginal(col_n, col_total, col_total_sq, sigma2, prior_var)
+                                    + log_weights).T, starts[:-1], sizes)[0]
+    restore = np.argsort(order)
+    return {
+        "pmf": np.exp(log_post - log_evidence[:, None])[restore],
+        "log_bayes_factor": (log_evidence - np.log(lengths) - no_change)[restore],
+        "mean": mean[restore, 0],
+        "csum": csum[restore],
+        "total": total[restore, 0],
+        "lengths": lengths[restore],
+    }
+
+
+def summarize_posterior(posterior, names, dates):
+    """One row per series: MAP change date, its credible interval, regime means and the evidence of a change."""
+    pmf, lengths = posterior["pmf"], posterior["lengths"]
+    tau = pmf.argmax(axis=1)
+    cdf = np.cumsum(pmf, axis=1)
+    tail = (1 - CREDIBLE_MASS) / 2
+    low = np.minimum((cdf < tail).sum(axis=1), lengths - 1)
+    high = np.minimum((cdf < 1 - tail).sum(axis=1), lengths - 1)
+
+    rows = np.arange(len(tau))
+    csum = posterior["csum"][rows, tau]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_before = np.where(tau > 0, posterior["mean"] + csum / tau, np.nan)
+    mean_after = posterior["mean"] + (posterior["total"] - csum) / (lengths - tau)
+
+    def date_at(index):
+        # Dates as YYYY-MM-DD; any other time index (positions when no dates were given) as is
+        return [str(pd.Timestamp(d[i]).date()) if isinstance(d[i], (np.datetime64, datetime.date))
+                else d[i].item() if isinstance(d[i], np.generic) else d[i]
+                for d, i in zip(dates, index)]
+
+    table = pd.DataFrame({
+        "series": list(names),
+        "n_obs": lengths,
+        "start_date": date_at(np.zeros_like(lengths)),
+        "end_date": date_at(lengths - 1),
+        "change_index": tau,
+        "change_date": date_at(tau),
+        "change_probability": pmf[rows, tau],
+        "interval_start": date_at(low),
+        "interval_end": date_at(high),
+        "mean_before": mean_before,
+        "mean_after": mean_after,
+        "log_bayes_factor": posterior["log_bayes_factor"],
+    })
+    table["shift_pct"] = (table["mean_after"] - table["mean_before"]) / table["mean_before"] * 100
+    table["has_change"] = table["log_bayes_factor"] > MIN_LOG_BAYES_FACTOR
+    return table
+
+
+def pack_series(frames):
+    """End-padded (series x time) price array and lengths from Date/Price frames."""
+    lengths = np.array([len(df) for df in frames], dtype=np.int64)
+    values = np.zeros((len(frames), lengths.max() if len(frames) else 0))
+    for row, df in zip(values, frames):
+        row[:len(df)] = df['Price'].to_numpy(dtype=float)
+    return values, lengths
+
+
+def _detect_block(names, frames, mu_prior_sd, sigma_prior_sd):
+    values, lengths = pack_series(frames)
+    posterior = batch_tau_posterior(values, lengths, mu_prior_sd, sigma_prior_sd)
+    return summarize_posterior(posterior, names, [df['Date'].to_numpy() for df in frames])
+
+
+def detect_many(series, mu_prior_sd=10.0, sigma_prior_sd=10.0, workers=1):
+    """
+    Detects the change point of every series in {name: Date/Price frame}, all in one batch, or with
+    workers > 1 in that many batches of similar total length run in a process pool.
+
+    Returns:
+        pd.DataFrame: one row per series, in input order
+    """
+    names = list(series)
+    if not names:
+        return pd.DataFrame(columns=TABLE_COLUMNS)
+    # Dealing the series out longest first balances the batches
+    order = sorted(names, key=lambda name: -len(series[name]))
+    blocks = [order[i::workers] for i in range(min(max(workers, 1), len(order)))]
+    with stage("multi_series.detect"):
+        if workers > 1 and len(blocks) > 1:
+            from batch_runner import _init_worker
+
+            with ProcessPoolExecutor(max_workers=min(workers, len(blocks)), initializer=_init_worker) as pool:
+                tables = list(pool.map(_detect_block, blocks, [[series[n] for n in b] for b in blocks],
+                                       [mu_prior_sd] * len(blocks), [sigma_prior_sd] * len(blocks)))
+        else:
+            tables = [_detect_block(b, [series[n] for n in b], mu_prior_sd, sigma_prior_sd) for b in blocks]
+    REGISTRY.inc("brent_series_fitted_total", len(names), "Series fitted by the multi-series detector")
+    table = pd.concat(tables, ignore_index=True).set_index("series").loc[names].reset_index()
+    return table
+
+
+def detect_array(values, names=None, dates=None, lengths=None, mu_prior_sd=10.0, sigma_prior_sd=10.0):
+    """Detects the change point of every row of a (series x time) array (dates default to the time index)."""
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    names = list(names) if names is not None else [f"series_{i}" for i in range(len(values))]
+    if dates is None:
+        dates = [pd.RangeIndex(values.shape[1]).to_numpy()] * len(values)
+    elif np.ndim(dates) == 1:
+        dates = [np.asarray(dates)] * len(values)
+    with stage("multi_series.detect"):
+        posterior = batch_tau_posterior(values, lengths, mu_prior_sd, sigma_prior_sd)
+        table = summarize_posterior(posterior, names, dates)
+    REGISTRY.inc("brent_series_fitted_total", len(names), "Series fitted by the multi-series detector")
+    return table
+
+
+def series_paths(directory, pattern="*.csv"):
+    return sorted(glob.glob(os.path.join(directory, pattern)))
+
+
+def load_series(paths):
+    """{file stem: Date/Price frame} for CSVs in the BrentOilPrices.csv format (through the price cache)."""
+    return {os.path.splitext(os.path.basename(path))[0]: load_prices(path) for path in paths}
+
+
+def main(argv=None):
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Detect the change point of every price series in a directory.")
+    parser.add_argument("directory", nargs="?", default=DEFAULT_SERIES_DIR,
+                        help="Directory of CSVs in the BrentOilPrices.csv format (one series per file)")
+    parser.add_argument("--pattern", default="*.csv")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--workers", type=int, default=1, help="Processes for blocks of series")
+    parser.add_argument("--mu-prior-sd", type=float, default=10.0)
+    parser.add_argument("--sigma-prior-sd", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    paths = series_paths(args.directory, args.pattern)
+    if not paths:
+        print(f"❌ Error: no files matching {args.pattern} in {args.directory}")
+        return 1
+    print(f"🔍 Detecting change points in {len(paths)} series...")
+    table = detect_many(load_series(paths), args.mu_prior_sd, args.sigma_prior_sd, args.workers)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    table.to_csv(args.output, index=False)
+    for row in table.itertuples():
+        marker = "🔴" if row.has_change else "⚪"
+        print(f"{marker} {row.series}: {row.change_date} (p={row.change_probability:.3f}, "
+              f"log BF {row.log_bayes_factor:.1f}, shift {row.shift_pct:+.1f}%)")
+    print(f"📄 Saved results to {args.output}")
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
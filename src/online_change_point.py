@@ -0,0 +1,214 @@
+# src/online_change_point.py
+"""
+Task ID:        Task-2
+Created by:     Addisu Taye
+Date Created:   17-OCT-2026
+Purpose:        Streaming Bayesian change point detection (Adams & MacKay run-length posterior).
+Key Features:   - Normal-Inverse-Gamma conjugate model, Student-t predictive per run length
+               - Run-length distribution pruned by probability and capped in length, so each
+                 new price costs O(1) amortized time and memory regardless of history length
+               - Detector state saved to / restored from disk (.npz), so new prices are
+                 ingested incrementally without refitting the full history
+               - The ingested history is checked by row count and a fingerprint of its newest rows,
+                 so revised or inserted prices trigger a rebuild instead of a stale posterior
+               - Regime summary (recent change probability, current regime start) for alerts
+"""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy.special import gammaln
+
+from price_store import extend_fingerprint, seen_rows, tail_fingerprint
+
+
+class OnlineChangePointDetector:
+    """Bayesian online change point detector with a bounded run-length distribution."""
+
+    def __init__(self, mu0, kappa0=1.0, alpha0=1.0, beta0=1.0, hazard=1 / 250,
+                 max_run_length=1000, prune_threshold=1e-10, alert_window=5):
+        self.prior = np.array([mu0, kappa0, alpha0, beta0], dtype=float)
+        self.hazard = float(hazard)
+        self.max_run_length = int(max_run_length)
+        self.prune_threshold = float(prune_threshold)
+        self.alert_window = int(alert_window)
+
+        # One entry per surviving run-length hypothesis
+        self.run_lengths = np.zeros(1, dtype=np.int64)
+        self.log_probs = np.zeros(1)
+        self.params = self.prior[None, :].copy()
+        self.n_obs = 0
+        self.last_date = None
+        # Rolling hash of every ingested row (extended with new rows only) and hash of the newest ones
+        self.fingerprint = None
+        self.tail_fingerprint = None
+        self.recent_change_prob = 0.0
+
+    @classmethod
+    def for_series(cls, values, warmup=250, **kwargs):
+        """Builds a detector whose prior is centred on the first `warmup` observations."""
+        head = np.asarray(values, dtype=float)[:warmup]
+        alpha0 = kwargs.pop('alpha0', 1.0)
+        beta0 = kwargs.pop('beta0', alpha0 * max(float(np.var(head)), 1e-8))
+        return cls(mu0=float(np.mean(head)), alpha0=alpha0, beta0=beta0, **kwargs)
+
+    def _predictive_logpdf(self, x):
+        """Student-t posterior predictive log density of x under every run-length hypothesis."""
+        mu, kappa, alpha, beta = self.params.T
+        scale2 = beta * (kappa + 1) / (alpha * kappa)
+        nu = 2 * alpha
+        return (gammaln((nu + 1) / 2) - gammaln(nu / 2) - 0.5 * np.log(np.pi * nu * scale2)
+                - (nu + 1) / 2 * np.log1p((x - mu) ** 2 / (nu * scale2)))
+
+    def update(self, x, date=None):
+        """Absorbs one observation and returns the probability that a change occurred recently."""
+        x = float(x)
+        log_pred = self.log_probs + self._predictive_logpdf(x)
+        log_growth = log_pred + np.log1p(-self.hazard)
+        log_change = np.logaddexp.reduce(log_pred) + np.log(self.hazard)
+
+        mu, kappa, alpha, beta = self.params.T
+        grown = np.column_stack([
+            (kappa * mu + x) / (kappa + 1),
+            kappa + 1,
+            alpha + 0.5,
+            beta + kappa * (x - mu) ** 2 / (2 * (kappa + 1)),
+        ])
+
+        log_probs = np.concatenate(([log_change], log_growth))
+        log_probs -= np.logaddexp.reduce(log_probs)
+        run_lengths = np.concatenate(([0], self.run_lengths + 1))
+        params = np.vstack([self.prior, grown])
+
+        # Keep the distribution bounded: drop negligible hypotheses and cap the longest runs
+        keep = log_probs >= np.log(self.prune_threshold)
+        keep &= run_lengths <= self.max_run_length
+        keep[np.argmax(log_probs)] = True
+        self.log_probs = log_probs[keep] - np.logaddexp.reduce(log_probs[keep])
+        self.run_lengths = run_lengths[keep]
+        self.params = params[keep]
+
+        self.n_obs += 1
+        if date is not None:
+            self.last_date = pd.Timestamp(date)
+        self.recent_change_prob = float(np.exp(self.log_probs[self.run_lengths < self.alert_window]).sum())
+        return self.recent_change_prob
+
+    def ingest(self, df):
+        """
+        Feeds only the rows of a date-sorted Date/Price frame that are newer than the last ingested date.
+        df must hold the whole history: its newest rows become the tail fingerprint.
+        """
+        new = df.iloc[seen_rows(df, self.last_date):]
+        for date, price in zip(new['Date'], new['Price'].to_numpy(dtype=float)):
+            self.update(price, date)
+        if len(new):
+            self.fingerprint = extend_fingerprint(self.fingerprint, new)
+            self.tail_fingerprint = tail_fingerprint(df)
+        return len(new)
+
+    def matches(self, df):
+        """Whether the rows of df up to the last ingested date are the ones this detector ingested."""
+        seen = seen_rows(df, self.last_date)
+        return seen == self.n_obs and tail_fingerprint(df, seen) == self.tail_fingerprint
+
+    def summary(self):
+        """Current regime view: most probable run length, regime start and recent change probability."""
+        probs = np.exp(self.log_probs)
+        map_run = int(self.run_lengths[np.argmax(probs)])
+        return {
+            "observations": self.n_obs,
+            "last_date": self.last_date.strftime('%Y-%m-%d') if self.last_date is not None else None,
+            "most_probable_run_length": map_run,
+            "expected_run_length": round(float((probs * self.run_lengths).sum()), 2),
+            "regime_mean": round(float(self.params[np.argmax(probs), 0]), 4),
+            "recent_change_probability": round(self.recent_change_prob, 6),
+            "alert_window": self.alert_window,
+            "tracked_run_lengths": int(len(self.run_lengths)),
+        }
+
+    def save(self, path):
+        """Writes the detector state atomically, so readers never see a half-written file."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Unique per writer: concurrent saves must not move each other's temp file away
+        tmp_path = f"{path}.tmp{os.getpid()}.{threading.get_ident()}.npz"
+        np.savez(
+            tmp_path,
+            prior=self.prior,
+            settings=np.array([self.hazard, self.max_run_length, self.prune_threshold, self.alert_window]),
+            run_lengths=self.run_lengths,
+            log_probs=self.log_probs,
+            params=self.params,
+            n_obs=self.n_obs,
+            last_date=np.datetime64(self.last_date) if self.last_date is not None else np.datetime64('NaT'),
+            recent_change_prob=self.recent_change_prob,
+            fingerprint=self.fingerprint or "",
+            tail_fingerprint=self.tail_fingerprint or "",
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Restores a detector saved with save()."""
+        with np.load(path) as state:
+            hazard, max_run_length, prune_threshold, alert_window = state['settings']
+            mu0, kappa0, alpha0, beta0 = state['prior']
+            detector = cls(mu0, kappa0, alpha0, beta0, hazard=hazard, max_run_length=max_run_length,
+                           prune_threshold=prune_threshold, alert_window=alert_window)
+            detector.run_lengths = state['run_lengths']
+            detector.log_probs = state['log_probs']
+            detector.params = state['params']
+            detector.n_obs = int(state['n_obs'])
+            last_date = state['last_date'][()]
+            detector.last_date = None if np.isnat(last_date) else pd.Timestamp(last_date)
+            detector.recent_change_prob = float(state['recent_change_prob'])
+            detector.fingerprint = str(state['fingerprint']) or None
+            detector.tail_fingerprint = str(state['tail_fingerprint']) or None
+        return detector
+
+
+def update_detector(df, state_path, save=True, **kwargs):
+    """
+    Loads the saved detector (or starts one from the series), ingests new rows and saves it.
+    The detector is rebuilt when the already ingested rows changed (revised, inserted or removed
+    prices). With save=False the saved state is only read, e.g. by request handlers.
+    """
+    detector = None
+    if os.path.exists(state_path):
+        try:
+            detector = OnlineChangePointDetector.load(state_path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Ignoring unreadable online detector state {state_path}: {e}")
+    if detector is not None and not detector.matches(df):
+        detector = None
+    if detector is None:
+        detector = OnlineChangePointDetector.for_series(df['Price'].to_numpy(dtype=float), **kwargs)
+    new_rows = detector.ingest(df)
+    if new_rows and save:
+        detector.save(state_path)
+    return detector, new_rows
+
+
+def main():
+    """Main execution function."""
+    from load_data import load_brent_prices
+
+    state_path = "reports/online_detector_state.npz"
+    print("🔍 Updating online change point detector...")
+    try:
+        df = load_brent_prices()
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e}. Please ensure data files are in the correct location.")
+        return
+
+    detector, new_rows = update_detector(df, state_path)
+    summary = detector.summary()
+    print(f"✅ Ingested {new_rows} new records (state: {state_path})")
+    print(f"📅 Current regime started {summary['most_probable_run_length']} trading days before {summary['last_date']}")
+    print(f"🚨 Probability of a change in the last {summary['alert_window']} days: {summary['recent_change_probability']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+# src/posterior_store.py
+"""
+Task ID:        Task-3
+Created by:     Addisu Taye
+Date Created:   17-OCT-2026
+Purpose:        On-disk store of fitted posteriors, so results are reused instead of refitted and the
+                dashboard can show the full tau uncertainty rather than a one-row summary.
+Key Features:   - One compressed, chunked HDF5/netCDF file per fit (gzip, one chunk per chain x 1000 draws)
+               - Keyed by a content hash of the window's data + the model configuration + the window
+               - Lazy reads: a tau histogram opens only the tau variable (or the exact engine's tau_pmf),
+                 HDIs and regime means only mu_1 / mu_2 / sigma
+               - fit_or_load() answers an identical fit request from the store without resampling
+               - Atomic writes, with the JSON metadata written last (a half-written fit is never visible)
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import REGISTRY, stage
+
+DEFAULT_STORE_DIR = "./reports/posteriors"
+STORE_VERSION = 1
+DRAWS = 2000
+TUNE = 1000
+PRIOR_SD = {"mu_prior_sd": 10.0, "sigma_prior_sd": 10.0}
+DRAW_CHUNK = 1000
+EPOCH = np.datetime64('1970-01-01', 'D')
+KEY_PATTERN = re.compile(r'[0-9a-f]{20}')
+
+
+def data_digest(df):
+    """Content hash of a Date/Price window (the exact bytes of both columns)."""
+    digest = hashlib.sha256()
+    digest.update(df['Date'].to_numpy(dtype='datetime64[ns]').astype(np.int64).tobytes())
+    digest.update(df['Price'].to_numpy(dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def model_config(engine, chains=4, random_seed=None):
+    """Everything besides the data that determines a fit's draws."""
+    config = {"engine": engine, "chains": chains, "draws": DRAWS, "random_seed": random_seed, **PRIOR_SD}
+    if engine == "mcmc":
+        config.update({"tune": TUNE, "target_accept": 0.95})
+    return config
+
+
+def posterior_key(df, config):
+    """Store key: data hash + model config + window."""
+    payload = {
+        "version": STORE_VERSION,
+        "data": data_digest(df),
+        "config": config,
+        "window": [str(pd.Timestamp(df['Date'].iloc[0]).date()), str(pd.Timestamp(df['Date'].iloc[-1]).date())],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()[:20]
+
+
+def _encoding(dataset):
+    """gzip-compressed, chunked along draws (one chunk per chain and DRAW_CHUNK draws)."""
+    encoding = {}
+    for name, variable in dataset.data_vars.items():
+        if variable.ndim == 0 or variable.dtype.kind not in "biuf":
+            continue
+        chunks = tuple(1 if dim == "chain" else min(size, DRAW_CHUNK if dim == "draw" else 4096)
+                       for dim, size in variable.sizes.items())
+        encoding[name] = {"compression": "gzip", "compression_opts": 4, "chunksizes": chunks}
+    return encoding
+
+
+class PosteriorStore:
+    """Directory of <key>.nc posterior files, each with a <key>.json metadata sidecar."""
+
+    GROUPS = ("posterior", "sample_stats", "constant_data")
+
+    def __init__(self, root=DEFAULT_STORE_DIR):
+        self.root = root
+
+    def data_path(self, key):
+        return os.path.join(self.root, f"{key}.nc")
+
+    def meta_path(self, key):
+        return os.path.join(self.root, f"{key}.json")
+
+    def contains(self, key):
+        # Keys reach the store from URLs, so anything that is not a plain key never touches the disk
+        if not KEY_PATTERN.fullmatch(key):
+            return False
+        return os.path.exists(self.meta_path(key)) and os.path.exists(self.data_path(key))
+
+    def save(self, key, trace, df, metadata):
+        """Writes the posterior, sampler stats and constant data of `trace`, plus the window's trading days."""
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.data_path(key)}.tmp{os.getpid()}"
+        days = (df['Date'].to_numpy(dtype='datetime64[D]') - EPOCH).astype(np.int32)
+        with stage("posterior_store.save"):
+            import xarray as xr
+
+            groups = {group: trace[group] for group in ("posterior", "sample_stats") if group in trace.groups()}
+            constant = trace["constant_data"] if "constant_data" in trace.groups() else xr.Dataset()
+            groups["constant_data"] = constant.assign(window_days=("time", days))
+            mode = "w"
+            for group, dataset in groups.items():
+                dataset.to_netcdf(tmp_path, group=group, mode=mode, engine="h5netcdf", encoding=_encoding(dataset))
+                mode = "a"
+            os.replace(tmp_path, self.data_path(key))
+
+            meta = {"key": key, "version": STORE_VERSION, "created_at": time.time(), **metadata}
+            tmp_meta = f"{self.meta_path(key)}.tmp{os.getpid()}"
+            with open(tmp_meta, 'w') as f:
+                json.dump(meta, f, indent=2, default=str)
+            os.replace(tmp_meta, self.meta_path(key))
+        return meta
+
+    def metadata(self, key):
+        with open(self.meta_path(key)) as f:
+            return json.load(f)
+
+    def list(self):
+        """Metadata of every stored fit, newest first."""
+        if not os.path.isdir(self.root):
+            return []
+        entries = []
+        for name in os.listdir(self.root):
+            key, ext = os.path.splitext(name)
+            if ext == ".json" and self.contains(key):
+                entries.append(self.metadata(key))
+        return sorted(entries, key=lambda meta: meta.get("created_at", 0), reverse=True)
+
+    @contextlib.contextmanager
+    def open_group(self, key, group="posterior"):
+        """Lazily opened group: nothing is read until a variable's values are accessed."""
+        import xarray as xr
+
+        if not self.contains(key):
+            raise KeyError(key)
+        dataset = xr.open_dataset(self.data_path(key), group=group, engine="h5netcdf")
+        try:
+            yield dataset
+        finally:
+            dataset.close()
+
+    def load(self, key):
+        """The stored fit as an InferenceData (fully read into memory)."""
+        import arviz as az
+
+        with stage("posterior_store.load"):
+            groups = {}
+            for group in self.GROUPS:
+                try:
+                    with self.open_group(key, group) as dataset:
+                        groups[group] = dataset.load()
+                except OSError:
+                    continue  # group not written for this fit
+            return az.InferenceData(**groups)
+
+    def window_dates(self, key):
+        with self.open_group(key, "constant_data") as constant:
+            return EPOCH + constant["window_days"].values.astype('timedelta64[D]')
+
+    def tau_histogram(self, key, bins=200):
+        """
+        Posterior probability of the change point falling in each of `bins` equal-width index ranges.
+        Uses the exact engine's tau_pmf when stored, otherwise counts the tau draws.
+        """
+        dates = self.window_dates(key)
+        n = len(dates)
+        with self.open_group(key, "constant_data") as constant:
+            pmf = constant["tau_pmf"].values if "tau_pmf" in constant else None
+        if pmf is None:
+            with self.open_group(key) as posterior:
+                tau = posterior["tau"].values.ravel().astype(np.int64)
+            pmf = np.bincount(tau, minlength=n) / tau.size
+
+        edges = np.unique(np.linspace(0, n, min(bins, n) + 1).astype(np.int64))
+        mass = np.add.reduceat(pmf, edges[:-1])
+        return [
+            {"start_index": int(lo), "end_index": int(hi - 1), "start_date": str(dates[lo]),
+             "end_date": str(dates[hi - 1]), "probability": float(p)}
+            for lo, hi, p in zip(edges[:-1], edges[1:], mass)
+        ]
+
+    def summary(self, key, hdi_prob=0.95):
+        """Regime means, HDIs and the change point (MAP and its HDI) from the stored draws."""
+        import arviz as az
+
+        with self.open_group(key) as posterior:
+            subset = posterior[["mu_1", "mu_2", "sigma", "tau"]].load()
+        hdi = az.hdi(subset, hdi_prob=hdi_prob)
+        dates = self.window_dates(key)
+        # The fit's own most probable tau (exact argmax for the exact engine, draw mode for MCMC)
+        tau_map = int(self.metadata(key)["tau_index"])
+
+        def interval(name):
+            low, high = hdi[name].values
+            return {"mean": float(subset[name].mean()), "hdi_low": float(low), "hdi_high": float(high)}
+
+        tau_low, tau_high = (int(v) for v in hdi["tau"].values)
+        return {
+            "key": key,
+            "hdi_prob": hdi_prob,
+            "pre_change": interval("mu_1"),
+            "post_change": interval("mu_2"),
+            "sigma": interval("sigma"),
+            "change_point": {"index": tau_map, "date": str(dates[tau_map]),
+                             "hdi_low_date": str(dates[tau_low]), "hdi_high_date": str(dates[tau_high])},
+        }
+
+
+def fit_or_load(df, engine="exact", chains=4, cores=None, random_seed=None, output_dir="./reports", store=None):
+    """
+    Fits the change point model on df, or returns the stored posterior of an identical earlier fit.
+
+    Returns:
+        tuple: (trace, change_date, most_probable_tau, key, from_store)
+    """
+    store = store or PosteriorStore()
+    config = model_config(engine, chains, random_seed)
+    key = posterior_key(df, config)
+    if store.contains(key):
+        REGISTRY.inc("brent_posterior_store_lookups_total", help_text="Posterior store lookups", result="hit")
+        meta = store.metadata(key)
+        return store.load(key), pd.Timestamp(meta["change_date"]), meta["tau_index"], key, True
+
+    REGISTRY.inc("brent_posterior_store_lookups_total", help_text="Posterior store lookups", result="miss")
+    if engine == "exact":
+        from exact_change_point import run_exact_change_point_model
+        trace, change_date, tau = run_exact_change_point_model(
+            df, output_dir=output_dir, chains=chains, random_seed=random_seed)
+    else:
+        from change_point_model import run_change_point_model
+        trace, change_date, tau = run_change_point_model(
+            df, output_dir=output_dir, chains=chains, cores=cores, random_seed=random_seed)
+
+    store.save(key, trace, df, {
+        "config": config,
+        "window_start": str(pd.Timestamp(df['Date'].iloc[0]).date()),
+        "window_end": str(pd.Timestamp(df['Date'].iloc[-1]).date()),
+        "n_obs": len(df),
+        "data_sha256": data_digest(df),
+        "change_date": str(pd.Timestamp(change_date).date()),
+        "tau_index": int(tau),
+    })
+    return trace, change_date, tau, key, False
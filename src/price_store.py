@@ -0,0 +1,201 @@
+# src/price_store.py
+"""
+Task ID:        Task-1
+Created by:     Addisu Taye
+Date Created:   17-OCT-2026
+Purpose:        Single ingestion layer for the Brent price file, shared by the scripts and the backend.
+Key Features:   - Parses the raw mixed-format CSV once ('20-May-87' and "Apr 22, 2020" rows)
+               - Persists a binary columnar cache: int32 day offsets + float64 prices as .npy files
+               - Cache keyed on the source file's size/mtime, with a SHA-256 check before re-parsing
+               - Later loads are memory-mapped reads with no text parsing
+               - Parse, cache build and load stages are timed (see instrumentation.py)
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from instrumentation import REGISTRY, stage
+# pandas is imported inside the functions that build frames, so NumPy-only readers of the
+# cache (cli.py summarize) do not pay for it
+
+CACHE_DIRNAME = ".cache"
+CACHE_VERSION = 1
+DATE_FORMATS = ('%d-%b-%y', '%b %d, %Y')
+EPOCH = np.datetime64('1970-01-01', 'D')
+
+
+def parse_dates(raw, formats=DATE_FORMATS):
+    """
+    Parses a column of raw date strings. Each format is tried once over all still-unparsed values,
+    then anything left falls back to inference; unparseable values become NaT.
+    """
+    import pandas as pd
+
+    text = raw.astype(str).str.strip().str.strip('"')
+    dates = pd.Series(pd.NaT, index=raw.index, dtype='datetime64[ns]')
+    for fmt in formats:
+        missing = dates.isna()
+        if not missing.any():
+            break
+        dates[missing] = pd.to_datetime(text[missing], format=fmt, errors='coerce')
+    missing = dates.isna()
+    if missing.any():
+        dates[missing] = pd.to_datetime(text[missing], format='mixed', errors='coerce')
+    return dates
+
+
+def parse_raw_prices(file_path):
+    """
+    Parses the raw price CSV into a clean, date-sorted Date/Price frame.
+    Each known date format is tried once over the whole column; anything left falls back to inference.
+    """
+    import pandas as pd
+
+    raw = pd.read_csv(file_path, header=0, names=['DateRaw', 'Price'], dtype={'DateRaw': str},
+                      skipinitialspace=True)
+    dates = parse_dates(raw['DateRaw'])
+    df = pd.DataFrame({'Date': dates, 'Price': pd.to_numeric(raw['Price'], errors='coerce')})
+    return df.dropna(subset=['Date', 'Price']).sort_values('Date', kind='stable').reset_index(drop=True)
+
+
+def _file_digest(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_paths(file_path):
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(file_path)), CACHE_DIRNAME)
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return {
+        "dir": cache_dir,
+        "days": os.path.join(cache_dir, f"{stem}.days.npy"),
+        "prices": os.path.join(cache_dir, f"{stem}.prices.npy"),
+        "meta": os.path.join(cache_dir, f"{stem}.meta.json"),
+    }
+
+
+def _source_key(file_path):
+    stat = os.stat(file_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(path, write):
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _cache_is_fresh(file_path, paths, meta, key):
+    """True when the cache matches the source; refreshes the key if only the mtime moved."""
+    if meta is None or meta.get("version") != CACHE_VERSION:
+        return False
+    if not (os.path.exists(paths["days"]) and os.path.exists(paths["prices"])):
+        return False
+    if meta.get("size") == key["size"] and meta.get("mtime_ns") == key["mtime_ns"]:
+        return True
+    # Touched but possibly unchanged (e.g. a fresh checkout): compare contents before re-parsing
+    if meta.get("size") == key["size"] and meta.get("sha256") == _file_digest(file_path):
+        meta.update(key)
+        _write_atomic(paths["meta"], lambda p: _dump_json(meta, p))
+        return True
+    return False
+
+
+def _dump_json(obj, path):
+    with open(path, 'w') as f:
+        json.dump(obj, f)
+
+
+def _save_npy(array, path):
+    with open(path, 'wb') as f:
+        np.save(f, array)
+
+
+def build_cache(file_path):
+    """Parses the raw file and (re)writes its columnar cache. Returns the parsed frame."""
+    paths = _cache_paths(file_path)
+    key = _source_key(file_path)
+    with stage("price_store.parse"):
+        df = parse_raw_prices(file_path)
+    days = ((df['Date'].to_numpy().astype('datetime64[D]') - EPOCH).astype(np.int32))
+    prices = df['Price'].to_numpy(dtype=np.float64)
+
+    os.makedirs(paths["dir"], exist_ok=True)
+    _write_atomic(paths["days"], lambda p: _save_npy(days, p))
+    _write_atomic(paths["prices"], lambda p: _save_npy(prices, p))
+    meta = {"version": CACHE_VERSION, "source": os.path.abspath(file_path), "rows": len(df),
+            "sha256": _file_digest(file_path), **key}
+    # Metadata goes last, so a half-built cache is never considered fresh
+    _write_atomic(paths["meta"], lambda p: _dump_json(meta, p))
+    return df
+
+
+def load_price_arrays(file_path):
+    """
+    Returns (days, prices): int32 days since 1970-01-01 and float64 prices, memory-mapped
+    from the columnar cache, which is rebuilt only when the source file changes.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Data file not found: {file_path}")
+    with stage("price_store.load"):
+        paths = _cache_paths(file_path)
+        fresh = _cache_is_fresh(file_path, paths, _read_meta(paths["meta"]), _source_key(file_path))
+        REGISTRY.inc("brent_price_cache_lookups_total", help_text="Price cache lookups by outcome",
+                     result="hit" if fresh else "miss")
+        if not fresh:
+            with stage("price_store.cache_build"):
+                build_cache(file_path)
+        return np.load(paths["days"], mmap_mode='r'), np.load(paths["prices"], mmap_mode='r')
+
+
+def load_prices(file_path):
+    """Loads the Date/Price frame through the columnar cache."""
+    import pandas as pd
+
+    days, prices = load_price_arrays(file_path)
+    return pd.DataFrame({
+        'Date': (EPOCH + np.asarray(days).astype('timedelta64[D]')).astype('datetime64[ns]'),
+        'Price': np.asarray(prices),
+    })
+
+
+# --- Incremental consumers ---
+# Stateful readers of the series (rolling_stats.py, online_change_point.py) ingest only the rows newer
+# than their saved state. These helpers find those rows and check the already ingested history in
+# time that does not grow with its length.
+HISTORY_TAIL_ROWS = 256
+
+
+def extend_fingerprint(fingerprint, df):
+    """Rolling SHA-256 of Date/Price rows: `fingerprint` (of the rows before) extended with the rows of df."""
+    digest = hashlib.sha256((fingerprint or "").encode('ascii'))
+    digest.update(df['Date'].to_numpy(dtype='datetime64[ns]').astype(np.int64).tobytes())
+    digest.update(df['Price'].to_numpy(dtype=np.float64).tobytes())
+    return digest.hexdigest()[:32]
+
+
+def tail_fingerprint(df, end=None):
+    """Fingerprint of the last HISTORY_TAIL_ROWS rows of df[:end]."""
+    end = len(df) if end is None else end
+    return extend_fingerprint("", df.iloc[max(0, end - HISTORY_TAIL_ROWS):end])
+
+
+def seen_rows(df, last_date):
+    """Number of leading rows of the date-sorted frame df dated on or before last_date (binary search)."""
+    if last_date is None:
+        return 0
+    return int(df['Date'].searchsorted(last_date, side='right'))
@@ -0,0 +1,39 @@
+# src/price_wire.py
+"""
+Task ID:        Task-3
+Created by:     Addisu Taye
+Date Created:   17-OCT-2026
+Purpose:        Compact binary wire format for price series served by the dashboard backend.
+Key Features:   - 12-byte little-endian header: magic 'BRP1', uint16 version, uint16 reserved, uint32 count
+               - Followed by count int32 day offsets (days since 1970-01-01) and count float32 prices
+               - Packed straight from NumPy arrays, no per-row Python objects
+               - Decoded in the frontend by decodePrices() in frontend/src/services/api.ts
+"""
+
+import struct
+
+import numpy as np
+
+PRICES_MIMETYPE = 'application/vnd.brent.prices'
+MAGIC = b'BRP1'
+VERSION = 1
+HEADER = struct.Struct('<4sHHI')
+
+
+def pack_prices(days, prices):
+    """Serializes parallel day-offset / price arrays into the binary price format."""
+    days = np.ascontiguousarray(days, dtype='<i4')
+    prices = np.ascontiguousarray(prices, dtype='<f4')
+    if len(days) != len(prices):
+        raise ValueError("days and prices must have the same length")
+    return b''.join((HEADER.pack(MAGIC, VERSION, 0, len(days)), days.tobytes(), prices.tobytes()))
+
+
+def unpack_prices(body):
+    """Inverse of pack_prices: returns (days, prices) arrays."""
+    magic, version, _, count = HEADER.unpack_from(body)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a version 1 binary price payload")
+    days = np.frombuffer(body, dtype='<i4', count=count, offset=HEADER.size)
+    prices = np.frombuffer(body, dtype='<f4', count=count, offset=HEADER.size + 4 * count)
+    return days, prices
@@ -0,0 +1,232 @@
+# src/prior_sensitivity.py
+"""
+Task ID:        Task-3
+Created by:     Addisu Taye
+Date Created:   17-OCT-2026
+Purpose:        Prior-sensitivity sweep of the change point model: how far do the break date and the
+                regime means move when the priors or the likelihood change?
+Key Features:   - Grid over mu_prior_sd x sigma_prior_sd (the Normal(mean, 10) / HalfNormal(10) priors of
+                 change_point_model.py) and likelihood families (normal, Student-t)
+               - Every grid point uses the exact engine (exact_change_point.py) on data statistics that
+                 are prepared once and shared, instead of a multi-minute MCMC fit per setting
+               - Student-t via its normal scale-mixture form: observation weights are estimated by EM,
+                 and mu / sigma stay integrated exactly given those weights
+               - Grid points run in a process pool; results are one compact table plus a plot of the
+                 tau posteriors and regime means across the grid
+"""
+
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from exact_change_point import _joint_log_density, exact_tau_posterior, prepare_data, sample_exact_posterior
+from instrumentation import record_stage, stage
+
+LIKELIHOODS = ("normal", "student_t")
+DEFAULT_MU_PRIOR_SDS = (1.0, 10.0, 100.0)
+DEFAULT_SIGMA_PRIOR_SDS = (1.0, 10.0, 100.0)
+DEFAULT_NU = 4.0
+EM_MAX_ITERATIONS = 25
+EM_TOLERANCE = 1e-4
+CREDIBLE_MASS = 0.95
+DRAWS = 2000
+
+
+def student_t_weights(y, tau, mu_1, mu_2, sigma, nu):
+    """E-step of the Student-t scale mixture: expected precision multiplier of each observation."""
+    residual = y - np.where(np.arange(len(y)) >= tau, mu_2, mu_1)
+    return (nu + 1) / (nu + (residual / sigma) ** 2)
+
+
+def _map_parameters(posterior, tau):
+    """Most probable sigma at `tau` and the regime means given both."""
+    count, csum, _, n, total, _ = posterior["stats"]
+    joint = _joint_log_density(np.array([tau]), posterior["stats"], posterior["log_sigma"],
+                               posterior["log_weights"], posterior["prior_var"])[0]
+    sigma2 = np.exp(2 * posterior["log_sigma"][np.argmax(joint)])
+
+    def mean(c, s):
+        return posterior["mu_prior_mean"] + (s / sigma2) / (c / sigma2 + 1.0 / posterior["prior_var"])
+
+    return mean(count[tau], csum[tau]), mean(n - count[tau], total - csum[tau]), np.sqrt(sigma2)
+
+
+def fit_grid_point(price, prepared, mu_prior_sd, sigma_prior_sd, likelihood="normal", nu=DEFAULT_NU):
+    """
+    Exact tau posterior for one prior setting. Returns (posterior, EM iterations).
+    `prepared` holds the shared (unweighted) data statistics from prepare_data.
+    """
+    posterior = exact_tau_posterior(price, mu_prior_sd, sigma_prior_sd, prepared=prepared)
+    if likelihood == "normal":
+        return posterior, 0
+    if likelihood != "student_t":
+        raise ValueError(f"Unknown likelihood '{likelihood}'. Choose one of {LIKELIHOODS}.")
+
+    y = np.asarray(price, dtype=float)
+    weights = np.ones(len(y))
+    for iteration in range(1, EM_MAX_ITERATIONS + 1):
+        tau = int(np.argmax(posterior["pmf"]))
+        new_weights = student_t_weights(y, tau, *_map_parameters(posterior, tau), nu)
+        converged = np.max(np.abs(new_weights - weights)) < EM_TOLERANCE
+        weights = new_weights
+        weighted = prepare_data(y, prepared["mu_prior_mean"], weights)
+        posterior = exact_tau_posterior(y, mu_prior_sd, sigma_prior_sd, prepared=weighted)
+        if converged:
+            break
+    return posterior, iteration
+
+
+def summarize_grid_point(posterior, dates, random_seed=0):
+    """One table row: MAP change date, its credible interval, regime means and the evidence."""
+    pmf = posterior["pmf"]
+    tau = int(np.argmax(pmf))
+    cdf = np.cumsum(pmf)
+    tail = (1 - CREDIBLE_MASS) / 2
+    low, high = int(np.searchsorted(cdf, tail)), min(int(np.searchsorted(cdf, 1 - tail)), len(pmf) - 1)
+    draws = sample_exact_posterior(posterior, chains=1, draws=DRAWS, random_seed=random_seed)
+    return {
+        "tau_map": tau,
+        "change_date": str(pd.Timestamp(dates[tau]).date()),
+        "tau_probability": float(pmf[tau]),
+        "interval_start": str(pd.Timestamp(dates[low]).date()),
+        "interval_end": str(pd.Timestamp(dates[high]).date()),
+        "mu_1_mean": float(draws["mu_1"].mean()),
+        "mu_2_mean": float(draws["mu_2"].mean()),
+        "sigma_mean": float(draws["sigma"].mean()),
+        "log_evidence": float(posterior["log_evidence"]),
+    }
+
+
+def _run_point(price, dates, prepared, point):
+    """Worker entry point: fits and summarizes one grid point. Returns (row, pmf)."""
+    start = time.perf_counter()
+    posterior, iterations = fit_grid_point(price, prepared, point["mu_prior_sd"], point["sigma_prior_sd"],
+                                           point["likelihood"], point["nu"])
+    row = {**point, **summarize_grid_point(posterior, dates), "em_iterations": iterations,
+           "seconds": round(time.perf_counter() - start, 3)}
+    if point["likelihood"] != "normal":
+        # Given fixed EM weights this is not the Student-t marginal likelihood, so it is not comparable
+        row["log_evidence"] = float('nan')
+    return row, posterior["pmf"]
+
+
+def prior_grid(mu_prior_sds=DEFAULT_MU_PRIOR_SDS, sigma_prior_sds=DEFAULT_SIGMA_PRIOR_SDS,
+               likelihoods=("normal",), nu=DEFAULT_NU):
+    return [{"likelihood": likelihood, "nu": nu if likelihood == "student_t" else None,
+             "mu_prior_sd": float(mu_sd), "sigma_prior_sd": float(sigma_sd)}
+            for likelihood, mu_sd, sigma_sd in itertools.product(likelihoods, mu_prior_sds, sigma_prior_sds)]
+
+
+def run_sweep(df, grid, max_workers=None):
+    """
+    Fits every grid point on the Date/Price frame df, in a process pool when there is more than one core.
+
+    Returns:
+        tuple: (table with one row per grid point, pmfs array of shape grid points x len(df))
+    """
+    price = df['Price'].to_numpy(dtype=float)
+    dates = df['Date'].to_numpy()
+    with stage("sensitivity.prepare"):
+        prepared = prepare_data(price)
+    workers = max(1, min(len(grid), max_workers or os.cpu_count() or 1))
+    with stage("sensitivity.sweep"):
+        if workers > 1:
+            from batch_runner import _init_worker
+
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                results = list(pool.map(_run_point, *zip(*[(price, dates, prepared, point) for point in grid])))
+        else:
+            results = [_run_point(price, dates, prepared, point) for point in grid]
+    for row, _ in results:
+        record_stage(f"sensitivity.{row['likelihood']}", row["seconds"])
+    table = pd.DataFrame([row for row, _ in results])
+    return table, np.array([pmf for _, pmf in results])
+
+
+def plot_sweep(df, table, pmfs, output_path="reports/prior_sensitivity.png"):
+    """Tau posterior of every grid point (zoomed to where the mass is) and the regime means across the grid."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    labels = [f"{row.likelihood}{'' if row.nu is None or pd.isna(row.nu) else f'(nu={row.nu:g})'} "
+              f"mu_sd={row.mu_prior_sd:g} sigma_sd={row.sigma_prior_sd:g}" for row in table.itertuples()]
+    mass = pmfs.max(axis=0)
+    support = np.flatnonzero(mass > mass.max() * 1e-3)
+    lo, hi = max(support.min() - 5, 0), min(support.max() + 5, len(df) - 1)
+
+    fig, (ax_tau, ax_mu) = plt.subplots(2, 1, figsize=(14, 10))
+    dates = df['Date'].to_numpy()
+    for label, pmf in zip(labels, pmfs):
+        ax_tau.plot(dates[lo:hi + 1], pmf[lo:hi + 1], drawstyle='steps-mid', alpha=0.8, label=label)
+    ax_tau.set_title("Posterior of the change point (tau) across the prior grid")
+    ax_tau.set_ylabel("p(tau | y)")
+    ax_tau.legend(fontsize=7, ncol=2)
+
+    x = np.arange(len(table))
+    ax_mu.plot(x, table["mu_1_mean"], 'o-', label='mu_1 (before)')
+    ax_mu.plot(x, table["mu_2_mean"], 's-', label='mu_2 (after)')
+    ax_mu.set_xticks(x)
+    ax_mu.set_xticklabels(labels, rotation=60, ha='right', fontsize=7)
+    ax_mu.set_ylabel("Posterior mean (USD)")
+    ax_mu.set_title("Regime means across the prior grid")
+    ax_mu.legend()
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=150)
+    plt.close(fig)
+    print(f"✅ Saved prior sensitivity plot to {output_path}")
+
+
+def main(argv=None):
+    """Main execution function."""
+    from price_store import load_prices
+
+    parser = argparse.ArgumentParser(description="Prior-sensitivity sweep of the change point model.")
+    parser.add_argument("--data", default="data/BrentOilPrices.csv")
+    parser.add_argument("--start", help="First date of the window (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last date of the window (YYYY-MM-DD)")
+    parser.add_argument("--mu-prior-sd", type=float, nargs="+", default=list(DEFAULT_MU_PRIOR_SDS))
+    parser.add_argument("--sigma-prior-sd", type=float, nargs="+", default=list(DEFAULT_SIGMA_PRIOR_SDS))
+    parser.add_argument("--likelihood", nargs="+", choices=LIKELIHOODS, default=["normal"])
+    parser.add_argument("--nu", type=float, default=DEFAULT_NU, help="Student-t degrees of freedom")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output-dir", default="./reports")
+    args = parser.parse_args(argv)
+
+    try:
+        df = load_prices(args.data)
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e}. Please ensure data files are in the correct location.")
+        return 1
+    if args.start:
+        df = df[df['Date'] >= np.datetime64(args.start)]
+    if args.end:
+        df = df[df['Date'] <= np.datetime64(args.end)]
+    df = df.reset_index(drop=True)
+    if len(df) < 2:
+        print("❌ Error: the requested window holds fewer than two prices.")
+        return 1
+
+    grid = prior_grid(args.mu_prior_sd, args.sigma_prior_sd, args.likelihood, args.nu)
+    print(f"🔍 Sweeping {len(grid)} prior settings over {len(df)} records...")
+    table, pmfs = run_sweep(df, grid, args.workers)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    table_path = os.path.join(args.output_dir, "prior_sensitivity.csv")
+    table.to_csv(table_path, index=False)
+    plot_sweep(df, table, pmfs, os.path.join(args.output_dir, "prior_sensitivity.png"))
+    columns = ["likelihood", "mu_prior_sd", "sigma_prior_sd", "change_date", "tau_probability",
+               "mu_1_mean", "mu_2_mean", "log_evidence"]
+    print(table[columns].round(3).to_string(index=False))
+    dates = table["change_date"].unique()
+    print(f"\n📅 {len(dates)} distinct MAP change date(s) across the grid: {', '.join(sorted(dates))}")
+    print(f"📄 Saved results to {table_path}")
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,165 @@
+# src/report_pipeline.py
+"""
+Task ID:        Task-1
+Created by:     Addisu Taye
+Date Created:   17-OCT-2026
+Purpose:        Render the exploratory report figures in parallel, skipping the ones that are up to date.
+Key Features:   - Each figure renders in its own worker process on the headless Agg backend
+               - A manifest records a fingerprint per figure (input data hash, parameters and the
+                 source of every module the rendering runs through); unchanged figures are not re-rendered
+               - Optional downsampling of price lines to the output pixel width before plotting
+               - Plot functions receive their own copy of the data, so nothing mutates a shared frame
+               - Per-figure render times and rendered/skipped/failed counts go to the metrics registry
+"""
+
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import REGISTRY, record_stage, timed_stage
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_NAME = ".render_manifest.json"
+DPI = 300
+# Modules whose code shapes the figures: the plotting functions, their helpers and the render path
+RENDER_MODULES = ("exploratory_analysis", "event_study", "downsampling", "report_pipeline")
+
+# name, plotting function in exploratory_analysis, extra kwargs, needs events, price-line figure width (in)
+FIGURES = [
+    {"name": "price_series", "function": "plot_price_series", "params": {}, "events": False, "width": 16},
+    {"name": "log_returns", "function": "plot_log_returns", "params": {}, "events": False, "width": None},
+    {"name": "rolling_stats", "function": "plot_rolling_statistics", "params": {"window": 90}, "events": False,
+     "width": None},
+    {"name": "price_with_events", "function": "plot_price_with_events", "params": {}, "events": True, "width": 16},
+    {"name": "potential_change_points", "function": "plot_potential_change_points", "params": {}, "events": False,
+     "width": 16},
+]
+
+
+def frame_digest(df):
+    """Content hash of a DataFrame (values and column names)."""
+    digest = hashlib.sha256(",".join(map(str, df.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _source_digest():
+    """Hash of the RENDER_MODULES sources, so a change to a plotting helper re-renders the figures too."""
+    digest = hashlib.sha256()
+    for name in RENDER_MODULES:
+        digest.update(inspect.getsource(importlib.import_module(name)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def figure_fingerprint(spec, data_digest, events_digest, max_points, source_digest=None):
+    """Everything that affects a figure's pixels, hashed into one key."""
+    payload = {
+        "function": spec["function"],
+        "source": source_digest or _source_digest(),
+        "params": spec["params"],
+        "data": data_digest,
+        "events": events_digest if spec["events"] else None,
+        "max_points": max_points if spec["width"] else None,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def downsample_to_width(df, width_inches, dpi=DPI):
+    """Keeps about one LTTB-selected point per output pixel column."""
+    from downsampling import lttb
+
+    pixels = int(width_inches * dpi)
+    if len(df) <= pixels:
+        return df
+    days = df['Date'].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+    keep = lttb(days, df['Price'].to_numpy(dtype=float), pixels)
+    return df.iloc[keep].reset_index(drop=True)
+
+
+def _init_worker():
+    os.environ["MPLBACKEND"] = "Agg"
+    import sys
+    if SRC_DIR not in sys.path:
+        sys.path.insert(0, SRC_DIR)
+
+
+def render_figure(spec, df, events_df, output_path, downsample):
+    """Worker entry point: draws one figure to output_path. Returns (name, seconds)."""
+    start = time.perf_counter()
+    import matplotlib
+    matplotlib.use("Agg")
+    import exploratory_analysis
+
+    data = downsample_to_width(df, spec["width"]) if downsample and spec["width"] else df.copy()
+    args = (data, events_df.copy()) if spec["events"] else (data,)
+    getattr(exploratory_analysis, spec["function"])(*args, output_path=output_path, **spec["params"])
+    return spec["name"], time.perf_counter() - start
+
+
+def _load_manifest(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+@timed_stage("render.report")
+def render_report(df, events_df, output_dir="reports", downsample=False, force=False, max_workers=None):
+    """
+    Renders every report figure whose fingerprint changed (all of them with force=True).
+
+    Returns:
+        dict: {'rendered': [...], 'skipped': [...], 'failed': {name: error}}
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    manifest = _load_manifest(manifest_path)
+    data_digest = frame_digest(df[['Date', 'Price']])
+    events_digest = frame_digest(events_df)
+    max_points = "pixel-width" if downsample else None
+    source_digest = _source_digest()
+
+    pending, skipped = [], []
+    for spec in FIGURES:
+        output_path = os.path.join(output_dir, f"{spec['name']}.png")
+        key = figure_fingerprint(spec, data_digest, events_digest, max_points, source_digest)
+        if not force and manifest.get(spec["name"]) == key and os.path.exists(output_path):
+            skipped.append(spec["name"])
+        else:
+            pending.append((spec, output_path, key))
+
+    rendered, failed = [], {}
+    if pending:
+        workers = max(1, min(len(pending), max_workers or os.cpu_count() or 1))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = {pool.submit(render_figure, spec, df, events_df, output_path, downsample): (spec, key)
+                       for spec, output_path, key in pending}
+            for future in as_completed(futures):
+                spec, key = futures[future]
+                try:
+                    _, seconds = future.result()
+                except Exception as e:
+                    failed[spec["name"]] = f"{type(e).__name__}: {e}"
+                    manifest.pop(spec["name"], None)
+                    continue
+                # Timed inside the worker, so pool start-up and pickling are not counted
+                record_stage(f"render.{spec['name']}", seconds)
+                manifest[spec["name"]] = key
+                rendered.append(spec["name"])
+
+        tmp_path = f"{manifest_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, manifest_path)
+
+    for outcome, names in (("rendered", rendered), ("skipped", skipped), ("failed", failed)):
+        REGISTRY.inc("brent_figures_total", len(names), "Report figures by render outcome", result=outcome)
+    return {"rendered": sorted(rendered), "skipped": skipped, "failed": failed}
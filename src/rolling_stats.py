@@ -0,0 +1,270 @@
+# src/rolling_stats.py
+"""
+Task ID:        Task-1
+Created by:     Addisu Taye
+Date Created:   17-OCT-2026
+Purpose:        Incremental rolling statistics of the price series for the dashboard indicators and EDA plots.
+Key Features:   - Running mean / variance of prices and daily returns for a configurable set of windows
+                 plus the full history, kept with Welford updates (sliding windows add the new value and
+                 remove the one leaving the window in a single step)
+               - Appending a price costs O(windows); an exact resync from the retained values every
+                 RESYNC_INTERVAL updates keeps the sliding aggregates from drifting
+               - First build vectorized over the whole history; later runs only ingest newer rows
+               - State (aggregates and the last max(windows) prices) saved to / restored from a small .npz
+                 whose size does not grow with the history; used by the backend's /api/indicators
+               - The ingested history is checked by row count and a fingerprint of its newest rows, so a
+                 revised recent price triggers a rebuild; the check and an update stay O(windows)
+"""
+
+import collections
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from price_store import extend_fingerprint, seen_rows, tail_fingerprint
+
+DEFAULT_WINDOWS = (20, 90, 252)
+DEFAULT_STATE_PATH = "reports/rolling_stats_state.npz"
+TRADING_DAYS = 252
+RESYNC_INTERVAL = 10000
+STATE_VERSION = 3
+
+
+class RunningMoments:
+    """Count, mean and sum of squared deviations (Welford) of a full or sliding window."""
+
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self, n=0, mean=0.0, m2=0.0):
+        self.n, self.mean, self.m2 = int(n), float(mean), float(m2)
+
+    def add(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    def replace(self, old, new):
+        """Slides a full window by one: `old` leaves it and `new` enters, in one update."""
+        mean = self.mean + (new - old) / self.n
+        self.m2 = max(self.m2 + (new - old) * (new - mean + old - self.mean), 0.0)
+        self.mean = mean
+
+    def reset(self, values):
+        values = np.asarray(values, dtype=float)
+        self.n = len(values)
+        self.mean = float(values.mean()) if self.n else 0.0
+        self.m2 = float(((values - self.mean) ** 2).sum()) if self.n else 0.0
+
+    def std(self):
+        return float(np.sqrt(self.m2 / (self.n - 1))) if self.n > 1 else float('nan')
+
+    def state(self):
+        return [self.n, self.mean, self.m2]
+
+
+class RollingStats:
+    """Rolling and full-history moments of prices and simple daily returns."""
+
+    def __init__(self, windows=DEFAULT_WINDOWS):
+        self.windows = tuple(sorted({int(w) for w in windows}))
+        if not self.windows or self.windows[0] < 2:
+            raise ValueError("Rolling windows must hold at least two observations.")
+        depth = self.windows[-1]
+        # The newest max(windows) prices and returns: the values each window drops as it slides
+        self.prices = collections.deque(maxlen=depth)
+        self.returns = collections.deque(maxlen=depth)
+        self.price_moments = {w: RunningMoments() for w in self.windows}
+        self.return_moments = {w: RunningMoments() for w in self.windows}
+        self.full_price = RunningMoments()
+        self.full_return = RunningMoments()
+        self.n_obs = 0
+        # Rolling hash of every ingested row (extended with new rows only) and hash of the newest ones
+        self.fingerprint = None
+        self.tail_fingerprint = None
+        self.last_date = None
+        self.updates_since_resync = 0
+
+    @classmethod
+    def for_series(cls, df, windows=DEFAULT_WINDOWS):
+        """Builds the state of a whole Date/Price frame in one vectorized pass."""
+        stats = cls(windows)
+        prices = df['Price'].to_numpy(dtype=float)
+        returns = prices[1:] / prices[:-1] - 1
+        stats.prices.extend(prices[-stats.windows[-1]:])
+        stats.returns.extend(returns[-stats.windows[-1]:])
+        stats.full_price.reset(prices)
+        stats.full_return.reset(returns)
+        stats.n_obs = len(prices)
+        stats._resync()
+        if len(df):
+            stats.last_date = pd.Timestamp(df['Date'].iloc[-1])
+        stats.fingerprint = extend_fingerprint(None, df)
+        stats.tail_fingerprint = tail_fingerprint(df)
+        return stats
+
+    def _resync(self):
+        """Recomputes every sliding window exactly from the retained values."""
+        prices, returns = np.asarray(self.prices), np.asarray(self.returns)
+        for w in self.windows:
+            self.price_moments[w].reset(prices[-w:])
+            self.return_moments[w].reset(returns[-w:])
+        self.updates_since_resync = 0
+
+    @staticmethod
+    def _slide(moments, buffer, x):
+        """Adds x to every window of `moments`, dropping the value that falls out of each full window."""
+        for w, m in moments.items():
+            if m.n < w:
+                m.add(x)
+            else:
+                m.replace(buffer[-w], x)
+        buffer.append(x)
+
+    def update(self, price, date=None):
+        """Absorbs one price; O(number of windows)."""
+        price = float(price)
+        if self.prices:
+            ret = price / self.prices[-1] - 1
+            self.full_return.add(ret)
+            self._slide(self.return_moments, self.returns, ret)
+        self.full_price.add(price)
+        self._slide(self.price_moments, self.prices, price)
+        self.n_obs += 1
+        if date is not None:
+            self.last_date = pd.Timestamp(date)
+
+        self.updates_since_resync += 1
+        if self.updates_since_resync >= RESYNC_INTERVAL:
+            self._resync()
+
+    def ingest(self, df):
+        """
+        Feeds only the rows of a date-sorted Date/Price frame that are newer than the last ingested date.
+        df must hold the whole history: its newest rows become the tail fingerprint.
+        """
+        new = df.iloc[seen_rows(df, self.last_date):]
+        for date, price in zip(new['Date'], new['Price'].to_numpy(dtype=float)):
+            self.update(price, date)
+        if len(new):
+            self.fingerprint = extend_fingerprint(self.fingerprint, new)
+            self.tail_fingerprint = tail_fingerprint(df)
+        return len(new)
+
+    def indicators(self):
+        """Headline figures and per-window statistics, read straight from the running aggregates."""
+        def volatility(moments):
+            return round(moments.std() * 100 * TRADING_DAYS ** 0.5, 2) if moments.n > 1 else None
+
+        rolling = {}
+        for w in self.windows:
+            price, ret = self.price_moments[w], self.return_moments[w]
+            rolling[str(w)] = {
+                "observations": price.n,
+                "mean_price": round(price.mean, 2),
+                "price_std": round(price.std(), 4) if price.n > 1 else None,
+                "annualized_volatility": volatility(ret),
+            }
+        return {
+            "latest_price": round(self.prices[-1], 2) if self.prices else None,
+            "average_price": round(self.full_price.mean, 2),
+            "annualized_volatility": volatility(self.full_return),
+            "last_date": self.last_date.strftime('%Y-%m-%d') if self.last_date is not None else None,
+            "rolling": rolling,
+        }
+
+    def save(self, path):
+        """Writes the state atomically, so readers never see a half-written file."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Unique per writer: concurrent saves must not move each other's temp file away
+        tmp_path = f"{path}.tmp{os.getpid()}.{threading.get_ident()}.npz"
+        np.savez(
+            tmp_path,
+            version=STATE_VERSION,
+            windows=np.array(self.windows),
+            prices=np.array(self.prices),
+            returns=np.array(self.returns),
+            moments=np.array([[m.state() for m in self.price_moments.values()],
+                              [m.state() for m in self.return_moments.values()]]),
+            full=np.array([self.full_price.state(), self.full_return.state()]),
+            n_obs=self.n_obs,
+            fingerprint=self.fingerprint or "",
+            tail_fingerprint=self.tail_fingerprint or "",
+            last_date=np.datetime64(self.last_date) if self.last_date is not None else np.datetime64('NaT'),
+            updates_since_resync=self.updates_since_resync,
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Restores a state saved with save()."""
+        with np.load(path) as state:
+            if int(state['version']) != STATE_VERSION:
+                raise ValueError(f"Unsupported rolling statistics state version in {path}")
+            stats = cls(state['windows'].tolist())
+            stats.prices.extend(state['prices'].tolist())
+            stats.returns.extend(state['returns'].tolist())
+            for moments, saved in zip((stats.price_moments, stats.return_moments), state['moments']):
+                for w, (n, mean, m2) in zip(stats.windows, saved):
+                    moments[w] = RunningMoments(n, mean, m2)
+            stats.full_price, stats.full_return = (RunningMoments(*row) for row in state['full'])
+            stats.n_obs = int(state['n_obs'])
+            stats.fingerprint = str(state['fingerprint']) or None
+            stats.tail_fingerprint = str(state['tail_fingerprint']) or None
+            last_date = state['last_date'][()]
+            stats.last_date = None if np.isnat(last_date) else pd.Timestamp(last_date)
+            stats.updates_since_resync = int(state['updates_since_resync'])
+        return stats
+
+
+def update_rolling_stats(df, state_path=DEFAULT_STATE_PATH, windows=DEFAULT_WINDOWS, save=True):
+    """
+    Loads the saved state (or builds it from the series), ingests new rows and saves it.
+    The state is rebuilt when the windows differ or the already ingested rows changed (revised,
+    inserted or removed prices): its row count must match and its newest rows must hash the same.
+    With save=False the saved state is only read, e.g. by request handlers.
+    """
+    stats = None
+    if os.path.exists(state_path):
+        try:
+            stats = RollingStats.load(state_path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Ignoring unreadable rolling statistics state {state_path}: {e}")
+    if stats is not None:
+        seen = seen_rows(df, stats.last_date)
+        if (stats.windows != tuple(sorted(set(windows))) or seen != stats.n_obs
+                or tail_fingerprint(df, seen) != stats.tail_fingerprint):
+            stats = None
+    if stats is None:
+        stats = RollingStats.for_series(df, windows)
+        new_rows = len(df)
+    else:
+        new_rows = stats.ingest(df)
+    if new_rows and save:
+        stats.save(state_path)
+    return stats, new_rows
+
+
+def main():
+    """Main execution function."""
+    from price_store import load_prices
+
+    print("🔍 Updating rolling statistics...")
+    try:
+        df = load_prices("data/BrentOilPrices.csv")
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e}. Please ensure data files are in the correct location.")
+        return
+
+    stats, new_rows = update_rolling_stats(df)
+    indicators = stats.indicators()
+    print(f"✅ Ingested {new_rows} new records (state: {DEFAULT_STATE_PATH})")
+    for window, values in indicators["rolling"].items():
+        print(f"📈 {window}-day: mean ${values['mean_price']:.2f}, "
+              f"annualized volatility {values['annualized_volatility']}%")
+
+
+if __name__ == "__main__":
+    main()
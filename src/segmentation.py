@@ -0,0 +1,226 @@
+# src/segmentation.py
+"""
+Task ID:        Task-2
+Created by:     Addisu Taye
+Date Created:   17-OCT-2026
+Purpose:        Detect an unknown number of change points in the full Brent series.
+Key Features:   - Gaussian segment costs for changes in mean, variance or both
+               - O(1) segment cost from precomputed cumulative sums / sums of squares
+               - Pruned exact dynamic programming (PELT), near-linear when breaks keep occurring
+               - Binary segmentation for very long series with few breaks (O(n) work per level of splits)
+               - Segment table and change point table ready to be served by /api/change_points
+"""
+
+import heapq
+import os
+
+import numpy as np
+import pandas as pd
+
+COST_MODELS = ("mean", "var", "meanvar")
+# Free parameters per segment, used by the default BIC-style penalty
+SEGMENT_PARAMS = {"mean": 1, "var": 1, "meanvar": 2}
+VARIANCE_FLOOR = 1e-8
+
+
+class SegmentCost:
+    """Gaussian negative log-likelihood (x2, constants dropped) of y[start:end] in O(1)."""
+
+    def __init__(self, values, model="meanvar"):
+        if model not in COST_MODELS:
+            raise ValueError(f"Unknown cost model '{model}'. Choose one of {COST_MODELS}.")
+        y = np.asarray(values, dtype=float)
+        self.model = model
+        self.n = len(y)
+        # Centring keeps the sums of squares well conditioned on long series
+        centred = y - y.mean()
+        self.csum = np.concatenate(([0.0], np.cumsum(centred)))
+        self.csq = np.concatenate(([0.0], np.cumsum(centred ** 2)))
+        self.global_var = max(centred.var(), VARIANCE_FLOOR)
+
+    def __call__(self, start, end):
+        """Cost of the segments [start, end); `start` may be an array of candidate starts."""
+        count = end - start
+        total = self.csum[end] - self.csum[start]
+        total_sq = self.csq[end] - self.csq[start]
+        sse = np.maximum(total_sq - total ** 2 / count, 0.0)
+        if self.model == "mean":
+            return sse / self.global_var
+        if self.model == "var":
+            # Mean held at the global mean (zero after centring)
+            return count * np.log(np.maximum(total_sq / count, VARIANCE_FLOOR))
+        return count * np.log(np.maximum(sse / count, VARIANCE_FLOOR))
+
+
+def pelt(values, model="meanvar", penalty=None, min_size=20):
+    """
+    Finds the optimal set of change points by Pruned Exact Linear Time dynamic programming.
+
+    Parameters:
+        values (array-like): Observations in time order
+        model (str): 'mean', 'var' or 'meanvar'
+        penalty (float): Cost added per change point (default: BIC, (params + 1) * log(n))
+        min_size (int): Minimum number of observations per segment
+
+    Returns:
+        list[int]: Indices where new segments start (excluding 0)
+    """
+    cost = SegmentCost(values, model)
+    n = cost.n
+    if penalty is None:
+        penalty = (SEGMENT_PARAMS[model] + 1) * np.log(n)
+    if n < 2 * min_size:
+        return []
+
+    best = np.full(n + 1, np.inf)
+    best[0] = -penalty
+    last_change = np.zeros(n + 1, dtype=int)
+    candidates = np.array([0])
+
+    for end in range(min_size, n + 1):
+        scores = best[candidates] + cost(candidates, end) + penalty
+        pick = np.argmin(scores)
+        best[end] = scores[pick]
+        last_change[end] = candidates[pick]
+
+        # Prune starts that can never be optimal again, then admit the next admissible start
+        candidates = candidates[scores - penalty <= best[end]]
+        if end + 1 - min_size >= min_size:
+            candidates = np.append(candidates, end + 1 - min_size)
+
+    change_points = []
+    end = n
+    while end > 0:
+        end = last_change[end]
+        if end > 0:
+            change_points.append(int(end))
+    return change_points[::-1]
+
+
+def binary_segmentation(values, model="meanvar", penalty=None, min_size=20, max_change_points=None):
+    """
+    Greedy binary segmentation: repeatedly splits the segment whose best split gains the most,
+    while the gain exceeds the penalty. Every candidate split of a segment is scored in one
+    vectorized pass, so each level of splitting costs O(n) however long the segments are.
+
+    Returns:
+        list[int]: Indices where new segments start (excluding 0)
+    """
+    cost = SegmentCost(values, model)
+    n = cost.n
+    if penalty is None:
+        penalty = (SEGMENT_PARAMS[model] + 1) * np.log(n)
+
+    def best_split(start, end):
+        splits = np.arange(start + min_size, end - min_size + 1)
+        if len(splits) == 0:
+            return None
+        gains = cost(start, end) - cost(start, splits) - cost(splits, end)
+        pick = np.argmax(gains)
+        return gains[pick], int(splits[pick])
+
+    queue = []
+
+    def push(start, end):
+        split = best_split(start, end)
+        if split is not None and split[0] > penalty:
+            heapq.heappush(queue, (-split[0], start, end, split[1]))
+
+    push(0, n)
+    change_points = []
+    while queue and (max_change_points is None or len(change_points) < max_change_points):
+        _, start, end, split = heapq.heappop(queue)
+        change_points.append(split)
+        push(start, split)
+        push(split, end)
+    return sorted(change_points)
+
+
+SEARCH_METHODS = {"pelt": pelt, "binseg": binary_segmentation}
+
+
+def segment_table(df, change_points):
+    """One row per regime: date range, size, mean and standard deviation of the price."""
+    price = df['Price'].to_numpy(dtype=float)
+    bounds = [0] + list(change_points) + [len(df)]
+    rows = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        segment = price[start:end]
+        rows.append({
+            "segment": len(rows) + 1,
+            "start_index": start,
+            "end_index": end - 1,
+            "start_date": df['Date'].iloc[start].strftime('%Y-%m-%d'),
+            "end_date": df['Date'].iloc[end - 1].strftime('%Y-%m-%d'),
+            "n_obs": end - start,
+            "mean": round(float(segment.mean()), 4),
+            "std": round(float(segment.std()), 4),
+        })
+    return pd.DataFrame(rows)
+
+
+def change_point_table(segments, events_df=None, max_days=60):
+    """
+    Turns a segment table into one row per break (the /api/change_points schema),
+    labelled with the nearest key event within `max_days` when one is available.
+    """
+    rows = []
+    for prev, curr in zip(segments.iloc[:-1].itertuples(), segments.iloc[1:].itertuples()):
+        rows.append({
+            "date": curr.start_date,
+            "pre_mean": round(prev.mean, 2),
+            "post_mean": round(curr.mean, 2),
+            "impact_percent": round((curr.mean - prev.mean) / prev.mean * 100, 1),
+            "event": "Detected regime change",
+            "description": f"Mean shifts from ${prev.mean:.2f} to ${curr.mean:.2f}",
+        })
+    table = pd.DataFrame(rows, columns=["date", "pre_mean", "post_mean", "impact_percent", "event", "description"])
+
+    if events_df is not None and len(events_df) and len(table):
+        event_dates = pd.to_datetime(events_df['Date']).to_numpy()
+        break_dates = pd.to_datetime(table['date']).to_numpy()
+        gaps = np.abs(break_dates[:, None] - event_dates[None, :])
+        nearest = gaps.argmin(axis=1)
+        close = gaps[np.arange(len(table)), nearest] <= np.timedelta64(max_days, 'D')
+        table.loc[close, 'event'] = events_df['Event'].to_numpy()[nearest[close]]
+        table.loc[close, 'description'] = events_df['Description'].to_numpy()[nearest[close]]
+    return table
+
+
+def detect_segments(df, method="pelt", model="mean", penalty=None, min_size=250):
+    """
+    Segments the price column and returns the segment table.
+    Defaults to mean shifts with at least one trading year per regime: price levels wander
+    like a random walk, so finer segments mostly track noise rather than regime changes.
+    """
+    if method not in SEARCH_METHODS:
+        raise ValueError(f"Unknown search method '{method}'. Choose one of {tuple(SEARCH_METHODS)}.")
+    values = df['Price'].to_numpy(dtype=float)
+    change_points = SEARCH_METHODS[method](values, model=model, penalty=penalty, min_size=min_size)
+    return segment_table(df, change_points)
+
+
+def main():
+    """Main execution function."""
+    from load_data import load_brent_prices
+
+    print("🔍 Starting multiple change point segmentation (PELT)...")
+
+    os.makedirs("reports", exist_ok=True)
+    try:
+        df = load_brent_prices()
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e}. Please ensure data files are in the correct location.")
+        return
+
+    segments = detect_segments(df)
+    output_path = "reports/change_point_segments.csv"
+    segments.to_csv(output_path, index=False)
+
+    print(f"✅ Found {len(segments) - 1} change points across {len(df)} records")
+    print(segments[['start_date', 'end_date', 'n_obs', 'mean', 'std']].to_string(index=False))
+    print(f"✅ Saved segment table to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
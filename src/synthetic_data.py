@@ -0,0 +1,79 @@
+# src/synthetic_data.py
+"""
+Task ID:        Task-2
+Created by:     Addisu Taye
+Date Created:   17-OCT-2026
+Purpose:        Deterministic synthetic price series with known (injected) change points.
+Key Features:   - Piecewise-constant price level plus Gaussian noise, i.e. the data the change point
+                 model assumes, so detected breaks can be checked against the injected ones
+               - Same seed, same series: fixtures are reproducible across commits and machines
+               - Scales from 10^3 to 10^7 points (several observations per trading day once the
+                 two-digit-year calendar of the raw file runs out)
+               - Writes the raw CSV layout of BrentOilPrices.csv, mixed date formats included
+"""
+
+import numpy as np
+import pandas as pd
+
+START_DATE = '1970-01-01'
+# '%d-%b-%y' reads two-digit years as 1969-2068, so the raw layout holds at most ~100 years of days
+MAX_TRADING_DAYS = 25000
+LONG_FORMAT_SHARE = 0.05
+
+
+def injected_change_points(n, n_change_points, rng):
+    """Sorted break indices, one per equal slice of the series with some jitter inside it."""
+    slice_len = n / (n_change_points + 1)
+    centres = slice_len * np.arange(1, n_change_points + 1)
+    jitter = rng.uniform(-0.25, 0.25, size=n_change_points) * slice_len
+    return np.round(centres + jitter).astype(np.int64)
+
+
+def trading_dates(n, start=START_DATE):
+    """Business days from `start`; each day repeats when n exceeds MAX_TRADING_DAYS."""
+    per_day = -(-n // MAX_TRADING_DAYS)
+    days = pd.bdate_range(start, periods=-(-n // per_day)).to_numpy()
+    return np.repeat(days, per_day)[:n]
+
+
+def synthetic_series(n, n_change_points=1, noise=5.0, seed=0, start=START_DATE):
+    """
+    Generates a Date/Price frame with `n_change_points` mean shifts.
+
+    Returns:
+        tuple: (df, change_points, levels) where change_points are the indices of the first
+        observation of each new regime and levels the true mean of every regime.
+    """
+    rng = np.random.default_rng(seed)
+    change_points = injected_change_points(n, n_change_points, rng)
+
+    # Alternate up/down jumps of 3-6 noise standard deviations, staying well above zero
+    levels = [rng.uniform(30.0, 60.0)]
+    for i in range(n_change_points):
+        jump = rng.uniform(3.0, 6.0) * noise
+        levels.append(levels[-1] + jump if i % 2 == 0 or levels[-1] - jump < 4 * noise else levels[-1] - jump)
+    levels = np.array(levels)
+
+    regime = np.searchsorted(change_points, np.arange(n), side='right')
+    price = levels[regime] + noise * rng.standard_normal(n)
+    df = pd.DataFrame({'Date': trading_dates(n, start), 'Price': np.round(np.maximum(price, 0.01), 2)})
+    return df, change_points, levels
+
+
+def write_raw_csv(df, path):
+    """
+    Writes df in the raw BrentOilPrices.csv layout: '20-May-87' dates, with the most recent rows
+    in the quoted 'Apr 22, 2020' format.
+    """
+    dates = df['Date'].to_numpy(dtype='datetime64[D]')
+    # Format each distinct day once; long series repeat days, so this is far cheaper than per row
+    unique_days, inverse = np.unique(dates, return_inverse=True)
+    index = pd.DatetimeIndex(unique_days)
+    short_text = np.asarray(index.strftime('%d-%b-%y'), dtype=object)
+    long_text = np.asarray(index.strftime('%b %d, %Y'), dtype=object)
+
+    text = short_text[inverse]
+    first_long = int(len(df) * (1 - LONG_FORMAT_SHARE))
+    text[first_long:] = long_text[inverse[first_long:]]
+    # The long format contains a comma, so to_csv quotes it exactly like the raw file
+    pd.DataFrame({'Date': text, 'Price': df['Price'].to_numpy()}).to_csv(path, index=False, float_format='%.2f')
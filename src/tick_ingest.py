@@ -0,0 +1,271 @@
+# src/tick_ingest.py
+"""
+Task ID:        Task-1
+Created by:     Addisu Taye
+Date Created:   17-OCT-2026
+Purpose:        Out-of-core ingestion of large tick / intraday price files into daily OHLC + VWAP bars.
+Key Features:   - Reads the raw file in bounded byte blocks cut at line ends, so peak memory is set by the
+                 block size (default 64 MB), not by the file size
+               - Both raw date formats (with or without a time of day) parsed per block, with the same
+                 inference fallback as price_store.py
+               - Daily bars aggregated on the fly; a day that spans two blocks is merged, never split
+               - Append-only updates: a later run resumes from the last ingested byte, after checking
+                 that the already ingested part of the file is unchanged (otherwise it rebuilds)
+               - An unterminated last line is ingested by a full read; an append run leaves it (it may
+                 still be being written) and warns
+               - Crash-safe: bar files are appended first and the metadata (row count, byte offset and
+                 the still-open last day) is committed after every block
+Input:          CSV with a header and columns Date, Price[, Volume] (ticks without a volume count as 1)
+"""
+
+import hashlib
+import io
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import REGISTRY, stage
+from price_store import CACHE_DIRNAME, DATE_FORMATS, EPOCH, parse_dates
+
+DEFAULT_CHUNK_BYTES = 64 << 20
+STORE_VERSION = 1
+FINGERPRINT_BYTES = 1 << 16
+TICK_FORMATS = ('%d-%b-%y %H:%M:%S', '%b %d, %Y %H:%M:%S', '%d-%b-%y %H:%M', '%b %d, %Y %H:%M') + DATE_FORMATS
+# Per-day bar columns; turnover is sum(price x volume), kept so partial days merge exactly (VWAP = turnover / volume)
+BAR_FIELDS = (("days", "<i4"), ("open", "<f8"), ("high", "<f8"), ("low", "<f8"), ("close", "<f8"),
+              ("volume", "<f8"), ("turnover", "<f8"), ("ticks", "<i8"))
+
+
+def iter_blocks(f, chunk_bytes=DEFAULT_CHUNK_BYTES, final_line=False):
+    """
+    Yields (block, end_offset) for consecutive blocks of whole lines read from the current position.
+    A trailing line without a newline (e.g. one still being written) is left unread, unless
+    `final_line` is set: then it is taken as the file's last record.
+    """
+    carry = b''
+    offset = f.tell()
+    while True:
+        data = f.read(chunk_bytes)
+        if not data:
+            if carry and final_line:
+                yield carry, offset + len(carry)
+            return
+        data = carry + data
+        cut = data.rfind(b'\n') + 1
+        if cut == 0:
+            carry = data  # a single line longer than the block: keep reading
+            continue
+        offset += cut  # the block starts at the previous offset (with the carried partial line)
+        carry = data[cut:]
+        yield data[:cut], offset
+
+
+def parse_tick_block(block, names):
+    """Parses one block of CSV lines into (days, prices, volumes), ordered by timestamp."""
+    raw = pd.read_csv(io.BytesIO(block), header=None, names=names, dtype={names[0]: str},
+                      skipinitialspace=True)
+    timestamps = parse_dates(raw[names[0]], TICK_FORMATS).to_numpy()
+    prices = pd.to_numeric(raw[names[1]], errors='coerce').to_numpy(dtype=np.float64)
+    volumes = (pd.to_numeric(raw[names[2]], errors='coerce').to_numpy(dtype=np.float64) if len(names) > 2
+               else np.ones(len(raw)))
+    valid = ~np.isnat(timestamps) & np.isfinite(prices) & np.isfinite(volumes)
+    timestamps, prices, volumes = timestamps[valid], prices[valid], volumes[valid]
+
+    order = np.argsort(timestamps, kind='stable')
+    days = (timestamps[order].astype('datetime64[D]') - EPOCH).astype(np.int32)
+    return days, prices[order], volumes[order]
+
+
+def aggregate_ticks(days, prices, volumes):
+    """Daily bars (dict of BAR_FIELDS arrays) of day-sorted ticks, using one reduceat per column."""
+    if len(days) == 0:
+        return {name: np.empty(0, dtype=dtype) for name, dtype in BAR_FIELDS}
+    starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+    ends = np.r_[starts[1:], len(days)]
+    return {
+        "days": days[starts],
+        "open": prices[starts],
+        "high": np.maximum.reduceat(prices, starts),
+        "low": np.minimum.reduceat(prices, starts),
+        "close": prices[ends - 1],
+        "volume": np.add.reduceat(volumes, starts),
+        "turnover": np.add.reduceat(prices * volumes, starts),
+        "ticks": (ends - starts).astype(np.int64),
+    }
+
+
+def merge_bar(earlier, later):
+    """Combines two partial bars of the same day (single-row dicts), earlier ticks first."""
+    return {
+        "days": earlier["days"],
+        "open": earlier["open"],
+        "high": np.maximum(earlier["high"], later["high"]),
+        "low": np.minimum(earlier["low"], later["low"]),
+        "close": later["close"],
+        "volume": earlier["volume"] + later["volume"],
+        "turnover": earlier["turnover"] + later["turnover"],
+        "ticks": earlier["ticks"] + later["ticks"],
+    }
+
+
+def _fingerprint(path, offset):
+    """Hash of the first and last FINGERPRINT_BYTES of path[:offset] (cheap check that it was not rewritten)."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        digest.update(f.read(min(offset, FINGERPRINT_BYTES)))
+        f.seek(max(0, offset - FINGERPRINT_BYTES))
+        digest.update(f.read(offset - f.tell()))
+    return digest.hexdigest()
+
+
+class DailyBarStore:
+    """Append-only columnar store of the daily bars of one tick file (in <dir>/.cache/<stem>.bars/)."""
+
+    def __init__(self, source_path):
+        self.source_path = source_path
+        stem = os.path.splitext(os.path.basename(source_path))[0]
+        self.dir = os.path.join(os.path.dirname(os.path.abspath(source_path)), CACHE_DIRNAME, f"{stem}.bars")
+        self.meta_path = os.path.join(self.dir, "meta.json")
+
+    def _column_path(self, name):
+        return os.path.join(self.dir, f"{name}.bin")
+
+    def read_meta(self):
+        try:
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get("version") == STORE_VERSION else None
+
+    def _commit(self, meta):
+        tmp_path = f"{self.meta_path}.tmp{os.getpid()}"
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def _resume_point(self, rebuild):
+        """Metadata to continue from, or None when the store has to be (re)built from the start."""
+        meta = None if rebuild else self.read_meta()
+        if meta is None:
+            return None
+        if os.path.getsize(self.source_path) < meta["offset"] or \
+                _fingerprint(self.source_path, meta["offset"]) != meta["fingerprint"]:
+            print(f"⚠️ {self.source_path} was rewritten, not appended to; rebuilding its daily bars")
+            return None
+        return meta
+
+    def ingest(self, chunk_bytes=DEFAULT_CHUNK_BYTES, rebuild=False):
+        """
+        Brings the bars up to date with the source file, reading only bytes not ingested yet.
+
+        Returns:
+            dict: mode ('rebuild' or 'append'), bytes_read, ticks, new_days and total days
+        """
+        os.makedirs(self.dir, exist_ok=True)
+        meta = self._resume_point(rebuild)
+        mode = "append" if meta else "rebuild"
+        if meta is None:
+            with open(self.source_path, 'rb') as f:
+                header = f.readline()
+            names = [name.strip().strip('"') for name in header.decode('utf-8').strip().split(',')]
+            if len(names) not in (2, 3):
+                raise ValueError(f"Expected Date,Price[,Volume] columns in {self.source_path}, got {names}")
+            meta = {"version": STORE_VERSION, "names": ["DateRaw", "Price", "Volume"][:len(names)],
+                    "offset": len(header), "rows": 0, "pending": None}
+        # Drop bar rows written after the last committed metadata (an interrupted run)
+        for name, dtype in BAR_FIELDS:
+            with open(self._column_path(name), 'ab') as f:
+                f.truncate(meta["rows"] * np.dtype(dtype).itemsize)
+
+        start_offset, start_rows, ticks = meta["offset"], meta["rows"], 0
+        pending = {k: np.asarray([v], dtype=dtype) for (k, dtype), v in
+                   zip(BAR_FIELDS, meta["pending"])} if meta["pending"] else None
+        with stage("tick_ingest.ingest"), open(self.source_path, 'rb') as f:
+            f.seek(meta["offset"])
+            # A full read takes an unterminated last line as a record; an append run leaves it,
+            # since it may be a line the writer has not finished yet
+            for block, end_offset in iter_blocks(f, chunk_bytes, final_line=mode == "rebuild"):
+                with stage("tick_ingest.block"):
+                    days, prices, volumes = parse_tick_block(block, meta["names"])
+                    bars = aggregate_ticks(days, prices, volumes)
+                    ticks += len(days)
+                    pending, complete = self._carry(pending, bars, end_offset)
+                    self._append(complete)
+                    meta.update(offset=end_offset, rows=meta["rows"] + len(complete["days"]),
+                                pending=None if pending is None else [v.item() for v in pending.values()])
+                    meta["fingerprint"] = _fingerprint(self.source_path, end_offset)
+                    self._commit(meta)
+        unread = os.path.getsize(self.source_path) - meta["offset"]
+        if unread > 0:
+            print(f"⚠️ {self.source_path} ends with {unread} bytes without a trailing newline; they are "
+                  f"ingested once the line is completed (or with --rebuild)")
+        if "fingerprint" not in meta:
+            meta["fingerprint"] = _fingerprint(self.source_path, meta["offset"])
+            self._commit(meta)
+
+        REGISTRY.inc("brent_ticks_ingested_total", ticks, "Ticks aggregated into daily bars")
+        total = meta["rows"] + (meta["pending"] is not None)
+        return {"mode": mode, "bytes_read": meta["offset"] - start_offset, "ticks": ticks,
+                "new_days": meta["rows"] - start_rows, "days": total}
+
+    @staticmethod
+    def _carry(pending, bars, offset):
+        """Splits a block's bars into finished days and the last (possibly continuing) day."""
+        if len(bars["days"]) == 0:
+            return pending, {name: np.empty(0, dtype=dtype) for name, dtype in BAR_FIELDS}
+        if pending is not None:
+            if bars["days"][0] < pending["days"][0]:
+                raise ValueError(f"Ticks are not in chronological order (before byte offset {offset})")
+            if bars["days"][0] == pending["days"][0]:
+                first = merge_bar(pending, {k: v[:1] for k, v in bars.items()})
+                bars = {k: np.concatenate([first[k], v[1:]]) for k, v in bars.items()}
+            else:
+                bars = {k: np.concatenate([pending[k], v]) for k, v in bars.items()}
+        return {k: v[-1:] for k, v in bars.items()}, {k: v[:-1] for k, v in bars.items()}
+
+    def _append(self, bars):
+        for name, dtype in BAR_FIELDS:
+            with open(self._column_path(name), 'ab') as f:
+                np.ascontiguousarray(bars[name], dtype=dtype).tofile(f)
+
+    def load(self):
+        """All bars, including the still-open last day, as a dict of arrays."""
+        meta = self.read_meta()
+        if meta is None:
+            raise FileNotFoundError(f"No daily bars for {self.source_path}; run ingest first")
+        columns = {}
+        for (name, dtype), pending in zip(BAR_FIELDS, meta["pending"] or [None] * len(BAR_FIELDS)):
+            values = np.fromfile(self._column_path(name), dtype=dtype, count=meta["rows"])
+            columns[name] = values if pending is None else np.append(values, np.asarray(pending, dtype=dtype))
+        return columns
+
+
+def ingest_ticks(file_path, chunk_bytes=DEFAULT_CHUNK_BYTES, rebuild=False):
+    """Streams file_path into its daily bar store. Returns the ingest statistics."""
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Data file not found: {file_path}")
+    return DailyBarStore(file_path).ingest(chunk_bytes, rebuild)
+
+
+def load_daily_bars(file_path, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Daily Date/Open/High/Low/Close/Volume/VWAP/Ticks frame of a tick file, ingesting any new rows first.
+    The Date/Close columns can stand in for the Date/Price frame of the daily price file.
+    """
+    ingest_ticks(file_path, chunk_bytes)
+    bars = DailyBarStore(file_path).load()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vwap = np.where(bars["volume"] > 0, bars["turnover"] / bars["volume"], np.nan)
+    return pd.DataFrame({
+        'Date': (EPOCH + bars["days"].astype('timedelta64[D]')).astype('datetime64[ns]'),
+        'Open': bars["open"],
+        'High': bars["high"],
+        'Low': bars["low"],
+        'Close': bars["close"],
+        'Volume': bars["volume"],
+        'VWAP': vwap,
+        'Ticks': bars["ticks"],
+    })